@@ -5,6 +5,17 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
 from datetime import datetime, timedelta, timezone
+import threading
+import heapq
+import functools
+from itertools import chain
+import json
+import os
+import time
+import queue
+import atexit
+import weakref
+from collections import OrderedDict, deque
 
 # ==================== DATA GENERATION ====================
 
@@ -70,6 +81,340 @@ COLD_CHAIN_PROFILES = {
     'General Medicine': {'temp_min': 15, 'temp_max': 25}
 }
 
+# ==================== SHIPMENT SCHEMA ====================
+
+CATEGORY_COLUMNS = ['route_id', 'route_from', 'route_to', 'transport_mode', 'status',
+                    'medicine_name', 'brand', 'manufacturer', 'category']
+TIMESTAMP_COLUMNS = ['start_timestamp_utc', 'current_timestamp_utc']
+SHIPMENT_STATUSES = ['In Transit', 'At Hub', 'Delivered', 'Delayed']
+FLAG_COLUMNS = ['temperature_alert', 'humidity_alert', 'long_distance_alert',
+                'long_eta_alert', 'delayed_alert', 'overall_alert']
+MEASUREMENT_COLUMNS = ['elapsed_hours', 'eta_hours_remaining', 'total_distance_km',
+                       'distance_completed_km', 'distance_remaining_km', 'progress_pct',
+                       'current_temperature_c', 'temp_min_target_c', 'temp_max_target_c',
+                       'current_humidity_pct', 'transport_cost_inr', 'speed_kmph']
+
+SHIPMENT_ID_WIDTH = 12
+SHIPMENT_DTYPES = {'shipment_id': f'S{SHIPMENT_ID_WIDTH}', 'medicine_id': 'int32'}
+SHIPMENT_DTYPES.update({col: 'category' for col in CATEGORY_COLUMNS})
+SHIPMENT_DTYPES.update({col: 'datetime64[ns]' for col in TIMESTAMP_COLUMNS})
+SHIPMENT_DTYPES.update({col: 'int8' for col in FLAG_COLUMNS})
+SHIPMENT_DTYPES.update({col: 'float32' for col in MEASUREMENT_COLUMNS})
+
+def apply_shipment_schema(df):
+    """Cast a shipment DataFrame to the compact typed schema.
+
+    Timestamps are stored as naive UTC datetime64 so that CSV/Excel/JSON export
+    keeps working, and shipment IDs as fixed-width ASCII bytes (see text_ids for
+    display); columns outside the schema are left untouched.
+    """
+    df = df.copy()
+    for col, dtype in SHIPMENT_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if col in TIMESTAMP_COLUMNS:
+            df[col] = pd.to_datetime(df[col], utc=True).dt.tz_localize(None)
+        elif dtype.startswith('S') and df[col].dtype.kind != 'S':
+            df[col] = df[col].astype(str).str.encode('ascii').astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+def text_ids(df):
+    """Copy of df with fixed-width byte columns decoded to text, for display and export"""
+    byte_cols = [col for col in df.columns if df[col].dtype.kind == 'S']
+    if not byte_cols:
+        return df
+    return df.assign(**{col: df[col].str.decode('ascii') for col in byte_cols})
+
+def load_shipments(filepath):
+    """Load a shipment export (CSV, Excel or JSON) into the typed schema"""
+    if filepath.endswith('.csv'):
+        df = pd.read_csv(filepath, dtype={col: 'category' for col in CATEGORY_COLUMNS})
+    elif filepath.endswith('.xlsx'):
+        df = pd.read_excel(filepath)
+    else:
+        df = pd.read_json(filepath, orient='records')
+    return apply_shipment_schema(df)
+
+def shipment_memory_report(df, baseline=None):
+    """Per-column memory usage (deep) in bytes, optionally against a baseline frame"""
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': df.memory_usage(deep=True, index=False)
+    })
+    if baseline is not None:
+        report['baseline_bytes'] = baseline.memory_usage(deep=True, index=False).reindex(report.index)
+        report['reduction_x'] = (report['baseline_bytes'] / report['bytes']).round(1)
+    report.loc['TOTAL', 'bytes'] = report['bytes'].sum()
+    if baseline is not None:
+        report.loc['TOTAL', 'baseline_bytes'] = report['baseline_bytes'].sum()
+        report.loc['TOTAL', 'reduction_x'] = round(report.loc['TOTAL', 'baseline_bytes'] /
+                                                   report.loc['TOTAL', 'bytes'], 1)
+    return report
+
+# ==================== ROUTE GRAPH ====================
+
+HUB_DWELL_HOURS = 0.5
+# Hubs also connect to other cities within this many road km (straight-line
+# distance x ROAD_FACTOR), which is what lets a shipment divert off its route
+HUB_LINK_KM = 300
+ROAD_FACTOR = 1.25
+NEAREST_CACHE_SIZE = 4096
+
+CITY_ALIASES = {
+    'Bangalore': 'Bengaluru', 'Bombay': 'Mumbai', 'Calcutta': 'Kolkata',
+    'Madras': 'Chennai', 'Trivandrum': 'Thiruvananthapuram', 'Vizag': 'Visakhapatnam'
+}
+
+CITY_COORDS = {
+    'Mumbai': (19.076, 72.878), 'Delhi': (28.614, 77.209), 'Hyderabad': (17.385, 78.487),
+    'Bengaluru': (12.972, 77.595), 'Ahmedabad': (23.023, 72.571), 'Chennai': (13.083, 80.271),
+    'Pune': (18.520, 73.857), 'Kolkata': (22.573, 88.364), 'Jaipur': (26.912, 75.787),
+    'Lucknow': (26.847, 80.947), 'Chandigarh': (30.733, 76.779), 'Indore': (22.720, 75.858),
+    'Visakhapatnam': (17.687, 83.219), 'Nagpur': (21.146, 79.088), 'Coimbatore': (11.017, 76.956),
+    'Bhopal': (23.260, 77.413), 'Thiruvananthapuram': (8.524, 76.937)
+}
+
+def canonical_city(name):
+    """Collapse spelling variants so each city is a single graph node"""
+    name = ' '.join(str(name).split())
+    return CITY_ALIASES.get(name, name)
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km (numpy-broadcastable)"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))
+
+class RouteGraph:
+    """City/hub graph built from ROUTES_NETWORK with cached path, next-hub, ETA and reroute queries.
+
+    Each route becomes a chain origin -> hub 1 .. hub n -> destination with evenly
+    spaced edges, and hubs are placed along the line between their end cities.
+    Every hub also links to other cities within HUB_LINK_KM. ETAs follow the
+    route network (no links) from the shipment's next stop: drive time per edge
+    plus HUB_DWELL_HOURS at every hub. Hubs are interior to a single route, so
+    those paths only need the city-level graph (one cached Dijkstra per city,
+    precomputed). Reroutes combine the nearest cities of the stops on either side
+    of the shipment, each found with a Dijkstra over the linked graph that stops
+    after k cities and is cached in an LRU.
+    """
+
+    def __init__(self, routes, coords=CITY_COORDS, hub_dwell_hours=HUB_DWELL_HOURS,
+                 link_km=HUB_LINK_KM, precompute=True):
+        self.routes = routes
+        self.hub_dwell_hours = hub_dwell_hours
+        self.edges = {}
+        self.city_edges = {}
+        self.links = {}
+        self.hubs = set()
+        self.endpoints = {}
+        self.hub_positions = {}
+        self.stop_names = {}
+        self.hub_coords = {}
+        coords = {canonical_city(city): latlon for city, latlon in coords.items()}
+        for route_id, route in routes.items():
+            self._add_route(route_id, route, coords)
+        self.cities = sorted(set(self.edges) - self.hubs)
+        self._link_hubs(coords, link_km)
+        self._route_paths = {}
+        self._nearest_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        if precompute:
+            self.precompute_all_pairs()
+
+    @staticmethod
+    def _add_edge(adjacency, a, b, km):
+        adjacency.setdefault(a, {})[b] = km
+        adjacency.setdefault(b, {})[a] = km
+
+    def _add_route(self, route_id, route, coords):
+        origin, dest = canonical_city(route['from']), canonical_city(route['to'])
+        n_segments = route['hubs'] + 1
+        segment_km = route['distance'] / n_segments
+        hubs = [f"{route_id}-H{k}" for k in range(1, n_segments)]
+        stops = [origin] + hubs + [dest]
+        for a, b in zip(stops, stops[1:]):
+            self._add_edge(self.edges, a, b, segment_km)
+        self.hubs.update(hubs)
+        self.endpoints[route_id] = (origin, dest)
+        self.hub_positions[route_id] = segment_km * np.arange(1, n_segments + 1)
+        self.stop_names[route_id] = stops
+        for a, b in [(origin, dest), (dest, origin)]:
+            current = self.city_edges.setdefault(a, {}).get(b)
+            if current is None or route['distance'] < current[0]:
+                self.city_edges[a][b] = (route['distance'], route['hubs'])
+        if origin in coords and dest in coords:
+            (lat1, lon1), (lat2, lon2) = coords[origin], coords[dest]
+            for k, hub in enumerate(hubs, 1):
+                t = k / n_segments
+                self.hub_coords[hub] = (lat1 + (lat2 - lat1) * t, lon1 + (lon2 - lon1) * t, route_id)
+
+    def _link_hubs(self, coords, link_km):
+        """Connect each hub to the other cities within link_km road distance"""
+        cities = [city for city in self.cities if city in coords]
+        if not cities:
+            return
+        lat = np.array([coords[city][0] for city in cities])
+        lon = np.array([coords[city][1] for city in cities])
+        for hub, (hub_lat, hub_lon, route_id) in self.hub_coords.items():
+            road_km = haversine_km(hub_lat, hub_lon, lat, lon) * ROAD_FACTOR
+            for i in np.flatnonzero(road_km <= link_km):
+                if cities[i] not in self.endpoints[route_id]:
+                    self._add_edge(self.links, hub, cities[i], float(road_km[i]))
+
+    def _dijkstra(self, source):
+        """City-level distances, hubs passed and parents from source"""
+        dist = {source: 0.0}
+        hubs = {source: 0}
+        parent = {source: None}
+        heap = [(0.0, source)]
+        while heap:
+            d, city = heapq.heappop(heap)
+            if d > dist[city]:
+                continue
+            for neighbour, (km, n_hubs) in self.city_edges.get(city, {}).items():
+                nd = d + km
+                if nd < dist.get(neighbour, float('inf')):
+                    dist[neighbour] = nd
+                    hubs[neighbour] = hubs[city] + n_hubs
+                    parent[neighbour] = city
+                    heapq.heappush(heap, (nd, neighbour))
+        return dist, hubs, parent
+
+    def precompute_all_pairs(self):
+        """Run one city-level Dijkstra per city and cache it (serves every ETA query)"""
+        for city in self.cities:
+            self._from(city)
+
+    def _from(self, source):
+        paths = self._route_paths.get(source)
+        if paths is None:
+            paths = self._route_paths[source] = self._dijkstra(source)
+        return paths
+
+    def distance(self, src, dst):
+        return self._from(canonical_city(src))[0].get(canonical_city(dst), float('inf'))
+
+    def shortest_path(self, src, dst):
+        """Cached city-level path as (km, [cities]); (inf, []) when unreachable"""
+        src, dst = canonical_city(src), canonical_city(dst)
+        dist, _, parents = self._from(src)
+        if dst not in parents:
+            return float('inf'), []
+        path = [dst]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        return dist[dst], path[::-1]
+
+    def _nearest_cities(self, source, k):
+        """The k cities closest to source over route edges and hub links, as [(city, km, path)]"""
+        key = (source, k)
+        with self._cache_lock:
+            found = self._nearest_cache.get(key)
+            if found is not None:
+                self._nearest_cache.move_to_end(key)
+                return found
+        dist = {source: 0.0}
+        parent = {source: None}
+        heap = [(0.0, source)]
+        found = []
+        while heap and len(found) < k:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            if node not in self.hubs:
+                path = [node]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                found.append((node, d, path[::-1]))
+            for neighbour, km in chain(self.edges.get(node, {}).items(), self.links.get(node, {}).items()):
+                nd = d + km
+                if nd < dist.get(neighbour, float('inf')):
+                    dist[neighbour] = nd
+                    parent[neighbour] = node
+                    heapq.heappush(heap, (nd, neighbour))
+        with self._cache_lock:
+            self._nearest_cache[key] = found
+            if len(self._nearest_cache) > NEAREST_CACHE_SIZE:
+                self._nearest_cache.popitem(last=False)
+        return found
+
+    def _position(self, route_id, distance_completed):
+        """(previous stop, km since it, next stop, km to it); next stop is None on arrival"""
+        positions = self.hub_positions[route_id]
+        stops = self.stop_names[route_id]
+        idx = int(np.searchsorted(positions, distance_completed, side='right'))
+        if idx >= len(positions):
+            return stops[-1], 0.0, None, 0.0
+        passed = positions[idx - 1] if idx else 0.0
+        return stops[idx], float(distance_completed - passed), stops[idx + 1], float(positions[idx] - distance_completed)
+
+    def _path_to_destination(self, route_id, stop):
+        """(km, hubs incl. stop) of the shortest path from a stop on the route to its destination.
+
+        From a hub that is either straight on along the route, or back to the
+        origin and across the cached city-level paths, whichever is shorter.
+        """
+        origin, dest = self.endpoints[route_id]
+        stops = self.stop_names[route_id]
+        j = stops.index(stop) if stop in self.hubs else (0 if stop == origin else len(stops) - 1)
+        if j == len(stops) - 1:
+            return 0.0, 0
+        positions = self.hub_positions[route_id]
+        pos = positions[j - 1] if j else 0.0
+        forward = (positions[-1] - pos, len(stops) - 1 - j)
+        dist, hubs, _ = self._from(origin)
+        back = (pos + dist.get(dest, float('inf')), j + hubs.get(dest, 0))
+        return min(forward, back)
+
+    def next_hub(self, route_id, distance_completed):
+        """Next stop on the route for a shipment at distance_completed km"""
+        _, _, next_stop, km_to_next = self._position(route_id, distance_completed)
+        if next_stop is None:
+            return {'next_stop': None, 'km_to_next': 0.0, 'hubs_remaining': 0}
+        return {
+            'next_stop': next_stop,
+            'km_to_next': km_to_next,
+            'hubs_remaining': self._path_to_destination(route_id, next_stop)[1]
+        }
+
+    def eta_hours(self, route_id, distance_completed, speed):
+        """Hours to the destination, including HUB_DWELL_HOURS at every hub still ahead.
+
+        Drive time covers the km to the next stop plus the cached shortest path
+        from that stop to the destination.
+        """
+        _, _, next_stop, km_to_next = self._position(route_id, distance_completed)
+        if next_stop is None or speed <= 0:
+            return 0
+        km, hubs = self._path_to_destination(route_id, next_stop)
+        return (km_to_next + km) / speed + hubs * self.hub_dwell_hours
+
+    def reroute_options(self, route_id, distance_completed, visited=(), top_n=3):
+        """Nearest cities a shipment can be diverted to, as (city, km, path) from its position.
+
+        Every path leaves through the stop just passed or the next one, so the
+        answer is the best of those two stops' cached nearest-city lists (taken
+        deep enough to skip the excluded cities). The route's own origin and
+        destination are never offered, nor are any cities in visited (e.g.
+        earlier legs of a multi-leg shipment).
+        """
+        origin, dest = self.endpoints[route_id]
+        excluded = {origin, dest, *(canonical_city(city) for city in visited)}
+        prev_stop, km_from_prev, next_stop, km_to_next = self._position(route_id, distance_completed)
+        starts = [(prev_stop, km_from_prev)] + ([(next_stop, km_to_next)] if next_stop else [])
+        best = {}
+        for stop, offset in starts:
+            for city, km, path in self._nearest_cities(stop, top_n + len(excluded)):
+                if city not in excluded and offset + km < best.get(city, (float('inf'),))[0]:
+                    best[city] = (offset + km, path)
+        options = sorted(best.items(), key=lambda item: item[1][0])[:top_n]
+        return [(city, km, path) for city, (km, path) in options]
+
+ROUTE_GRAPH = RouteGraph(ROUTES_NETWORK)
+
 def generate_shipments(n_shipments=500):
     """Generate shipment data"""
     np.random.seed(42)
@@ -94,7 +439,7 @@ def generate_shipments(n_shipments=500):
         total_duration = np.random.gamma(24, 1.5)
         elapsed_hours = total_duration * progress_ratio
         start_time = now - timedelta(hours=elapsed_hours)
-        eta_remaining = distance_remaining / speed if distance_remaining > 0 else 0
+        eta_remaining = ROUTE_GRAPH.eta_hours(route_id, distance_completed, speed)
         
         category = med_row['category']
         profile = COLD_CHAIN_PROFILES.get(category, {'temp_min': 15, 'temp_max': 25})
@@ -138,24 +483,393 @@ def generate_shipments(n_shipments=500):
             'transport_cost_inr': round(transport_cost, 2), 'speed_kmph': round(speed, 1)
         })
     
-    return pd.DataFrame(shipments)
+    return apply_shipment_schema(pd.DataFrame(shipments))
+
+# ==================== PERSISTENT STORE ====================
+
+SHIPMENT_STORE_DIR = os.environ.get('COLD_CHAIN_STORE_DIR', 'cold_chain_store')
+SHIPMENT_SEED_FILE = os.environ.get('COLD_CHAIN_SEED_FILE')
+MEMORY_REPORT_ROWS = 20000
+SCAN_CHUNK_ROWS = int(os.environ.get('COLD_CHAIN_SCAN_CHUNK_ROWS', '100000'))
+
+class ShipmentStore:
+    """On-disk columnar shipment store: one memory-mapped .npy file per column.
+
+    Categorical columns are stored as int16 codes with their categories in
+    schema.json, string columns as fixed-width bytes (which frames keep, as in
+    SHIPMENT_DTYPES). Opening a store only maps
+    the files, so restarts are instant. Handlers read it in chunks, so the fleet
+    never has to fit in RAM; row updates are written in place and flushed
+    incrementally.
+
+    `lock` guards both sides: reads copy a chunk out under it and updates hold it
+    for the whole read-modify-write, so no reader sees a half-updated row.
+    """
+
+    SCHEMA_FILE = 'schema.json'
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, self.SCHEMA_FILE)) as f:
+            self.schema = json.load(f)
+        self.columns = {
+            col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r+')
+            for col in self.schema['columns']
+        }
+        ids = np.char.decode(self.columns['shipment_id'])
+        self.row_index = {sid: i for i, sid in enumerate(ids)}
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return self.schema['n_rows']
+
+    @classmethod
+    def create(cls, path, df):
+        """Write a shipment DataFrame out as a new store"""
+        os.makedirs(path, exist_ok=True)
+        schema = {'n_rows': len(df), 'columns': {}}
+        for col in df.columns:
+            series = df[col]
+            if series.dtype.kind == 'S':
+                values = series.to_numpy()
+                schema['columns'][col] = {'kind': 'bytes'}
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy().astype('int16')
+                schema['columns'][col] = {'kind': 'category',
+                                          'categories': [str(c) for c in series.cat.categories]}
+            elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+                values = series.astype(str).to_numpy().astype('S')
+                schema['columns'][col] = {'kind': 'bytes'}
+            else:
+                values = series.to_numpy()
+                schema['columns'][col] = {'kind': 'numeric'}
+            mm = np.lib.format.open_memmap(os.path.join(path, f"{col}.npy"), mode='w+',
+                                           dtype=values.dtype, shape=values.shape)
+            mm[:] = values
+            mm.flush()
+        cls._write_schema(path, schema)
+        return cls(path)
+
+    @classmethod
+    def open_or_create(cls, path, generate):
+        """Open the store at path, generating and persisting a fleet on first start"""
+        if os.path.exists(os.path.join(path, cls.SCHEMA_FILE)):
+            return cls(path)
+        return cls.create(path, generate())
+
+    def _decode(self, col, values):
+        spec = self.schema['columns'][col]
+        if spec['kind'] == 'category':
+            return pd.Categorical.from_codes(values, categories=spec['categories'])
+        return values
+
+    def _frame(self, rows, columns=None):
+        """Copy the selected rows of each column out of the maps as a typed DataFrame"""
+        with self.lock:
+            data = {col: self._decode(col, np.array(self.columns[col][rows]))
+                    for col in (columns or self.columns)}
+        df = pd.DataFrame(data)
+        for col, values in data.items():
+            if values.dtype.kind == 'S':
+                # The constructor widens bytes to object; assignment keeps them fixed-width
+                df[col] = values
+        return df
+
+    def to_frame(self, start=0, stop=None, columns=None):
+        """Materialize rows [start, stop) as a typed DataFrame"""
+        return self._frame(slice(start, stop), columns)
+
+    def iter_frames(self, chunk_rows=None, columns=None):
+        """Stream the store as DataFrame chunks; only one chunk is in memory at a time"""
+        chunk_rows = chunk_rows or SCAN_CHUNK_ROWS
+        for start in range(0, len(self), chunk_rows):
+            yield self.to_frame(start, start + chunk_rows, columns)
+
+    def sample_frame(self, max_rows, columns=None):
+        """Every k-th row, so that at most max_rows come back (all rows for small fleets)"""
+        step = max(1, -(-len(self) // max_rows))
+        return self._frame(slice(None, None, step), columns)
+
+    def row(self, shipment_id):
+        """One shipment as a Series, or None if the ID is unknown"""
+        idx = self.row_index.get(shipment_id)
+        if idx is None:
+            return None
+        return self.to_frame(idx, idx + 1).iloc[0]
+
+    def _encode(self, col, value):
+        spec = self.schema['columns'][col]
+        if spec['kind'] == 'category':
+            if value not in spec['categories']:
+                spec['categories'].append(value)
+                self._save_schema()
+            return spec['categories'].index(value)
+        if spec['kind'] == 'bytes':
+            return str(value).encode()
+        return value
+
+    @classmethod
+    def _write_schema(cls, store_path, schema):
+        """Write schema.json via a temp file and os.replace, so a crash never leaves it truncated"""
+        path = os.path.join(store_path, cls.SCHEMA_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(schema, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _save_schema(self):
+        self._write_schema(self.path, self.schema)
+
+    def update_row(self, shipment_id, fields):
+        """Write changed fields for one shipment in place and flush them to disk"""
+        with self.lock:
+            row = self.row_index[shipment_id]
+            for col, value in fields.items():
+                self.columns[col][row] = self._encode(col, value)
+                self.columns[col].flush()
+            return row
+
+def update_shipment_telemetry(shipment_id, temperature=None, humidity=None,
+                              distance_completed=None, status=None):
+    """Apply a telemetry/status update, recompute alerts and persist the changed columns.
+
+    Entry point for sensor feeds as well as the "Record Telemetry" form; safe to
+    call from any thread. Returns the fields written, or None for an unknown ID;
+    raises ValueError for a status outside SHIPMENT_STATUSES.
+    """
+    if status is not None and status not in SHIPMENT_STATUSES:
+        raise ValueError(f"Unknown status {status!r}; expected one of {', '.join(SHIPMENT_STATUSES)}")
+    shipment_id = shipment_id.strip().upper()
+    with shipment_store.lock:
+        row = shipment_store.row(shipment_id)
+        if row is None:
+            return None
+        fields = {}
+        if temperature is not None:
+            fields['current_temperature_c'] = round(float(temperature), 2)
+            temp = fields['current_temperature_c']
+            fields['temperature_alert'] = int(temp < row['temp_min_target_c'] - 2 or
+                                              temp > row['temp_max_target_c'] + 2)
+        if humidity is not None:
+            fields['current_humidity_pct'] = round(float(humidity), 1)
+            fields['humidity_alert'] = int(fields['current_humidity_pct'] > 70)
+        if distance_completed is not None:
+            total = float(row['total_distance_km'])
+            completed = min(max(float(distance_completed), 0.0), total)
+            eta = ROUTE_GRAPH.eta_hours(row['route_id'], completed, float(row['speed_kmph']))
+            fields.update({
+                'distance_completed_km': round(completed, 1),
+                'distance_remaining_km': round(total - completed, 1),
+                'progress_pct': round(completed / total * 100, 1),
+                'eta_hours_remaining': round(eta, 1),
+                'long_distance_alert': int(total - completed > total * 0.6),
+                'long_eta_alert': int(eta > 24),
+                'transport_cost_inr': round(completed * TRANSPORT_MODES[row['transport_mode']]['cost_per_km'], 2)
+            })
+        if status is not None:
+            fields['status'] = status
+            fields['delayed_alert'] = int(status == 'Delayed')
+        fields['current_timestamp_utc'] = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None))
+        
+        flags = ['temperature_alert', 'humidity_alert', 'long_distance_alert', 'long_eta_alert', 'delayed_alert']
+        fields['overall_alert'] = int(any(fields.get(flag, row[flag]) for flag in flags))
+        shipment_store.update_row(shipment_id, fields)
+    dashboard_refresher.notify()
+    return fields
+
+def seed_shipments():
+    """First-start fleet: the COLD_CHAIN_SEED_FILE export if set, else a synthetic one"""
+    if SHIPMENT_SEED_FILE:
+        return load_shipments(SHIPMENT_SEED_FILE)
+    return generate_shipments(500)
 
 # Initialize data
-global_ship_df = generate_shipments(500)
+shipment_store = ShipmentStore.open_or_create(SHIPMENT_STORE_DIR, seed_shipments)
 global_med_df = generate_medicine_data()
 
+_memory_sample = shipment_store.sample_frame(MEMORY_REPORT_ROWS)
+print(f"Shipment store: {len(shipment_store):,} rows; in-memory footprint of "
+      f"{len(_memory_sample):,} sampled rows:\n{shipment_memory_report(_memory_sample)}")
+del _memory_sample
+
+# ==================== HANDLER TRACING ====================
+
+TRACING_ENABLED = os.environ.get('COLD_CHAIN_TRACING', '0') == '1'
+METRICS_FILE = os.environ.get('COLD_CHAIN_METRICS_FILE', 'cold_chain_metrics.jsonl')
+
+_trace_records = deque(maxlen=10000)
+_trace_lock = threading.Lock()
+_trace_state = threading.local()
+_trace_queue = queue.SimpleQueue()
+_trace_writer = None
+
+def record_rows(n_rows):
+    """Add n_rows to the rows-scanned counter of the innermost traced call"""
+    if not TRACING_ENABLED:
+        return
+    spans = getattr(_trace_state, 'spans', None)
+    if spans:
+        spans[-1]['rows_scanned'] += int(n_rows)
+
+# Exact JSON sizes of long-lived figures (dashboard snapshots), keyed by id() and
+# dropped when the figure is garbage collected
+_figure_sizes = {}
+
+def remember_figure_bytes(fig):
+    """Serialize fig once and cache its size for the traced calls that serve it"""
+    if not TRACING_ENABLED or not isinstance(fig, go.Figure):
+        return
+    key = id(fig)
+    _figure_sizes[key] = (weakref.ref(fig, lambda _: _figure_sizes.pop(key, None)),
+                          len(fig.to_json()))
+
+def _estimate_figure_bytes(fig):
+    """Rough payload size from the trace data arrays, without serializing the figure"""
+    total = 0
+    for trace in fig.data:
+        for value in trace.to_plotly_json().values():
+            if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+                total += len(value) * 16
+    return total
+
+def _figure_payload_bytes(result):
+    """Cached size for snapshot figures, a cheap estimate for figures built per call"""
+    outputs = result if isinstance(result, tuple) else (result,)
+    total = 0
+    for out in outputs:
+        if not isinstance(out, go.Figure):
+            continue
+        ref, size = _figure_sizes.get(id(out), (None, None))
+        total += size if ref is not None and ref() is out else _estimate_figure_bytes(out)
+    return total
+
+def _write_traces():
+    """Append queued spans to METRICS_FILE in batches until a None sentinel arrives"""
+    while True:
+        spans = [_trace_queue.get()]
+        while True:
+            try:
+                spans.append(_trace_queue.get_nowait())
+            except queue.Empty:
+                break
+        lines = [json.dumps(span) + '\n' for span in spans if span is not None]
+        if lines:
+            try:
+                with open(METRICS_FILE, 'a') as f:
+                    f.writelines(lines)
+            except OSError as e:
+                print(f"Trace write failed: {e}")
+        if None in spans:
+            return
+
+def _stop_trace_writer():
+    _trace_queue.put(None)
+    _trace_writer.join(timeout=5)
+
+def _emit_trace(span):
+    """Keep the span for trace_summary and hand it to the writer thread (no I/O here)"""
+    global _trace_writer
+    with _trace_lock:
+        _trace_records.append(span)
+        if _trace_writer is None:
+            _trace_writer = threading.Thread(target=_write_traces, name='trace-writer', daemon=True)
+            _trace_writer.start()
+            atexit.register(_stop_trace_writer)
+    _trace_queue.put(span)
+
+def traced(fn):
+    """Record wall time, CPU time, rows scanned and figure payload per handler call.
+
+    When TRACING_ENABLED is off the wrapper is a single flag check.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not TRACING_ENABLED:
+            return fn(*args, **kwargs)
+        span = {'handler': fn.__name__, 'timestamp_utc': datetime.now(timezone.utc).isoformat(),
+                'rows_scanned': 0, 'figure_bytes': 0, 'error': None}
+        if not hasattr(_trace_state, 'spans'):
+            _trace_state.spans = []
+        _trace_state.spans.append(span)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            span['error'] = repr(e)
+            raise
+        finally:
+            # Timings stop here so sizing the payload below is not counted
+            span['wall_ms'] = round((time.perf_counter() - wall_start) * 1000, 3)
+            span['cpu_ms'] = round((time.thread_time() - cpu_start) * 1000, 3)
+            _trace_state.spans.pop()
+            if span['error'] is not None:
+                _emit_trace(span)
+        span['figure_bytes'] = _figure_payload_bytes(result)
+        _emit_trace(span)
+        return result
+    return wrapper
+
+def trace_summary():
+    """Per-handler latency, CPU, rows and payload summary of the recorded calls"""
+    with _trace_lock:
+        records = list(_trace_records)
+    if not records:
+        status = "enabled" if TRACING_ENABLED else "disabled (set COLD_CHAIN_TRACING=1)"
+        return f"No traced calls yet. Tracing is {status}.", pd.DataFrame()
+    df = pd.DataFrame(records)
+    summary = df.groupby('handler').agg(
+        calls=('wall_ms', 'size'),
+        wall_p50_ms=('wall_ms', 'median'),
+        wall_p95_ms=('wall_ms', lambda x: x.quantile(0.95)),
+        cpu_mean_ms=('cpu_ms', 'mean'),
+        rows_mean=('rows_scanned', 'mean'),
+        figure_kb_mean=('figure_bytes', lambda x: x.mean() / 1024),
+        errors=('error', 'count')
+    ).round(2).sort_values('wall_p95_ms', ascending=False).reset_index()
+    return f"**{len(df):,} traced calls** • written to `{METRICS_FILE}`", summary
+
 # ==================== VISUALIZATION FUNCTIONS ====================
 
+# Point-level charts (scatter, histogram, box) plot a sample of this many rows;
+# counts and totals are always aggregated over the whole store
+DASHBOARD_SAMPLE_ROWS = 20_000
+
+def _add_counts(total, counts):
+    """Accumulate per-chunk counts or sums (Series or DataFrame) across a scan"""
+    return counts if total is None else total.add(counts, fill_value=0)
+
 def create_overview_dashboard():
     """Create main dashboard with KPIs and charts"""
-    df = global_ship_df
+    total_shipments = 0
+    temp_sum = 0.0
+    alert_sums = status_counts = mode_counts = route_counts = cat_counts = mode_costs = None
+    for df in shipment_store.iter_frames(columns=['status', 'transport_mode', 'route_id', 'category',
+                                                  'current_temperature_c', 'transport_cost_inr'] + FLAG_COLUMNS):
+        record_rows(len(df))
+        total_shipments += len(df)
+        temp_sum += df['current_temperature_c'].to_numpy().sum(dtype=np.float64)
+        alert_sums = _add_counts(alert_sums, df[FLAG_COLUMNS].sum())
+        status_counts = _add_counts(status_counts, df['status'].value_counts())
+        mode_counts = _add_counts(mode_counts, df['transport_mode'].value_counts())
+        route_counts = _add_counts(route_counts, df['route_id'].value_counts())
+        cat_counts = _add_counts(cat_counts, df['category'].value_counts())
+        mode_costs = _add_counts(mode_costs, df.groupby('transport_mode', observed=True)['transport_cost_inr']
+                                 .sum().astype('float64'))
+    status_counts, mode_counts, route_counts, cat_counts = (
+        counts.astype(int).sort_values(ascending=False)
+        for counts in (status_counts, mode_counts, route_counts, cat_counts))
+    sample = shipment_store.sample_frame(DASHBOARD_SAMPLE_ROWS, columns=[
+        'current_temperature_c', 'distance_completed_km', 'distance_remaining_km',
+        'elapsed_hours', 'overall_alert'])
+    record_rows(len(sample))
     
     # Calculate KPIs
-    total_shipments = len(df)
-    active_alerts = df['overall_alert'].sum()
-    in_transit = len(df[df['status'] == 'In Transit'])
-    avg_temp = df['current_temperature_c'].mean()
-    total_cost = df['transport_cost_inr'].sum()
+    active_alerts = int(alert_sums['overall_alert'])
+    in_transit = int(status_counts.get('In Transit', 0))
+    avg_temp = temp_sum / total_shipments
+    total_cost = mode_costs.sum()
     
     # Create subplots
     fig = make_subplots(
@@ -171,51 +885,47 @@ def create_overview_dashboard():
     )
     
     # 1. Status Distribution (Pie)
-    status_counts = df['status'].value_counts()
     fig.add_trace(go.Pie(labels=status_counts.index, values=status_counts.values, 
                          marker=dict(colors=['#2ecc71', '#f39c12', '#e74c3c', '#3498db'])),
                   row=1, col=1)
     
     # 2. Alert Types (Bar)
     alert_types = ['Temperature', 'Humidity', 'Distance', 'ETA', 'Delayed']
-    alert_counts = [df['temperature_alert'].sum(), df['humidity_alert'].sum(),
-                   df['long_distance_alert'].sum(), df['long_eta_alert'].sum(), df['delayed_alert'].sum()]
+    alert_counts = [int(alert_sums[flag]) for flag in FLAG_COLUMNS[:5]]
     fig.add_trace(go.Bar(x=alert_types, y=alert_counts, marker_color='#e74c3c',
                          text=alert_counts, textposition='auto'), row=1, col=2)
     
     # 3. Transport Mode (Pie)
-    mode_counts = df['transport_mode'].value_counts()
     fig.add_trace(go.Pie(labels=mode_counts.index, values=mode_counts.values,
                          hole=0.3), row=1, col=3)
     
     # 4. Temperature Distribution (Histogram)
-    fig.add_trace(go.Histogram(x=df['current_temperature_c'], nbinsx=30,
+    fig.add_trace(go.Histogram(x=sample['current_temperature_c'], nbinsx=30,
                                marker_color='#3498db', name='Temperature'), row=2, col=1)
     
     # 5. Route Traffic (Bar)
-    route_counts = df['route_id'].value_counts().head(10)
+    route_counts = route_counts.head(10)
     fig.add_trace(go.Bar(x=route_counts.index, y=route_counts.values,
                          marker_color='#9b59b6'), row=2, col=2)
     
     # 6. Progress Overview (Scatter)
-    fig.add_trace(go.Scatter(x=df['distance_completed_km'], y=df['distance_remaining_km'],
-                            mode='markers', marker=dict(size=5, color=df['overall_alert'],
+    fig.add_trace(go.Scatter(x=sample['distance_completed_km'], y=sample['distance_remaining_km'],
+                            mode='markers', marker=dict(size=5, color=sample['overall_alert'],
                             colorscale='RdYlGn_r', showscale=True), name='Progress'), row=2, col=3)
     
     # 7. Cost Analysis (Bar)
-    mode_costs = df.groupby('transport_mode')['transport_cost_inr'].sum().sort_values(ascending=False)
+    mode_costs = mode_costs.sort_values(ascending=False)
     fig.add_trace(go.Bar(x=mode_costs.index, y=mode_costs.values,
                          marker_color='#16a085', text=[f'₹{x:,.0f}' for x in mode_costs.values],
                          textposition='auto'), row=3, col=1)
     
     # 8. Alert Timeline (Scatter)
-    alert_df = df[df['overall_alert'] == 1]
+    alert_df = sample[sample['overall_alert'] == 1]
     fig.add_trace(go.Scatter(x=alert_df['elapsed_hours'], y=alert_df['current_temperature_c'],
                             mode='markers', marker=dict(size=8, color='red'),
                             name='Alerts'), row=3, col=2)
     
     # 9. Medicine Categories (Pie)
-    cat_counts = df['category'].value_counts()
     fig.add_trace(go.Pie(labels=cat_counts.index, values=cat_counts.values), row=3, col=3)
     
     # Update layout
@@ -228,11 +938,10 @@ def create_overview_dashboard():
     
     return fig
 
-def search_shipments(query, status_filter, alert_filter, mode_filter):
-    """Search and filter shipments"""
-    df = global_ship_df.copy()
-    
-    # Apply filters
+SEARCH_RESULT_ROWS = 50
+
+def _filter_shipments(df, query, status_filter, alert_filter, mode_filter):
+    """Rows of one chunk matching the search filters"""
     if status_filter != 'All':
         df = df[df['status'] == status_filter]
     
@@ -250,14 +959,35 @@ def search_shipments(query, status_filter, alert_filter, mode_filter):
         mask = (
             df['medicine_name'].str.lower().str.contains(query_lower, na=False) |
             df['brand'].str.lower().str.contains(query_lower, na=False) |
-            df['shipment_id'].str.contains(query.upper(), na=False) |
+            (np.char.find(df['shipment_id'].to_numpy(), query.upper().encode()) >= 0) |
             df['route_id'].str.contains(query.upper(), na=False) |
             df['status'].str.lower().str.contains(query_lower, na=False) |
             df['category'].str.lower().str.contains(query_lower, na=False)
         )
         df = df[mask]
-    
-    df = df.sort_values('overall_alert', ascending=False).head(50)
+    return df
+
+@traced
+def search_shipments(query, status_filter, alert_filter, mode_filter):
+    """Search and filter shipments, scanning the store chunk by chunk.
+
+    Only the first SEARCH_RESULT_ROWS matches (alerts first) are kept, and the
+    scan stops as soon as that many alert rows have been found.
+    """
+    alerts, others = [], []
+    n_alerts = n_others = 0
+    for df in shipment_store.iter_frames():
+        record_rows(len(df))
+        df = _filter_shipments(df, query, status_filter, alert_filter, mode_filter)
+        if n_alerts < SEARCH_RESULT_ROWS:
+            alerts.append(df[df['overall_alert'] == 1].head(SEARCH_RESULT_ROWS - n_alerts))
+            n_alerts += len(alerts[-1])
+        if n_others < SEARCH_RESULT_ROWS:
+            others.append(df[df['overall_alert'] != 1].head(SEARCH_RESULT_ROWS - n_others))
+            n_others += len(others[-1])
+        if n_alerts >= SEARCH_RESULT_ROWS:
+            break
+    df = pd.concat(alerts + others, ignore_index=True).head(SEARCH_RESULT_ROWS)
     
     # Create summary
     summary = f"""
@@ -269,26 +999,26 @@ def search_shipments(query, status_filter, alert_filter, mode_filter):
     """
     
     # Display columns
-    display_df = df[['shipment_id', 'medicine_name', 'brand', 'route_from', 'route_to',
+    display_df = text_ids(df)[['shipment_id', 'medicine_name', 'brand', 'route_from', 'route_to',
                      'transport_mode', 'status', 'progress_pct', 'eta_hours_remaining',
                      'current_temperature_c', 'overall_alert']].copy()
     
     display_df.columns = ['ID', 'Medicine', 'Brand', 'From', 'To', 'Mode', 'Status', 
-                          'Progress %', 'ETA (hrs)', 'Temp °C', 'Alert']
+                          'Progress %', 'ETA incl. Hubs (hrs)', 'Temp °C', 'Alert']
     
     return summary, display_df
 
+@traced
 def get_shipment_details(shipment_id):
     """Get detailed shipment information"""
     if not shipment_id:
         return "Please enter a shipment ID", None, None
         
-    shipment = global_ship_df[global_ship_df['shipment_id'] == shipment_id.upper()]
+    row = shipment_store.row(shipment_id.strip().upper())
     
-    if shipment.empty:
+    if row is None:
         return "Shipment not found", None, None
-    
-    row = shipment.iloc[0]
+    record_rows(1)
     
     # Detailed info
     details = f"""
@@ -305,7 +1035,7 @@ def get_shipment_details(shipment_id):
 - **Total Distance:** {row['total_distance_km']:.0f} km
 - **Completed:** {row['distance_completed_km']:.0f} km ({row['progress_pct']:.1f}%)
 - **Remaining:** {row['distance_remaining_km']:.0f} km
-- **ETA:** {row['eta_hours_remaining']:.1f} hours
+- **ETA (incl. hub stops):** {row['eta_hours_remaining']:.1f} hours
 - **Elapsed Time:** {row['elapsed_hours']:.1f} hours
 
 ### Cold Chain Monitoring
@@ -329,6 +1059,21 @@ def get_shipment_details(shipment_id):
     else:
         details += "\n**🟢 All systems nominal**\n"
     
+    next_hub = ROUTE_GRAPH.next_hub(row['route_id'], float(row['distance_completed_km']))
+    details += "\n### Route Network\n"
+    if next_hub['next_stop'] is None:
+        details += f"- **Next Stop:** Arrived at {row['route_to']}\n"
+    else:
+        details += f"- **Next Stop:** {next_hub['next_stop']} in {next_hub['km_to_next']:.0f} km\n"
+        details += f"- **Hubs Remaining:** {next_hub['hubs_remaining']} ({HUB_DWELL_HOURS:g} h dwell each)\n"
+    if alerts_active > 0:
+        options = ROUTE_GRAPH.reroute_options(row['route_id'], float(row['distance_completed_km']))
+        if options:
+            details += "- **Reroute Options:** " + ", ".join(
+                f"{city} ({km:.0f} km via {path[0]})" for city, km, path in options) + "\n"
+        else:
+            details += "- **Reroute Options:** None on the network\n"
+    
     details += f"\n### Cost Summary\n- **Transport Cost:** ₹{row['transport_cost_inr']:,.2f}"
     
     # Generate historical chart
@@ -339,6 +1084,21 @@ def get_shipment_details(shipment_id):
     
     return details, hist_fig, risk_fig
 
+@traced
+def record_telemetry(shipment_id, temperature, humidity, distance_completed, status):
+    """Apply a manual telemetry update from the details tab and show the updated shipment"""
+    if not shipment_id:
+        return "Please enter a shipment ID", None, None
+    try:
+        fields = update_shipment_telemetry(shipment_id, temperature, humidity, distance_completed,
+                                           None if status == 'Unchanged' else status)
+    except ValueError as e:
+        return f"❌ {e}", None, None
+    if fields is None:
+        return "Shipment not found", None, None
+    details, hist_fig, risk_fig = get_shipment_details(shipment_id)
+    return "✅ Telemetry update saved\n" + details, hist_fig, risk_fig
+
 def generate_historical_chart(row):
     """Generate historical sensor data chart"""
     n_points = 50
@@ -422,7 +1182,17 @@ def generate_risk_analysis(row):
 
 def create_analytics_dashboard():
     """Create advanced analytics dashboard"""
-    df = global_ship_df
+    route_status = progress_sum = progress_n = None
+    for df in shipment_store.iter_frames(columns=['route_id', 'status', 'progress_pct']):
+        record_rows(len(df))
+        route_status = _add_counts(route_status, pd.crosstab(df['route_id'], df['status']))
+        by_status = df.groupby('status', observed=True)['progress_pct']
+        progress_sum = _add_counts(progress_sum, by_status.sum())
+        progress_n = _add_counts(progress_n, by_status.size())
+    route_status = route_status.fillna(0).astype(int)
+    sample = shipment_store.sample_frame(DASHBOARD_SAMPLE_ROWS, columns=[
+        'category', 'current_temperature_c', 'distance_completed_km', 'transport_cost_inr', 'overall_alert'])
+    record_rows(len(sample))
     
     fig = make_subplots(
         rows=2, cols=2,
@@ -433,22 +1203,21 @@ def create_analytics_dashboard():
     )
     
     # 1. Heatmap
-    route_status = pd.crosstab(df['route_id'], df['status'])
     fig.add_trace(go.Heatmap(z=route_status.values, x=route_status.columns,
                              y=route_status.index, colorscale='Viridis'), row=1, col=1)
     
     # 2. Cost vs Distance
-    fig.add_trace(go.Scatter(x=df['distance_completed_km'], y=df['transport_cost_inr'],
-                            mode='markers', marker=dict(size=6, color=df['overall_alert'],
+    fig.add_trace(go.Scatter(x=sample['distance_completed_km'], y=sample['transport_cost_inr'],
+                            mode='markers', marker=dict(size=6, color=sample['overall_alert'],
                             colorscale='RdYlGn_r'), name='Cost'), row=1, col=2)
     
     # 3. Temperature Compliance
-    for category in df['category'].unique()[:5]:
-        cat_df = df[df['category'] == category]
+    for category in sample['category'].unique()[:5]:
+        cat_df = sample[sample['category'] == category]
         fig.add_trace(go.Box(y=cat_df['current_temperature_c'], name=category), row=2, col=1)
     
     # 4. Status Map
-    status_progress = df.groupby('status')['progress_pct'].mean()
+    status_progress = progress_sum / progress_n
     fig.add_trace(go.Scatter(x=status_progress.index, y=status_progress.values,
                             mode='markers+lines', marker=dict(size=15),
                             line=dict(width=3)), row=2, col=2)
@@ -457,30 +1226,175 @@ def create_analytics_dashboard():
     
     return fig
 
+REPORT_DIR = os.environ.get('COLD_CHAIN_REPORT_DIR', 'cold_chain_reports')
+
+def _report_chunks(filter_type):
+    for df in shipment_store.iter_frames():
+        record_rows(len(df))
+        if filter_type == 'Alerts Only':
+            df = df[df['overall_alert'] == 1]
+        elif filter_type == 'In Transit Only':
+            df = df[df['status'] == 'In Transit']
+        yield text_ids(df)
+
+@traced
 def export_report(format_type, filter_type):
-    """Export report in selected format"""
-    df = global_ship_df.copy()
-    
-    if filter_type == 'Alerts Only':
-        df = df[df['overall_alert'] == 1]
-    elif filter_type == 'In Transit Only':
-        df = df[df['status'] == 'In Transit']
-    
-    filename = f"cold_chain_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    """Export report in selected format, written chunk by chunk into REPORT_DIR"""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    filename = os.path.join(REPORT_DIR, f"cold_chain_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    count = 0
     
     if format_type == "CSV":
         filepath = f"{filename}.csv"
-        df.to_csv(filepath, index=False)
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            for i, df in enumerate(_report_chunks(filter_type)):
+                df.to_csv(f, index=False, header=i == 0)
+                count += len(df)
     elif format_type == "Excel":
         filepath = f"{filename}.xlsx"
-        df.to_excel(filepath, index=False)
+        with pd.ExcelWriter(filepath) as writer:
+            for i, df in enumerate(_report_chunks(filter_type)):
+                df.to_excel(writer, index=False, header=i == 0, startrow=count + 1 if i else 0)
+                count += len(df)
     else:  # JSON
         filepath = f"{filename}.json"
-        df.to_json(filepath, orient='records', indent=2)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for df in _report_chunks(filter_type):
+                if df.empty:
+                    continue
+                records = df.to_json(orient='records', indent=2, date_format='iso')
+                f.write((',' if count else '') + records[1:-1])
+                count += len(df)
+            f.write(']')
     
-    return f"✅ Report generated: {len(df):,} records", filepath
+    return f"✅ Report generated: {count:,} records", filepath
+
+# ==================== BACKGROUND REFRESH ====================
+
+DASHBOARD_REFRESH_SECONDS = float(os.environ.get('COLD_CHAIN_REFRESH_SECONDS', '60'))
+REFRESH_WAIT_SECONDS = 15
+
+class DashboardRefresher:
+    """Recompute dashboard figures off the request thread and publish versioned snapshots.
+
+    A snapshot is an immutable dict that is swapped in as a whole, so UI handlers
+    only read the latest reference and never wait on a recompute. The worker
+    builds the first snapshot too; until then the figures are empty.
+    """
+
+    def __init__(self, builders, interval=DASHBOARD_REFRESH_SECONDS):
+        self.builders = builders
+        self.interval = interval
+        self._snapshot = {'version': 0, 'started_at': None, 'computed_at': None, 'figures': {}}
+        self._published = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh_now(self):
+        """Rebuild every figure and publish them as the next snapshot"""
+        started_at = datetime.now(timezone.utc)
+        figures = {name: build() for name, build in self.builders.items()}
+        for fig in figures.values():
+            remember_figure_bytes(fig)
+        with self._published:
+            self._snapshot = {
+                'version': self._snapshot['version'] + 1,
+                'started_at': started_at,
+                'computed_at': datetime.now(timezone.utc),
+                'figures': figures
+            }
+            self._published.notify_all()
+        return self._snapshot
+
+    def notify(self):
+        """Signal that new telemetry arrived; the worker recomputes immediately"""
+        self._wake.set()
+
+    def request(self, timeout=REFRESH_WAIT_SECONDS):
+        """Ask for a recompute and wait up to timeout seconds for a snapshot started after the call.
+
+        Returns (snapshot, fresh); on timeout the latest published snapshot comes
+        back with fresh=False.
+        """
+        requested_at = datetime.now(timezone.utc)
+        self.notify()
+        with self._published:
+            fresh = self._published.wait_for(
+                lambda: (self._snapshot['started_at'] is not None
+                         and self._snapshot['started_at'] >= requested_at), timeout)
+            return self._snapshot, fresh
+
+    def start(self):
+        """Start the background worker, which publishes the first snapshot straight away"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='dashboard-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.refresh_now()
+            except Exception as e:
+                print(f"Dashboard refresh failed: {e}")
+            self._wake.wait(self.interval)
+
+    def snapshot(self):
+        return self._snapshot
+
+    def get(self, name):
+        return self._snapshot['figures'].get(name)
+
+dashboard_refresher = DashboardRefresher({
+    'overview': create_overview_dashboard,
+    'analytics': create_analytics_dashboard
+})
+
+def snapshot_status(snap=None, pending=False):
+    """Markdown line describing the snapshot being served and its age"""
+    snap = snap or dashboard_refresher.snapshot()
+    if snap['computed_at'] is None:
+        return "*Dashboard snapshot pending...*"
+    age = (datetime.now(timezone.utc) - snap['computed_at']).total_seconds()
+    status = (f"Snapshot v{snap['version']} • computed {snap['computed_at'].strftime('%H:%M:%S')} UTC "
+              f"({age:.0f}s ago)")
+    if pending:
+        status = f"Refresh pending, showing {status}"
+    return f"*{status}*"
+
+# The dashboard builders run on the refresher thread, so tracing happens here,
+# around what a page load or button click actually waits for
+
+@traced
+def get_overview_snapshot():
+    return dashboard_refresher.get('overview'), snapshot_status()
+
+@traced
+def get_analytics_snapshot():
+    return dashboard_refresher.get('analytics'), snapshot_status()
+
+@traced
+def request_overview_refresh():
+    """Recompute and return the new overview, or the current one marked pending after REFRESH_WAIT_SECONDS"""
+    snap, fresh = dashboard_refresher.request()
+    return snap['figures'].get('overview'), snapshot_status(snap, pending=not fresh)
+
+@traced
+def request_analytics_refresh():
+    """Recompute and return the new analytics, or the current one marked pending after REFRESH_WAIT_SECONDS"""
+    snap, fresh = dashboard_refresher.request()
+    return snap['figures'].get('analytics'), snapshot_status(snap, pending=not fresh)
+
+dashboard_refresher.start()
 
-# ==================== GRADIO INTERFACE ====================
 # ==================== GRADIO INTERFACE ====================
 
 with gr.Blocks(theme=gr.themes.Soft(), title="Cold Chain Tracking System") as app:
@@ -494,9 +1408,10 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Cold Chain Tracking System") as ap
         with gr.Tab("📊 Dashboard Overview"):
             gr.Markdown("### Real-time System Overview")
             overview_plot = gr.Plot(label="Dashboard Metrics")
+            overview_status = gr.Markdown()
             refresh_btn = gr.Button("🔄 Refresh Dashboard", variant="primary")
-            refresh_btn.click(fn=create_overview_dashboard, outputs=overview_plot)
-            app.load(fn=create_overview_dashboard, outputs=overview_plot)
+            refresh_btn.click(fn=request_overview_refresh, outputs=[overview_plot, overview_status])
+            app.load(fn=get_overview_snapshot, outputs=[overview_plot, overview_status])
         
         # Tab 2: Search & Track
         with gr.Tab("🔍 Search & Track"):
@@ -508,7 +1423,7 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Cold Chain Tracking System") as ap
             
             with gr.Row():
                 status_filter = gr.Dropdown(
-                    choices=['All', 'In Transit', 'At Hub', 'Delivered', 'Delayed'],
+                    choices=['All'] + SHIPMENT_STATUSES,
                     value='All', label="Status Filter"
                 )
                 alert_filter = gr.Dropdown(
@@ -555,14 +1470,33 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Cold Chain Tracking System") as ap
                 inputs=shipment_id_input,
                 outputs=[shipment_details, history_chart, risk_chart]
             )
+            
+            with gr.Accordion("📡 Record Telemetry", open=False):
+                gr.Markdown("Leave a field empty to keep its current value.")
+                with gr.Row():
+                    telemetry_temp = gr.Number(label="Temperature °C")
+                    telemetry_humidity = gr.Number(label="Humidity %")
+                    telemetry_distance = gr.Number(label="Distance Completed (km)", minimum=0)
+                    telemetry_status = gr.Dropdown(
+                        choices=['Unchanged'] + SHIPMENT_STATUSES,
+                        value='Unchanged', label="Status"
+                    )
+                telemetry_btn = gr.Button("Save Update", variant="secondary")
+                telemetry_btn.click(
+                    fn=record_telemetry,
+                    inputs=[shipment_id_input, telemetry_temp, telemetry_humidity,
+                            telemetry_distance, telemetry_status],
+                    outputs=[shipment_details, history_chart, risk_chart]
+                )
         
         # Tab 4: Analytics
         with gr.Tab("📈 Analytics"):
             gr.Markdown("### Advanced Analytics & Insights")
             analytics_plot = gr.Plot(label="Analytics Dashboard")
+            analytics_status = gr.Markdown()
             analytics_refresh = gr.Button("🔄 Refresh Analytics", variant="primary")
-            analytics_refresh.click(fn=create_analytics_dashboard, outputs=analytics_plot)
-            app.load(fn=create_analytics_dashboard, outputs=analytics_plot)
+            analytics_refresh.click(fn=request_analytics_refresh, outputs=[analytics_plot, analytics_status])
+            app.load(fn=get_analytics_snapshot, outputs=[analytics_plot, analytics_status])
         
         # Tab 5: Export & Reports
         with gr.Tab("📄 Export & Reports"):
@@ -589,6 +1523,12 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Cold Chain Tracking System") as ap
                 inputs=[export_format, export_filter],
                 outputs=[export_status, export_file]
             )
+            
+            with gr.Accordion("⏱️ Handler Metrics", open=False):
+                metrics_status = gr.Markdown()
+                metrics_table = gr.Dataframe(label="Per-handler timings", interactive=False)
+                metrics_btn = gr.Button("🔄 Refresh Metrics")
+                metrics_btn.click(fn=trace_summary, outputs=[metrics_status, metrics_table])
     
     gr.Markdown("""
     ---
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The app builds its store and writes reports at import; keep them out of the tree
+_scratch = tempfile.mkdtemp(prefix="cold_chain_tests_")
+os.environ.setdefault("COLD_CHAIN_STORE_DIR", os.path.join(_scratch, "store"))
+os.environ.setdefault("COLD_CHAIN_REPORT_DIR", os.path.join(_scratch, "reports"))
+os.environ.setdefault("COLD_CHAIN_METRICS_FILE", os.path.join(_scratch, "metrics.jsonl"))
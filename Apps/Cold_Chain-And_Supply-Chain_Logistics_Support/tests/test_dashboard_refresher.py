@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("plotly")
+app = pytest.importorskip("Code2_Gradio_sync")
+
+
+def counting_builder():
+    calls = []
+
+    def build():
+        calls.append(None)
+        return len(calls)
+    return build
+
+
+def test_first_snapshot_is_built_by_the_worker():
+    refresher = app.DashboardRefresher({"n": counting_builder()}, interval=60)
+    assert refresher.snapshot()["version"] == 0
+
+    refresher.start()
+    try:
+        snap, fresh = refresher.request(timeout=5)
+    finally:
+        refresher.stop()
+
+    assert fresh
+    assert snap["version"] >= 1
+    assert snap["figures"]["n"] == snap["version"]
+
+
+def test_request_returns_a_snapshot_started_after_the_call():
+    refresher = app.DashboardRefresher({"n": counting_builder()}, interval=60)
+    refresher.start()
+    try:
+        first, _ = refresher.request(timeout=5)
+        second, fresh = refresher.request(timeout=5)
+    finally:
+        refresher.stop()
+
+    assert fresh
+    assert second["version"] > first["version"]
+    assert second["started_at"] >= first["computed_at"]
+
+
+def test_request_times_out_with_the_current_snapshot_marked_pending():
+    release = threading.Event()
+    refresher = app.DashboardRefresher({"n": lambda: release.wait(5)}, interval=60)
+    refresher.start()
+    try:
+        snap, fresh = refresher.request(timeout=0.1)
+        assert not fresh
+        assert snap["version"] == 0
+        assert "pending" in app.snapshot_status(snap, pending=not fresh).lower()
+    finally:
+        release.set()
+        refresher.stop()
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("plotly")
+app = pytest.importorskip("Code2_Gradio_sync")
+
+
+@pytest.fixture(scope="module")
+def shipments():
+    return app.generate_shipments(2000)
+
+
+def test_generated_frame_matches_schema(shipments):
+    for col, dtype in app.SHIPMENT_DTYPES.items():
+        if col in app.TIMESTAMP_COLUMNS:
+            assert shipments[col].dtype.kind == "M", col
+        else:
+            assert shipments[col].dtype == dtype, col
+
+
+def test_shipment_ids_are_fixed_width_bytes(shipments):
+    ids = shipments["shipment_id"]
+    assert ids.dtype.itemsize == app.SHIPMENT_ID_WIDTH
+    assert ids.memory_usage(deep=True, index=False) == app.SHIPMENT_ID_WIDTH * len(ids)
+    assert app.text_ids(shipments)["shipment_id"].iloc[0] == "SHP001000"
+
+
+def test_typed_frame_is_much_smaller_than_plain_csv_load(shipments, tmp_path):
+    path = tmp_path / "shipments.csv"
+    app.text_ids(shipments).to_csv(path, index=False)
+    baseline = pd.read_csv(path)
+
+    report = app.shipment_memory_report(shipments, baseline)
+
+    assert report.loc["TOTAL", "reduction_x"] >= 3
+    assert report.loc["shipment_id", "reduction_x"] >= 4
+
+
+def test_load_shipments_round_trips_csv_export(shipments, tmp_path):
+    path = tmp_path / "shipments.csv"
+    app.text_ids(shipments).to_csv(path, index=False)
+
+    loaded = app.load_shipments(str(path))
+
+    for col in app.SHIPMENT_DTYPES:
+        assert loaded[col].dtype.kind == shipments[col].dtype.kind, col
+    assert loaded["shipment_id"].tolist() == shipments["shipment_id"].tolist()
+
+
+def test_store_frames_keep_the_compact_id_column(shipments, tmp_path):
+    store = app.ShipmentStore.create(str(tmp_path / "store"), shipments.head(100))
+
+    frame = store.to_frame()
+
+    assert frame["shipment_id"].dtype == shipments["shipment_id"].dtype
+    assert store.row("SHP001042")["shipment_id"] == b"SHP001042"
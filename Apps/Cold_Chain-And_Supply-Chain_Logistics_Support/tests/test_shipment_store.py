@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("plotly")
+app = pytest.importorskip("Code2_Gradio_sync")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return app.ShipmentStore.create(str(tmp_path / "store"), app.generate_shipments(100))
+
+
+def test_update_row_persists_across_reopen(store):
+    store.update_row("SHP001005", {"current_temperature_c": 9.5, "status": "Delayed"})
+
+    reopened = app.ShipmentStore(store.path)
+    row = reopened.row("SHP001005")
+
+    assert row["current_temperature_c"] == pytest.approx(9.5)
+    assert row["status"] == "Delayed"
+    assert reopened.row("SHP001006")["shipment_id"] == b"SHP001006"
+
+
+def test_new_category_is_saved_atomically_in_the_schema(store):
+    store.update_row("SHP001001", {"route_to": "Guwahati"})
+
+    reopened = app.ShipmentStore(store.path)
+
+    assert "Guwahati" in reopened.schema["columns"]["route_to"]["categories"]
+    assert reopened.row("SHP001001")["route_to"] == "Guwahati"
+    assert sorted(os.listdir(store.path)) == sorted(
+        [f"{col}.npy" for col in store.columns] + [app.ShipmentStore.SCHEMA_FILE])
+
+
+def test_chunked_reads_cover_every_row(store):
+    chunks = list(store.iter_frames(chunk_rows=30))
+
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    assert sum(chunk["overall_alert"].sum() for chunk in chunks) == store.to_frame()["overall_alert"].sum()
+
+
+def test_telemetry_update_recomputes_alerts_and_reaches_disk():
+    fields = app.update_shipment_telemetry(" shp001010 ", distance_completed=0, status="Delayed")
+
+    assert fields["progress_pct"] == 0
+    assert fields["delayed_alert"] == 1
+    assert fields["overall_alert"] == 1
+    row = app.ShipmentStore(app.SHIPMENT_STORE_DIR).row("SHP001010")
+    assert row["status"] == "Delayed"
+    assert row["distance_completed_km"] == 0
+
+
+def test_unknown_status_is_rejected_without_writing():
+    before = app.shipment_store.row("SHP001011")["status"]
+
+    with pytest.raises(ValueError):
+        app.update_shipment_telemetry("SHP001011", status="Lost")
+
+    assert app.shipment_store.row("SHP001011")["status"] == before
+    assert app.update_shipment_telemetry("SHP999999", temperature=5) is None
@@ -1,12 +1,39 @@
 import pandas as pd
 import numpy as np
-import re
+import threading
+from collections import OrderedDict
 from google.colab import files
 import matplotlib.pyplot as plt
 import seaborn as sns
 from IPython.display import display, HTML, clear_output
 import ipywidgets as widgets
 
+from medicine_core import (
+    _WORD, normalize_columns, SearchIndex, PriceIndex, TypoIndex, intent_router,
+)
+
+
+CARD_CACHE_SIZE = 2048
+CARD_COLUMNS = [
+    "medicine_name", "brand", "manufacturer", "composition", "dosage_form", "strength",
+    "price", "indications", "side_effects", "prescription_required",
+]
+# Result card templates; cards are cached per medicine
+CARD_TEMPLATE = (
+    "<b>{name} ({brand})</b><br>"
+    "• Manufacturer: {manufacturer}<br>"
+    "• Composition: {composition}<br>"
+    "• Form: {dosage_form} - {strength}<br>"
+    "• Price: ₹{price:.2f}<br>"
+    "• For: {indications}<br>"
+    "• Side Effects: {side_effects}<br>"
+    "• Prescription Required: {prescription_required}<br>"
+)
+CHEAPEST_TEMPLATE = (
+    "<br><b>Cheapest medicine in these results:</b> "
+    "{name} ({brand}) - ₹{price:.2f}"
+)
+
 
 class MedicineChatbot:
     def __init__(self, data=None):
@@ -16,6 +43,15 @@ class MedicineChatbot:
             print(f"Dataset loaded successfully with {len(self.df)} medicines.")
         else:
             self.create_sample_dataset()
+        # Rendered result cards, keyed by medicine_id when it identifies rows (else by row label)
+        ids = self.df["medicine_id"] if "medicine_id" in self.df else None
+        self._card_key = "medicine_id" if ids is not None and ids.notna().all() and ids.is_unique else None
+        self._card_cache = OrderedDict()
+        self._card_lock = threading.Lock()  # widget callbacks may render concurrently
+        self.normalized = normalize_columns(self.df)
+        self.search_index = SearchIndex(self.normalized)
+        self.price_index = PriceIndex(self.normalized["medicine_name"], self.df["price"])
+        self.typo_index = TypoIndex(self.normalized)
 
     def create_sample_dataset(self):
         """Create a default sample dataset with basic medicine information."""
@@ -85,129 +121,123 @@ class MedicineChatbot:
 
     def search_medicine(self, query: str) -> pd.DataFrame:
         """Search for medicines that match a free-text query."""
+        return self.df.iloc[self.search_index.search(query.lower(), limit=5)]
+
+    def _rows_containing(self, field: str, text: str) -> pd.DataFrame:
+        """Rows whose normalized field contains text, testing each distinct value once."""
+        column = self.normalized[field]
+        hits = np.append(np.asarray(column.cat.categories.str.contains(text), dtype=bool), False)
+        return self.df[hits[column.cat.codes.to_numpy()]]
+
+    def search_corrected(self, query: str):
+        """Search with typos corrected; returns (corrected query, results)."""
         query = query.lower()
-        mask = (
-            self.df["medicine_name"].str.lower().str.contains(query) |
-            self.df["brand"].str.lower().str.contains(query) |
-            self.df["composition"].str.lower().str.contains(query) |
-            self.df["indications"].str.lower().str.contains(query)
-        )
-        return self.df[mask].head(5)
+        corrected = self.typo_index.correct(query)
+        if corrected == query:
+            return query, self.df.iloc[:0]
+        results = self.search_medicine(corrected)
+        if len(results) == 0:
+            # Other words of the query may not be in the catalogue; try the corrected ones alone
+            words = {self.typo_index.correct_word(word) for word in _WORD.findall(query)}
+            for word in sorted(words & self.typo_index.known, key=len, reverse=True):
+                results = self.search_medicine(word)
+                if len(results):
+                    return word, results
+        return corrected, results
 
     def find_by_composition(self, composition: str) -> pd.DataFrame:
         """Find medicines matching a given composition."""
-        composition = composition.lower()
-        return self.df[self.df["composition"].str.lower().str.contains(composition)]
+        return self._rows_containing("composition", composition.lower())
 
     def find_by_brand(self, brand: str) -> pd.DataFrame:
         """Find medicines from a specific brand."""
-        brand = brand.lower()
-        return self.df[self.df["brand"].str.lower().str.contains(brand)]
+        return self._rows_containing("brand", brand.lower())
 
     def find_by_indication(self, indication: str) -> pd.DataFrame:
         """Find medicines for a specific indication."""
-        indication = indication.lower()
-        return self.df[self.df["indications"].str.lower().str.contains(indication)]
+        return self._rows_containing("indications", indication.lower())
 
     def compare_prices(self, medicine_name: str) -> pd.DataFrame:
         """Compare prices of different brands for the same medicine."""
-        medicine_name = medicine_name.lower()
-        matches = self.df[self.df["medicine_name"].str.lower() == medicine_name]
-        if len(matches) > 1:
-            return matches.sort_values("price")
-        return matches
+        return self.df.iloc[self.price_index.lookup(medicine_name.lower())]
+
+    def price_summary(self, medicine_name: str) -> str:
+        """Short price range text for a medicine, empty if it has fewer than two priced options."""
+        stats = self.price_index.stats(medicine_name.lower())
+        if stats is None or stats["count"] < 2 or np.isnan(stats["min"]):
+            return ""
+        return (f" {stats['count']} options, ₹{stats['min']:.2f} - ₹{stats['max']:.2f}"
+                f" (median ₹{stats['median']:.2f})")
 
     def process_query(self, query: str):
         """Process a user query and route it to the appropriate search."""
-        query = query.lower()
-
-        # Composition-based queries
-        if any(word in query for word in ["composition", "contain", "ingredient"]):
-            composition_match = re.search(
-                r"(?:composition|contain|ingredient)[s\s]*(of|in|for)?\s*([a-zA-Z\s]+)", query
+        intent, entity = intent_router.route(query)
+        if intent == "composition":
+            return (
+                f"Showing medicines with composition '{entity}':",
+                self.find_by_composition(entity),
             )
-            if composition_match:
-                composition = composition_match.group(2).strip()
-                return (
-                    f"Showing medicines with composition '{composition}':",
-                    self.find_by_composition(composition),
-                )
-
-        # Brand-based queries
-        if any(word in query for word in ["brand", "company", "manufacturer"]):
-            brand_match = re.search(
-                r"(?:brand|company|manufacturer)[s\s]*(of|from|by)?\s*([a-zA-Z\s]+)", query
+        if intent == "brand":
+            return (
+                f"Showing medicines from brand '{entity}':",
+                self.find_by_brand(entity),
             )
-            if brand_match:
-                brand = brand_match.group(2).strip()
-                return (
-                    f"Showing medicines from brand '{brand}':",
-                    self.find_by_brand(brand),
-                )
-
-        # Indication-based queries
-        if any(word in query for word in ["treat", "cure", "for", "indication"]):
-            indication_match = re.search(
-                r"(?:treat|cure|for|indication)[s\s]*(of|like|such as)?\s*([a-zA-Z\s,]+)",
-                query,
+        if intent == "indication":
+            return (
+                f"Showing medicines for treating '{entity}':",
+                self.find_by_indication(entity),
             )
-            if indication_match:
-                indication = indication_match.group(2).strip()
-                return (
-                    f"Showing medicines for treating '{indication}':",
-                    self.find_by_indication(indication),
-                )
-
-        # Price/compare queries
-        if any(word in query for word in ["price", "cost", "cheap", "expensive", "compare"]):
-            medicine_match = re.search(
-                r"(?:price|cost|cheap|expensive|compare)[s\s]*(of|for)?\s*([a-zA-Z\s]+)",
-                query,
+        if intent == "price":
+            return (
+                f"Comparing prices for '{entity}':{self.price_summary(entity)}",
+                self.compare_prices(entity),
             )
-            if medicine_match:
-                medicine = medicine_match.group(2).strip()
-                return (
-                    f"Comparing prices for '{medicine}':",
-                    self.compare_prices(medicine),
-                )
 
-        # Fallback: general text search
-        return "Showing relevant medicines for your query:", self.search_medicine(query)
+        # Fallback: general text search, then a typo-corrected search if nothing matched
+        results = self.search_medicine(entity)
+        if len(results) == 0:
+            corrected, corrected_results = self.search_corrected(entity)
+            if len(corrected_results):
+                return f"No exact match, showing results for '{corrected}':", corrected_results
+        return "Showing relevant medicines for your query:", results
 
     def format_results(self, results: pd.DataFrame) -> str:
         """Format search results as HTML."""
         if len(results) == 0:
             return "No medicines found matching your query."
 
+        keys = results[self._card_key].tolist() if self._card_key else results.index.tolist()
+        columns = [results[column].tolist() for column in CARD_COLUMNS]
         formatted_results = []
-        for _, med in results.iterrows():
-            formatted_med = (
-                f"<b>{med['medicine_name'].title()} ({med['brand']})</b><br>"
-                f"• Manufacturer: {med['manufacturer']}<br>"
-                f"• Composition: {med['composition']}<br>"
-                f"• Form: {med['dosage_form']} - {med['strength']}<br>"
-                f"• Price: ₹{med['price']:.2f}<br>"
-                f"• For: {med['indications']}<br>"
-                f"• Side Effects: {med['side_effects']}<br>"
-                f"• Prescription Required: {med['prescription_required']}<br>"
-            )
-            formatted_results.append(formatted_med)
+        for key, med in zip(keys, zip(*columns)):
+            with self._card_lock:
+                card = self._card_cache.get(key)
+                if card is not None:
+                    self._card_cache.move_to_end(key)
+            if card is None:
+                fields = dict(zip(CARD_COLUMNS, med))
+                fields["name"] = fields["medicine_name"].title()
+                card = CARD_TEMPLATE.format(**fields)
+                with self._card_lock:
+                    self._card_cache[key] = card
+                    if len(self._card_cache) > CARD_CACHE_SIZE:
+                        self._card_cache.popitem(last=False)
+            formatted_results.append(card)
 
         # Summary: cheapest in the result set
-        if len(results) > 0:
-            cheapest = results.loc[results["price"].idxmin()]
-            cheapest_text = (
-                "<br><b>Cheapest medicine in these results:</b> "
-                f"{cheapest['medicine_name']} ({cheapest['brand']}) - ₹{cheapest['price']:.2f}"
-            )
-            formatted_results.append(cheapest_text)
+        prices = np.asarray(columns[CARD_COLUMNS.index("price")], dtype=float)
+        if not np.isnan(prices).all():
+            cheapest = int(np.nanargmin(prices))
+            formatted_results.append(CHEAPEST_TEMPLATE.format(
+                name=columns[0][cheapest], brand=columns[1][cheapest], price=prices[cheapest],
+            ))
 
         return "<hr>".join(formatted_results)
 
     def visualize_price_comparison(self, medicine_name: str) -> None:
         """Display a bar chart comparing prices of different brands of a medicine."""
         medicine_name = medicine_name.lower()
-        matches = self.df[self.df["medicine_name"].str.lower() == medicine_name]
+        matches = self.df.iloc[np.sort(self.price_index.lookup(medicine_name))]
 
         if len(matches) > 1:
             plt.figure(figsize=(10, 6))
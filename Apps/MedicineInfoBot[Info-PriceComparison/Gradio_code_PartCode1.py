@@ -1,11 +1,160 @@
 import pandas as pd
 import numpy as np
-import re
+import os
+import time
+import hashlib
+import html
+import itertools
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import gradio as gr
-from io import BytesIO
-from PIL import Image
+
+from medicine_core import (
+    _WORD, normalize_columns, SearchIndex, PriceIndex, TypoIndex, intent_router,
+)
+
+
+CHART_CACHE_SIZE = 64
+CHART_COLORS = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe']
+_dataset_versions = itertools.count(1)
+
+
+class ChartCache:
+    """LRU cache of rendered chart PNGs on disk, keyed by (medicine name, dataset version).
+
+    Files are handed to Gradio as-is, so a hit skips rendering and image re-encoding;
+    evicted charts are deleted.
+    """
+
+    def __init__(self, max_size=CHART_CACHE_SIZE):
+        self.max_size = max_size
+        self.directory = tempfile.mkdtemp(prefix="medicine_charts_")
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._names = itertools.count()
+        self._lock = threading.Lock()
+        # Rendering reuses one figure, so cold renders are serialized
+        self._render_lock = threading.Lock()
+        self._figure = None
+
+    def _axes(self):
+        if self._figure is None:
+            plt.style.use('seaborn-v0_8-darkgrid')
+            self._figure = Figure(figsize=(12, 7))
+            self._figure.add_subplot()
+        return self._figure.axes[0]
+
+    def _get(self, key):
+        with self._lock:
+            path = self.paths.get(key)
+            if path is not None:
+                self.paths.move_to_end(key)
+                self.hits += 1
+            return path
+
+    def _put(self, key, path):
+        with self._lock:
+            self.paths[key] = path
+            self.misses += 1
+            while len(self.paths) > self.max_size:
+                _, evicted = self.paths.popitem(last=False)
+                try:
+                    os.remove(evicted)
+                except OSError:
+                    pass
+
+    def price_chart(self, key, title, brands, prices):
+        """Path of the bar chart for key, rendering it on a miss"""
+        path = self._get(key)
+        if path is not None:
+            return path
+        with self._render_lock:
+            path = self._get(key)
+            if path is not None:
+                return path
+            ax = self._axes()
+            ax.clear()
+
+            # Create bar plot with better colors
+            bars = ax.bar(brands, prices, color=CHART_COLORS, edgecolor='black', linewidth=2)
+
+            # Add value labels on bars
+            for bar in bars:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height,
+                       f'₹{height:.2f}',
+                       ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+            # Styling
+            ax.set_title(title, fontsize=18, fontweight='bold', pad=20)
+            ax.set_xlabel("Brand", fontsize=14, fontweight='bold')
+            ax.set_ylabel("Price (₹)", fontsize=14, fontweight='bold')
+            ax.tick_params(axis='both', labelsize=12)
+            ax.tick_params(axis='x', labelrotation=45)
+            for label in ax.get_xticklabels():
+                label.set_horizontalalignment('right')
+
+            # Add grid
+            ax.grid(True, alpha=0.3, linestyle='--')
+            ax.set_axisbelow(True)
+
+            self._figure.tight_layout()
+            path = os.path.join(self.directory, f"chart-{next(self._names)}.png")
+            self._figure.savefig(path, format='png', dpi=150, bbox_inches='tight',
+                                 facecolor='white', edgecolor='none')
+        self._put(key, path)
+        return path
+
+
+chart_cache = ChartCache()
+
+
+CARD_CACHE_SIZE = 2048
+CARD_COLUMNS = [
+    "medicine_name", "brand", "manufacturer", "composition", "dosage_form", "strength",
+    "price", "indications", "side_effects", "prescription_required",
+]
+# Result card templates: the numbered heading is per-result, the rest of a card is cached per medicine
+CARD_HEAD_TEMPLATE = """
+            <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                        padding: 20px; margin: 15px 0; border-radius: 12px; 
+                        box-shadow: 0 4px 6px rgba(0,0,0,0.1); color: white;'>
+                <h2 style='margin-top: 0; color: #ffffff; font-size: 24px; border-bottom: 2px solid white; padding-bottom: 10px;'>
+                    {idx}. """
+CARD_BODY_TEMPLATE = """{name} ({brand})
+                </h2>
+                <div style='background: rgba(255,255,255,0.2); padding: 15px; border-radius: 8px; margin-top: 10px;'>
+                    <p style='font-size: 16px; margin: 8px 0;'><strong>🏭 Manufacturer:</strong> {manufacturer}</p>
+                    <p style='font-size: 16px; margin: 8px 0;'><strong>💊 Composition:</strong> {composition}</p>
+                    <p style='font-size: 16px; margin: 8px 0;'><strong>📋 Form:</strong> {dosage_form} - {strength}</p>
+                    <p style='font-size: 18px; margin: 8px 0; background: #ffd700; color: #000; padding: 8px; border-radius: 5px; display: inline-block;'>
+                        <strong>💰 Price: ₹{price:.2f}</strong>
+                    </p>
+                    <p style='font-size: 16px; margin: 8px 0;'><strong>🎯 For:</strong> {indications}</p>
+                    <p style='font-size: 16px; margin: 8px 0;'><strong>⚠️ Side Effects:</strong> {side_effects}</p>
+                    <p style='font-size: 16px; margin: 8px 0;'><strong>📝 Prescription Required:</strong> {prescription_required}</p>
+                </div>
+            </div>
+            """
+CHEAPEST_TEMPLATE = """
+            <div style='background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); 
+                        padding: 20px; margin: 15px 0; border-radius: 12px; 
+                        box-shadow: 0 6px 12px rgba(0,0,0,0.2); color: white;'>
+                <h2 style='margin-top: 0; color: #ffffff; font-size: 22px;'>
+                    🏆 Cheapest Medicine in Results
+                </h2>
+                <p style='font-size: 20px; margin: 10px 0; background: rgba(255,255,255,0.3); padding: 15px; border-radius: 8px;'>
+                    <strong>{name} ({brand})</strong><br>
+                    <span style='font-size: 24px; color: #ffff00;'>₹{price:.2f}</span>
+                </p>
+            </div>
+            """
+NO_RESULTS_HTML = "<div style='background: #ffe6e6; padding: 20px; border-radius: 10px; border: 2px solid #ff4444;'><h3 style='color: #cc0000; margin:0;'>❌ No medicines found matching your query.</h3></div>"
 
 
 class MedicineChatbot:
@@ -17,6 +166,16 @@ class MedicineChatbot:
         else:
             self.create_sample_dataset()
             self.dataset_status = f"Sample dataset created with {len(self.df)} medicines."
+        self.version = next(_dataset_versions)
+        # Rendered result cards, keyed by medicine_id when it identifies rows (else by row label)
+        ids = self.df["medicine_id"] if "medicine_id" in self.df else None
+        self._card_key = "medicine_id" if ids is not None and ids.notna().all() and ids.is_unique else None
+        self._card_cache = OrderedDict()
+        self._card_lock = threading.Lock()  # chatbots are shared across sessions
+        self.normalized = normalize_columns(self.df)
+        self.search_index = SearchIndex(self.normalized)
+        self.price_index = PriceIndex(self.normalized["medicine_name"], self.df["price"])
+        self.typo_index = TypoIndex(self.normalized)
 
     def create_sample_dataset(self):
         """Create a default sample dataset with basic medicine information."""
@@ -85,225 +244,410 @@ class MedicineChatbot:
 
     def search_medicine(self, query: str) -> pd.DataFrame:
         """Search for medicines that match a free-text query."""
+        return self.df.iloc[self.search_index.search(query.lower(), limit=5)]
+
+    def _rows_containing(self, field: str, text: str) -> pd.DataFrame:
+        """Rows whose normalized field contains text, testing each distinct value once."""
+        column = self.normalized[field]
+        hits = np.append(np.asarray(column.cat.categories.str.contains(text), dtype=bool), False)
+        return self.df[hits[column.cat.codes.to_numpy()]]
+
+    def search_corrected(self, query: str):
+        """Search with typos corrected; returns (corrected query, results)."""
         query = query.lower()
-        mask = (
-            self.df["medicine_name"].str.lower().str.contains(query) |
-            self.df["brand"].str.lower().str.contains(query) |
-            self.df["composition"].str.lower().str.contains(query) |
-            self.df["indications"].str.lower().str.contains(query)
-        )
-        return self.df[mask].head(5)
+        corrected = self.typo_index.correct(query)
+        if corrected == query:
+            return query, self.df.iloc[:0]
+        results = self.search_medicine(corrected)
+        if len(results) == 0:
+            # Other words of the query may not be in the catalogue; try the corrected ones alone
+            words = {self.typo_index.correct_word(word) for word in _WORD.findall(query)}
+            for word in sorted(words & self.typo_index.known, key=len, reverse=True):
+                results = self.search_medicine(word)
+                if len(results):
+                    return word, results
+        return corrected, results
 
     def find_by_composition(self, composition: str) -> pd.DataFrame:
         """Find medicines matching a given composition."""
-        composition = composition.lower()
-        return self.df[self.df["composition"].str.lower().str.contains(composition)]
+        return self._rows_containing("composition", composition.lower())
 
     def find_by_brand(self, brand: str) -> pd.DataFrame:
         """Find medicines from a specific brand."""
-        brand = brand.lower()
-        return self.df[self.df["brand"].str.lower().str.contains(brand)]
+        return self._rows_containing("brand", brand.lower())
 
     def find_by_indication(self, indication: str) -> pd.DataFrame:
         """Find medicines for a specific indication."""
-        indication = indication.lower()
-        return self.df[self.df["indications"].str.lower().str.contains(indication)]
+        return self._rows_containing("indications", indication.lower())
 
     def compare_prices(self, medicine_name: str) -> pd.DataFrame:
         """Compare prices of different brands for the same medicine."""
-        medicine_name = medicine_name.lower()
-        matches = self.df[self.df["medicine_name"].str.lower() == medicine_name]
-        if len(matches) > 1:
-            return matches.sort_values("price")
-        return matches
+        return self.df.iloc[self.price_index.lookup(medicine_name.lower())]
+
+    def price_summary(self, medicine_name: str) -> str:
+        """Short price range text for a medicine, empty if it has fewer than two priced options."""
+        stats = self.price_index.stats(medicine_name.lower())
+        if stats is None or stats["count"] < 2 or np.isnan(stats["min"]):
+            return ""
+        return (f" {stats['count']} options, ₹{stats['min']:.2f} - ₹{stats['max']:.2f}"
+                f" (median ₹{stats['median']:.2f})")
 
     def process_query(self, query: str):
         """Process a user query and route it to the appropriate search."""
-        query = query.lower()
-
-        # Composition-based queries
-        if any(word in query for word in ["composition", "contain", "ingredient"]):
-            composition_match = re.search(
-                r"(?:composition|contain|ingredient)[s\s]*(of|in|for)?\s*([a-zA-Z\s]+)", query
+        intent, entity = intent_router.route(query)
+        if intent == "composition":
+            return (
+                f"Showing medicines with composition '{entity}':",
+                self.find_by_composition(entity),
             )
-            if composition_match:
-                composition = composition_match.group(2).strip()
-                return (
-                    f"Showing medicines with composition '{composition}':",
-                    self.find_by_composition(composition),
-                )
-
-        # Brand-based queries
-        if any(word in query for word in ["brand", "company", "manufacturer"]):
-            brand_match = re.search(
-                r"(?:brand|company|manufacturer)[s\s]*(of|from|by)?\s*([a-zA-Z\s]+)", query
+        if intent == "brand":
+            return (
+                f"Showing medicines from brand '{entity}':",
+                self.find_by_brand(entity),
             )
-            if brand_match:
-                brand = brand_match.group(2).strip()
-                return (
-                    f"Showing medicines from brand '{brand}':",
-                    self.find_by_brand(brand),
-                )
-
-        # Indication-based queries
-        if any(word in query for word in ["treat", "cure", "for", "indication"]):
-            indication_match = re.search(
-                r"(?:treat|cure|for|indication)[s\s]*(of|like|such as)?\s*([a-zA-Z\s,]+)",
-                query,
+        if intent == "indication":
+            return (
+                f"Showing medicines for treating '{entity}':",
+                self.find_by_indication(entity),
             )
-            if indication_match:
-                indication = indication_match.group(2).strip()
-                return (
-                    f"Showing medicines for treating '{indication}':",
-                    self.find_by_indication(indication),
-                )
-
-        # Price/compare queries
-        if any(word in query for word in ["price", "cost", "cheap", "expensive", "compare"]):
-            medicine_match = re.search(
-                r"(?:price|cost|cheap|expensive|compare)[s\s]*(of|for)?\s*([a-zA-Z\s]+)",
-                query,
+        if intent == "price":
+            return (
+                f"Comparing prices for '{entity}':{self.price_summary(entity)}",
+                self.compare_prices(entity),
             )
-            if medicine_match:
-                medicine = medicine_match.group(2).strip()
-                return (
-                    f"Comparing prices for '{medicine}':",
-                    self.compare_prices(medicine),
-                )
 
-        # Fallback: general text search
-        return "Showing relevant medicines for your query:", self.search_medicine(query)
+        # Fallback: general text search, then a typo-corrected search if nothing matched
+        results = self.search_medicine(entity)
+        if len(results) == 0:
+            corrected, corrected_results = self.search_corrected(entity)
+            if len(corrected_results):
+                return f"No exact match, showing results for '{corrected}':", corrected_results
+        return "Showing relevant medicines for your query:", results
 
     def format_results(self, results: pd.DataFrame) -> str:
         """Format search results as HTML with better colors and contrast."""
         if len(results) == 0:
-            return "<div style='background: #ffe6e6; padding: 20px; border-radius: 10px; border: 2px solid #ff4444;'><h3 style='color: #cc0000; margin:0;'>❌ No medicines found matching your query.</h3></div>"
+            return NO_RESULTS_HTML
 
+        keys = results[self._card_key].tolist() if self._card_key else results.index.tolist()
+        columns = [results[column].tolist() for column in CARD_COLUMNS]
         formatted_results = []
-        for idx, (_, med) in enumerate(results.iterrows(), 1):
-            formatted_med = f"""
-            <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                        padding: 20px; margin: 15px 0; border-radius: 12px; 
-                        box-shadow: 0 4px 6px rgba(0,0,0,0.1); color: white;'>
-                <h2 style='margin-top: 0; color: #ffffff; font-size: 24px; border-bottom: 2px solid white; padding-bottom: 10px;'>
-                    {idx}. {med['medicine_name'].title()} ({med['brand']})
-                </h2>
-                <div style='background: rgba(255,255,255,0.2); padding: 15px; border-radius: 8px; margin-top: 10px;'>
-                    <p style='font-size: 16px; margin: 8px 0;'><strong>🏭 Manufacturer:</strong> {med['manufacturer']}</p>
-                    <p style='font-size: 16px; margin: 8px 0;'><strong>💊 Composition:</strong> {med['composition']}</p>
-                    <p style='font-size: 16px; margin: 8px 0;'><strong>📋 Form:</strong> {med['dosage_form']} - {med['strength']}</p>
-                    <p style='font-size: 18px; margin: 8px 0; background: #ffd700; color: #000; padding: 8px; border-radius: 5px; display: inline-block;'>
-                        <strong>💰 Price: ₹{med['price']:.2f}</strong>
-                    </p>
-                    <p style='font-size: 16px; margin: 8px 0;'><strong>🎯 For:</strong> {med['indications']}</p>
-                    <p style='font-size: 16px; margin: 8px 0;'><strong>⚠️ Side Effects:</strong> {med['side_effects']}</p>
-                    <p style='font-size: 16px; margin: 8px 0;'><strong>📝 Prescription Required:</strong> {med['prescription_required']}</p>
-                </div>
-            </div>
-            """
-            formatted_results.append(formatted_med)
+        for idx, (key, med) in enumerate(zip(keys, zip(*columns)), 1):
+            with self._card_lock:
+                body = self._card_cache.get(key)
+                if body is not None:
+                    self._card_cache.move_to_end(key)
+            if body is None:
+                fields = dict(zip(CARD_COLUMNS, med))
+                fields["name"] = fields["medicine_name"].title()
+                body = CARD_BODY_TEMPLATE.format(**fields)
+                with self._card_lock:
+                    self._card_cache[key] = body
+                    if len(self._card_cache) > CARD_CACHE_SIZE:
+                        self._card_cache.popitem(last=False)
+            formatted_results.append(CARD_HEAD_TEMPLATE.format(idx=idx))
+            formatted_results.append(body)
 
         # Summary: cheapest in the result set
-        if len(results) > 0:
-            cheapest = results.loc[results["price"].idxmin()]
-            cheapest_text = f"""
-            <div style='background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); 
-                        padding: 20px; margin: 15px 0; border-radius: 12px; 
-                        box-shadow: 0 6px 12px rgba(0,0,0,0.2); color: white;'>
-                <h2 style='margin-top: 0; color: #ffffff; font-size: 22px;'>
-                    🏆 Cheapest Medicine in Results
-                </h2>
-                <p style='font-size: 20px; margin: 10px 0; background: rgba(255,255,255,0.3); padding: 15px; border-radius: 8px;'>
-                    <strong>{cheapest['medicine_name'].title()} ({cheapest['brand']})</strong><br>
-                    <span style='font-size: 24px; color: #ffff00;'>₹{cheapest['price']:.2f}</span>
-                </p>
-            </div>
-            """
-            formatted_results.append(cheapest_text)
+        prices = np.asarray(columns[CARD_COLUMNS.index("price")], dtype=float)
+        if not np.isnan(prices).all():
+            cheapest = int(np.nanargmin(prices))
+            formatted_results.append(CHEAPEST_TEMPLATE.format(
+                name=columns[0][cheapest].title(), brand=columns[1][cheapest], price=prices[cheapest],
+            ))
 
         return "".join(formatted_results)
 
     def visualize_price_comparison(self, medicine_name: str):
-        """Display a bar chart comparing prices of different brands of a medicine."""
+        """Path of a cached bar chart comparing prices of different brands of a medicine."""
         medicine_name = medicine_name.lower()
-        matches = self.df[self.df["medicine_name"].str.lower() == medicine_name]
+        matches = self.df.iloc[np.sort(self.price_index.lookup(medicine_name))]
 
         if len(matches) > 1:
-            # Set style and create figure
-            plt.style.use('seaborn-v0_8-darkgrid')
-            fig, ax = plt.subplots(figsize=(12, 7))
-            
-            # Create bar plot with better colors
-            bars = ax.bar(matches['brand'], matches['price'], 
-                         color=['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe'],
-                         edgecolor='black', linewidth=2)
-            
-            # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'₹{height:.2f}',
-                       ha='center', va='bottom', fontsize=12, fontweight='bold')
-            
-            # Styling
-            ax.set_title(f"Price Comparison for {medicine_name.title()}", 
-                        fontsize=18, fontweight='bold', pad=20)
-            ax.set_xlabel("Brand", fontsize=14, fontweight='bold')
-            ax.set_ylabel("Price (₹)", fontsize=14, fontweight='bold')
-            ax.tick_params(axis='both', labelsize=12)
-            plt.xticks(rotation=45, ha='right')
-            
-            # Add grid
-            ax.grid(True, alpha=0.3, linestyle='--')
-            ax.set_axisbelow(True)
-            
-            plt.tight_layout()
-            
-            # Save to BytesIO and return as PIL Image
-            buf = BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none')
-            buf.seek(0)
-            img = Image.open(buf)
-            plt.close(fig)
-            return img
+            return chart_cache.price_chart(
+                (medicine_name, self.version),
+                f"Price Comparison for {medicine_name.title()}",
+                matches['brand'].tolist(),
+                matches['price'].tolist(),
+            )
         else:
             return None
 
 
-# Initialize chatbot with sample data
+# Initialize chatbot with sample data (the dataset of every session that has not uploaded one)
 chatbot = MedicineChatbot()
 
 
-def upload_dataset(file):
-    """Handle dataset upload."""
-    global chatbot
+DATASET_COLUMNS = [
+    "medicine_id", "medicine_name", "brand", "manufacturer", "composition", "price",
+    "dosage_form", "strength", "indications", "side_effects", "prescription_required",
+]
+INGEST_CHUNK_ROWS = 100_000
+
+
+def _concat_categoricals(parts):
+    """Concatenate categorical chunks, merging their categories instead of falling back to object"""
+    return pd.Series(pd.api.types.union_categoricals(parts, ignore_order=True))
+
+
+def read_dataset(path, progress=None, chunk_rows=INGEST_CHUNK_ROWS):
+    """Read a medicine CSV in chunks into compact dtypes.
+
+    Checks the header against DATASET_COLUMNS first, then casts each chunk as it
+    arrives: text columns become categoricals and price becomes float32 (unparseable
+    prices become NaN). Returns (df, invalid_prices).
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [column for column in DATASET_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)}")
+
+    text_columns = [column for column in DATASET_COLUMNS if column not in ("medicine_id", "price")]
+    size = max(os.path.getsize(path), 1)
+    parts = defaultdict(list)
+    invalid_prices = 0
+    with open(path, "rb") as handle:
+        dtypes = {column: ("category" if column in text_columns else str) for column in DATASET_COLUMNS}
+        reader = pd.read_csv(handle, usecols=DATASET_COLUMNS, dtype=dtypes, chunksize=chunk_rows)
+        for chunk in reader:
+            price = pd.to_numeric(chunk["price"], errors="coerce")
+            invalid_prices += int((price.isna() & chunk["price"].notna()).sum())
+            parts["price"].append(price.astype("float32"))
+            parts["medicine_id"].append(pd.to_numeric(chunk["medicine_id"], errors="coerce"))
+            for column in text_columns:
+                parts[column].append(chunk[column])
+            if progress is not None:
+                progress(min(handle.tell() / size, 1.0), desc="Reading dataset")
+
+    if not sum(map(len, parts["price"])):
+        raise ValueError("the file has no rows")
+    df = pd.DataFrame({
+        column: (_concat_categoricals(parts[column]) if column in text_columns
+                 else pd.concat(parts[column], ignore_index=True))
+        for column in DATASET_COLUMNS
+    })
+    if df["medicine_id"].notna().all():
+        df["medicine_id"] = pd.to_numeric(df["medicine_id"], downcast="integer")
+    return df, invalid_prices
+
+
+MAX_DATASETS = int(os.environ.get("MEDICINE_MAX_DATASETS", "8"))
+DATASET_IDLE_SECONDS = float(os.environ.get("MEDICINE_DATASET_IDLE_SECONDS", "1800"))
+RESPONSE_CACHE_BYTES = int(float(os.environ.get("MEDICINE_RESPONSE_CACHE_MB", "32")) * 1024 * 1024)
+
+
+class ResponseCache:
+    """LRU cache of search responses (HTML, chart path), keyed by (dataset version, normalized query).
+
+    Bounded by the total UTF-8 size of the cached HTML. Queries are normalized by
+    lowercasing only, since the free-text search is whitespace-sensitive.
+    """
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(version, query):
+        return version, query.lower()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+        # The chart file may have been evicted from the chart cache since; check
+        # outside the lock so a slow disk never blocks other lookups
+        if entry is not None and entry[1] is not None and not os.path.exists(entry[1]):
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[:2]
+
+    def put(self, key, html, chart):
+        size = len(html.encode()) + len(key[1].encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[2]
+            self.entries[key] = (html, chart, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self.size -= self.entries.popitem(last=False)[1][2]
+
+    def _drop(self, keys):
+        for key in keys:
+            self.size -= self.entries.pop(key)[2]
+
+    def invalidate(self, version):
+        """Drop every response computed from a dataset version"""
+        with self._lock:
+            self._drop([key for key in self.entries if key[0] == version])
+
+    def retain(self, versions):
+        """Drop every response whose dataset version is not in versions"""
+        with self._lock:
+            self._drop([key for key in self.entries if key[0] not in versions])
+
+    def stats_text(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            rate = 100 * self.hits / lookups if lookups else 0.0
+            return (f"Response cache: {self.hits}/{lookups} hits ({rate:.0f}%) · "
+                    f"{len(self.entries)} responses · {self.size / 1024:.0f} KB")
+
+
+response_cache = ResponseCache()
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of a file's content, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetRegistry:
+    """Uploaded datasets shared between sessions, keyed by the content hash of the file.
+
+    Each session only holds a key (in gr.State). A MedicineChatbot and its indexes are
+    never modified once built: an upload builds a new one, so other sessions keep
+    theirs. Uploads of an identical file reuse the existing chatbot. Datasets idle for
+    longer than idle_seconds, or beyond max_datasets (least recently used first), are
+    evicted; sessions still pointing at them fall back to the sample dataset.
+    """
+
+    def __init__(self, default, max_datasets=MAX_DATASETS, idle_seconds=DATASET_IDLE_SECONDS):
+        self.default = default
+        self.max_datasets = max_datasets
+        self.idle_seconds = idle_seconds
+        self.entries = OrderedDict()  # key -> [chatbot, invalid_prices, last_used]
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def _evict(self, now):
+        while self.entries:
+            key, (_, _, last_used) = next(iter(self.entries.items()))
+            if len(self.entries) <= self.max_datasets and now - last_used <= self.idle_seconds:
+                break
+            response_cache.invalidate(self.entries.pop(key)[0].version)
+
+    def _touch(self, key, now):
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry[2] = now
+            self.entries.move_to_end(key)
+        return entry
+
+    def get(self, key):
+        """The chatbot for key, or None if it was evicted (the sample dataset for key None)"""
+        if key is None:
+            return self.default
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._touch(key, now)
+        return None if entry is None else entry[0]
+
+    def versions(self):
+        """Dataset versions still registered, the sample dataset's included"""
+        with self._lock:
+            return {self.default.version} | {entry[0].version for entry in self.entries.values()}
+
+    def load(self, path, progress=None):
+        """(key, chatbot, invalid_prices, reused) for a CSV file, building the chatbot only once per content"""
+        key = file_digest(path)
+        with self._lock:
+            entry = self._touch(key, time.monotonic())
+            if entry is not None:
+                return key, entry[0], entry[1], True
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                entry = self._touch(key, time.monotonic())
+            if entry is not None:
+                return key, entry[0], entry[1], True
+            try:
+                df, invalid_prices = read_dataset(path, progress)
+                if progress is not None:
+                    progress(1.0, desc="Building search indexes")
+                new_chatbot = MedicineChatbot(df)
+            except Exception:
+                with self._lock:
+                    self._building.pop(key, None)
+                raise
+            # Register the entry and clear the build marker in one step, so a concurrent
+            # upload of the same file either waits on build_lock or finds the entry.
+            now = time.monotonic()
+            with self._lock:
+                self.entries[key] = [new_chatbot, invalid_prices, now]
+                self._building.pop(key, None)
+                self._evict(now)
+        return key, new_chatbot, invalid_prices, False
+
+
+datasets = DatasetRegistry(chatbot)
+
+
+def upload_dataset(file, dataset_key=None, progress=gr.Progress()):
+    """Handle dataset upload for this session; other sessions keep their own dataset."""
     if file is not None:
         try:
-            df = pd.read_csv(file.name)
-            chatbot = MedicineChatbot(df)
-            return f"<div style='background: #d4edda; padding: 15px; border-radius: 8px; border: 2px solid #28a745;'><h3 style='color: #155724; margin:0;'>✅ Dataset loaded successfully with {len(df)} medicines!</h3></div>"
+            dataset_key, new_chatbot, invalid_prices, _ = datasets.load(file.name, progress)
+            # Drop responses of datasets that are gone, including any a search cached
+            # while its dataset was being evicted
+            response_cache.retain(datasets.versions())
+            note = f" ({invalid_prices} rows with an invalid price)" if invalid_prices else ""
+            return f"<div style='background: #d4edda; padding: 15px; border-radius: 8px; border: 2px solid #28a745;'><h3 style='color: #155724; margin:0;'>✅ Dataset loaded successfully with {len(new_chatbot.df)} medicines!{note}</h3></div>", dataset_key
         except Exception as e:
-            return f"<div style='background: #f8d7da; padding: 15px; border-radius: 8px; border: 2px solid #dc3545;'><h3 style='color: #721c24; margin:0;'>❌ Error loading dataset: {str(e)}</h3></div>"
-    return "<div style='background: #fff3cd; padding: 15px; border-radius: 8px; border: 2px solid #ffc107;'><h3 style='color: #856404; margin:0;'>⚠️ No file uploaded. Using sample dataset.</h3></div>"
+            return f"<div style='background: #f8d7da; padding: 15px; border-radius: 8px; border: 2px solid #dc3545;'><h3 style='color: #721c24; margin:0;'>❌ Error loading dataset: {html.escape(str(e))}</h3></div>", dataset_key
+    return "<div style='background: #fff3cd; padding: 15px; border-radius: 8px; border: 2px solid #ffc107;'><h3 style='color: #856404; margin:0;'>⚠️ No file uploaded. Using sample dataset.</h3></div>", None
 
 
-def search_medicines(query):
-    """Handle search query."""
+def search_medicines(query, dataset_key=None):
+    """Handle search query against this session's dataset."""
     if not query.strip():
         return "<div style='background: #ffe6e6; padding: 20px; border-radius: 10px; border: 2px solid #ff4444;'><h3 style='color: #cc0000; margin:0;'>⚠️ Please enter a query.</h3></div>", None
     
-    message, results = chatbot.process_query(query)
+    bot = datasets.get(dataset_key)
+    notice = ""
+    if bot is None:
+        bot = datasets.default
+        notice = "<div style='background: #fff3cd; padding: 15px; border-radius: 8px; border: 2px solid #ffc107; margin-bottom: 20px;'><p style='color: #856404; margin:0;'>⚠️ Your uploaded dataset expired after being idle. Showing results from the sample dataset; upload it again to search it.</p></div>"
+    cache_key = ResponseCache.key(bot.version, query)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return notice + cached[0], cached[1]
+    
+    message, results = bot.process_query(query)
     header = f"<div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 10px; margin-bottom: 20px;'><h2 style='color: white; margin:0; font-size: 24px;'>🔍 {message}</h2></div>"
-    formatted_output = header + chatbot.format_results(results)
+    formatted_output = header + bot.format_results(results)
     
     # Generate chart if it's a price comparison
     chart = None
     if len(results) > 1 and "price" in query.lower():
         medicine_name = results.iloc[0]["medicine_name"]
-        chart = chatbot.visualize_price_comparison(medicine_name)
+        chart = bot.visualize_price_comparison(medicine_name)
     
-    return formatted_output, chart
+    response_cache.put(cache_key, formatted_output, chart)
+    return notice + formatted_output, chart
+
+
+def cache_footer():
+    """Footer text with the response cache statistics."""
+    return f"<p style='text-align: center; color: #888; font-size: 12px;'>{response_cache.stats_text()}</p>"
 
 
 # Create Gradio interface with custom CSS
@@ -366,26 +710,31 @@ with gr.Blocks(title="Medicine Information Chatbot", theme=gr.themes.Soft(), css
         with gr.Column(scale=2):
             output_html = gr.HTML(label="Search Results")
         with gr.Column(scale=1):
-            output_chart = gr.Image(label="Price Comparison Chart", type="pil")
+            output_chart = gr.Image(label="Price Comparison Chart", type="filepath")
+    
+    footer = gr.HTML(cache_footer())
+    
+    # Content hash of this session's uploaded dataset (None = sample dataset)
+    dataset_key = gr.State(None)
     
     # Event handlers
     upload_btn.click(
         fn=upload_dataset,
-        inputs=[file_input],
-        outputs=[upload_status]
+        inputs=[file_input, dataset_key],
+        outputs=[upload_status, dataset_key]
     )
     
     search_btn.click(
         fn=search_medicines,
-        inputs=[query_input],
+        inputs=[query_input, dataset_key],
         outputs=[output_html, output_chart]
-    )
+    ).then(fn=cache_footer, outputs=[footer])
     
     query_input.submit(
         fn=search_medicines,
-        inputs=[query_input],
+        inputs=[query_input, dataset_key],
         outputs=[output_html, output_chart]
-    )
+    ).then(fn=cache_footer, outputs=[footer])
 
 # Launch the app with share=True to generate a public link
 if __name__ == "__main__":
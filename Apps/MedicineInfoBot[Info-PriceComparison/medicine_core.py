@@ -0,0 +1,300 @@
+"""Search, price and intent indexes shared by the Colab (Code1.py) and Gradio apps."""
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ["medicine_name", "brand", "composition", "indications"]
+NGRAM_SIZE = 3
+_REGEX_CHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def normalize_columns(df, fields=SEARCH_FIELDS):
+    """Lowercase copies of the search fields, categorical-encoded so each distinct value is stored once"""
+    columns = {}
+    for field in fields:
+        values = df[field].astype("category")
+        # Lowercase each distinct value once, merging values that only differ in case
+        codes, lowered = pd.factorize(values.cat.categories.str.lower())
+        codes = np.append(codes, -1)[values.cat.codes.to_numpy()]
+        columns[field] = pd.Categorical.from_codes(codes, lowered)
+    return pd.DataFrame(columns, index=df.index)
+
+
+class SearchIndex:
+    """Trigram inverted index over the distinct values of the normalized search fields.
+
+    Values are numbered in order of their first row, and each keeps its sorted row
+    positions, so a query only verifies the values sharing its trigrams and can
+    stop as soon as the first `limit` rows are settled.
+    """
+
+    def __init__(self, normalized, n=NGRAM_SIZE):
+        self.n = n
+        df = normalized
+        value_ids = {}
+        pairs = []
+        for field in df.columns:
+            codes = df[field].cat.codes.to_numpy()
+            uniques = df[field].cat.categories
+            ids = np.array([value_ids.setdefault(v, len(value_ids)) for v in uniques.tolist()] + [-1])
+            rows = np.flatnonzero(codes >= 0)
+            pairs.append((ids[codes[rows]], rows))
+        values = list(value_ids)
+        ids = np.concatenate([p[0] for p in pairs]) if pairs else np.empty(0, dtype=int)
+        rows = np.concatenate([p[1] for p in pairs]) if pairs else np.empty(0, dtype=int)
+
+        # Renumber values by first row, then group the (value, row) pairs
+        first_row = np.full(len(values), len(df), dtype=np.int64)
+        np.minimum.at(first_row, ids, rows)
+        order = np.argsort(first_row, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        keys = np.sort(rank[ids].astype(np.int64) * (len(df) + 1) + rows)
+        keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+        value_of, row_of = np.divmod(keys, len(df) + 1)
+        bounds = np.searchsorted(value_of, np.arange(1, len(values)))
+
+        self.values = [values[i] for i in order]
+        self.first_row = first_row[order]
+        self.value_rows = np.split(row_of, bounds)
+
+        postings = defaultdict(list)
+        for value_id, value in enumerate(self.values):
+            for gram in {value[i:i + n] for i in range(len(value) - n + 1)}:
+                postings[gram].append(value_id)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def _candidates(self, query):
+        """Value ids that may contain query, ascending"""
+        if len(query) < self.n:
+            return range(len(self.values))
+        grams = sorted({query[i:i + self.n] for i in range(len(query) - self.n + 1)},
+                       key=lambda g: len(self.postings.get(g, ())))
+        result = self.postings.get(grams[0])
+        if result is None:
+            return ()
+        for gram in grams[1:]:
+            result = np.intersect1d(result, self.postings.get(gram, ()), assume_unique=True)
+            if not len(result):
+                break
+        return result.tolist()
+
+    def search(self, query, limit=None):
+        """Row positions (ascending) whose fields contain query, like str.contains"""
+        if _REGEX_CHARS.search(query):
+            # str.contains treats the query as a regex; invalid patterns are matched literally
+            try:
+                pattern = re.compile(query)
+            except re.error:
+                pattern = re.compile(re.escape(query))
+            matches = (i for i, v in enumerate(self.values) if pattern.search(v))
+        else:
+            matches = (i for i in self._candidates(query) if query in self.values[i])
+
+        if limit is None:
+            hits = [self.value_rows[i] for i in matches]
+            return np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+
+        best = []
+        for i in matches:
+            if len(best) == limit and self.first_row[i] > best[-1]:
+                break  # later values start after every row we already have
+            best = sorted(set(best).union(self.value_rows[i][:limit].tolist()))[:limit]
+        return np.array(best, dtype=np.int64)
+
+
+class PriceIndex:
+    """Row positions of each normalized medicine name, sorted by price, with price stats per group."""
+
+    def __init__(self, names, prices):
+        codes = names.cat.codes.to_numpy()
+        prices = prices.to_numpy(dtype=float, na_value=np.nan)
+        self.groups = {name: group for group, name in enumerate(names.cat.categories.tolist())}
+        order = np.lexsort((prices, codes))  # by name, then price (NaN last), then row
+        order = order[codes[order] >= 0]
+        self.positions = order
+        sizes = np.bincount(codes[order], minlength=len(self.groups))
+        self.starts = np.concatenate(([0], np.cumsum(sizes)))
+
+        # Groups are sorted with NaN prices last; a trailing NaN stands in for groups with no price
+        sorted_prices = np.append(prices[order], np.nan)
+        priced = np.bincount(codes[order], weights=~np.isnan(prices[order]), minlength=len(self.groups)).astype(np.int64)
+        first = np.where(priced > 0, self.starts[:-1], len(order))
+        mid = np.maximum(priced - 1, 0)
+        self.count = sizes
+        self.min = sorted_prices[first]
+        self.max = sorted_prices[first + mid]
+        self.median = (sorted_prices[first + mid // 2] + sorted_prices[first + priced // 2]) / 2
+
+    def lookup(self, name):
+        """Row positions of name, cheapest first"""
+        group = self.groups.get(name)
+        if group is None:
+            return self.positions[:0]
+        return self.positions[self.starts[group]:self.starts[group + 1]]
+
+    def stats(self, name):
+        """Count and min/max/median price of name, or None if unknown"""
+        group = self.groups.get(name)
+        if group is None:
+            return None
+        return {"count": int(self.count[group]), "min": float(self.min[group]),
+                "max": float(self.max[group]), "median": float(self.median[group])}
+
+
+FUZZY_FIELDS = ["medicine_name", "brand", "composition"]
+FUZZY_MAX_DISTANCE = 2
+FUZZY_PREFIX_LENGTH = 7
+_WORD = re.compile(r"[a-z]{3,}")
+
+
+def _edit_distance(a, b, limit):
+    """Optimal string alignment distance between a and b, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Only the part between the common prefix and suffix can differ
+    shortest, start, tail = min(len(a), len(b)), 0, 0
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    while tail < shortest - start and a[-1 - tail] == b[-1 - tail]:
+        tail += 1
+    a, b = a[start:len(a) - tail], b[start:len(b) - tail]
+    if not a or not b:
+        return min(max(len(a), len(b)), limit + 1)
+
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = ca != cb
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _letter_mask(word):
+    """Bit set of the letters in word"""
+    mask = 0
+    for char in word:
+        mask |= 1 << (ord(char) - 97)
+    return mask
+
+
+class TypoIndex:
+    """SymSpell-style deletion dictionary over the words of the fuzzy fields.
+
+    Every word is stored under each variant of its prefix with up to max_distance
+    characters deleted, so a lookup only generates the deletes of the query word and
+    verifies the few words that share one; the closest, most frequent word wins.
+    Words from any normalized column (e.g. indications) are known and never corrected.
+    """
+
+    def __init__(self, normalized, fields=FUZZY_FIELDS, max_distance=FUZZY_MAX_DISTANCE,
+                 prefix_length=FUZZY_PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.counts = defaultdict(int)
+        for field in fields:
+            codes = normalized[field].cat.codes.to_numpy()
+            values = normalized[field].cat.categories.tolist()
+            for value, count in zip(values, np.bincount(codes[codes >= 0], minlength=len(values)).tolist()):
+                for word in _WORD.findall(value):
+                    self.counts[word] += count
+        self.known = set(self.counts)
+        for field in normalized.columns:
+            for value in normalized[field].cat.categories.tolist():
+                self.known.update(_WORD.findall(value))
+        self.masks = {word: _letter_mask(word) for word in self.counts}
+        self.deletes = defaultdict(list)
+        for word in self.counts:
+            for level in self._variants(word):
+                for variant in level:
+                    self.deletes[variant].append(word)
+
+    def _variants(self, word):
+        """The word's prefix with 0, 1, ... max_distance characters deleted, one set per count"""
+        levels = [{word[:self.prefix_length]}]
+        for _ in range(self.max_distance):
+            levels.append({v[:i] + v[i + 1:] for v in levels[-1] for i in range(len(v))})
+        return levels
+
+    def correct_word(self, word):
+        """Closest known word to word, or word itself if it is known or nothing is close"""
+        if word in self.known:
+            return word
+        limit = 1 if len(word) <= 5 else self.max_distance
+        mask = _letter_mask(word)
+        best, best_key = word, (limit + 1, 0)
+        seen = set()
+        for deleted, level in enumerate(self._variants(word)[:limit + 1]):
+            if deleted > best_key[0]:
+                break  # a word within distance d shares a variant with at most d deletions
+            for variant in level:
+                for candidate in self.deletes.get(variant, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    bound = min(limit, best_key[0])
+                    # Letters only one side has each need at least one edit
+                    if (abs(len(candidate) - len(word)) > bound
+                            or bin(mask & ~self.masks[candidate]).count("1") > bound
+                            or bin(self.masks[candidate] & ~mask).count("1") > bound):
+                        continue
+                    distance = _edit_distance(word, candidate, bound)
+                    key = (distance, -self.counts[candidate])
+                    if distance <= bound and key < best_key:
+                        best, best_key = candidate, key
+        return best
+
+    def correct(self, query):
+        """query with each word replaced by its correction"""
+        return _WORD.sub(lambda match: self.correct_word(match.group()), query)
+
+
+# Intents in priority order: keywords that start the intent, the connector after them, and the entity
+INTENTS = [
+    ("composition", ["composition", "contain", "ingredient"], r"[s\s]*(?:of|in|for)?\s*", r"[a-zA-Z\s]+"),
+    ("brand", ["brand", "company", "manufacturer"], r"[s\s]*(?:of|from|by)?\s*", r"[a-zA-Z\s]+"),
+    ("indication", ["treat", "cure", "for", "indication"], r"[s\s]*(?:of|like|such as)?\s*", r"[a-zA-Z\s,]+"),
+    ("price", ["price", "cost", "cheap", "expensive", "compare"], r"[s\s]*(?:of|for)?\s*", r"[a-zA-Z\s]+"),
+]
+
+
+class IntentRouter:
+    """Routes a query to (intent, entity) with a single compiled regex.
+
+    Each intent is a lookahead searching the whole query, and the alternation tries
+    them in priority order, so one match call finds the first intent that applies
+    and captures its entity; queries matching no intent fall back to ("search", query).
+    """
+
+    def __init__(self, intents=INTENTS):
+        self.pattern = re.compile("(?s)" + "|".join(
+            f"(?=.*?(?:{'|'.join(map(re.escape, words))}){connector}(?P<{name}>{entity}))"
+            for name, words, connector, entity in intents
+        ))
+
+    def route(self, query):
+        """(intent, entity) for a single query"""
+        query = query.lower()
+        match = self.pattern.match(query)
+        if match is None:
+            return "search", query
+        return match.lastgroup, match.group(match.lastgroup).strip()
+
+    def route_batch(self, queries):
+        """Route many queries at once (e.g. replaying logs); returns a query/intent/entity frame"""
+        routed = {}
+        for query in queries:
+            if query not in routed:
+                routed[query] = self.route(query)
+        return pd.DataFrame([(query,) + routed[query] for query in queries], columns=["query", "intent", "entity"])
+
+
+intent_router = IntentRouter()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from medicine_core import SEARCH_FIELDS, PriceIndex, SearchIndex, TypoIndex, normalize_columns
+
+
+@pytest.fixture
+def medicines():
+    return pd.DataFrame({
+        "medicine_name": ["Paracetamol", "Ibuprofen", "PARACETAMOL", "Pantoprazole", "Cetirizine",
+                          "Paracetamol", "Amoxicillin", "Ibuprofen", None],
+        "brand": ["Crocin", "Brufen", "Dolo", "Pan", "Alerid", "Calpol", "Novamox", "Combiflam", "Mystery"],
+        "composition": ["Paracetamol", "Ibuprofen", "Paracetamol", "Pantoprazole", "Cetirizine",
+                        "Paracetamol", "Amoxicillin", "Ibuprofen (400mg)", "Unknown"],
+        "indications": ["Fever and pain", "Pain, Inflammation", "Fever", "Acidity", "Allergy",
+                        "Fever", "Bacterial infections", "Pain", None],
+        "price": [15.5, 45.0, 30.0, 120.0, 18.5, 30.0, np.nan, 60.0, 10.0],
+    })
+
+
+def substring_scan(df, query, limit=None):
+    """The original search_medicine: str.contains over every search field"""
+    query = query.lower()
+    mask = np.zeros(len(df), dtype=bool)
+    for field in SEARCH_FIELDS:
+        mask |= df[field].str.lower().str.contains(query, na=False).to_numpy()
+    rows = np.flatnonzero(mask)
+    return rows if limit is None else rows[:limit]
+
+
+@pytest.mark.parametrize("query", ["para", "paracetamol", "pain", "fever", "in", "ib", "xyz",
+                                   "p.n", "(?:par|ibu)", "infections"])
+@pytest.mark.parametrize("limit", [None, 1, 2, 5])
+def test_search_index_matches_substring_scan(medicines, query, limit):
+    index = SearchIndex(normalize_columns(medicines))
+    expected = substring_scan(medicines, query, limit)
+    np.testing.assert_array_equal(index.search(query.lower(), limit=limit), expected)
+
+
+def test_search_index_invalid_regex_matches_literally(medicines):
+    # str.contains raises on an unbalanced pattern; the index falls back to a literal match
+    index = SearchIndex(normalize_columns(medicines))
+    np.testing.assert_array_equal(index.search("ibuprofen (400"), [7])
+
+
+def test_normalize_columns_merges_case_variants(medicines):
+    normalized = normalize_columns(medicines)
+    assert normalized["medicine_name"].cat.categories.tolist().count("paracetamol") == 1
+    assert normalized["medicine_name"].iloc[2] == "paracetamol"
+    assert pd.isna(normalized["medicine_name"].iloc[8])
+
+
+def test_price_index_stats_with_ties(medicines):
+    normalized = normalize_columns(medicines)
+    index = PriceIndex(normalized["medicine_name"], medicines["price"])
+    assert index.stats("paracetamol") == {"count": 3, "min": 15.5, "max": 30.0, "median": 30.0}
+    assert index.stats("ibuprofen") == {"count": 2, "min": 45.0, "max": 60.0, "median": 52.5}
+    prices = medicines["price"].iloc[index.lookup("paracetamol")].tolist()
+    assert prices == sorted(prices)
+
+
+def test_price_index_group_without_prices(medicines):
+    normalized = normalize_columns(medicines)
+    index = PriceIndex(normalized["medicine_name"], medicines["price"])
+    stats = index.stats("amoxicillin")
+    assert stats["count"] == 1
+    assert np.isnan(stats["min"]) and np.isnan(stats["max"]) and np.isnan(stats["median"])
+
+
+def test_price_index_unknown_name(medicines):
+    normalized = normalize_columns(medicines)
+    index = PriceIndex(normalized["medicine_name"], medicines["price"])
+    assert index.stats("aspirin") is None
+    assert len(index.lookup("aspirin")) == 0
+
+
+def test_price_index_empty_dataset():
+    names = pd.Series(pd.Categorical([]), dtype="category")
+    index = PriceIndex(names, pd.Series([], dtype=float))
+    assert index.stats("paracetamol") is None
+    assert len(index.lookup("paracetamol")) == 0
+
+
+def test_typo_correction(medicines):
+    typos = TypoIndex(normalize_columns(medicines))
+    assert typos.correct("paracetmol") == "paracetamol"
+    assert typos.correct_word("ibuprofn") == "ibuprofen"
+    assert typos.correct_word("qwertyuiop") == "qwertyuiop"
+
+
+def test_typo_correction_keeps_known_words(medicines):
+    typos = TypoIndex(normalize_columns(medicines))
+    # "pain" only appears in indications and is one edit away from the brand "pan"
+    assert typos.correct_word("pain") == "pain"
+    assert typos.correct("medicines for pain") == "medicines for pain"
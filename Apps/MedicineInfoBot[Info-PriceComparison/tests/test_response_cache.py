@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("seaborn")
+app = pytest.importorskip("Gradio_code_PartCode1")
+
+
+def test_budget_counts_utf8_bytes():
+    cache = app.ResponseCache(max_bytes=1000)
+    html = "<p>₹ 12.50 – 💊</p>"
+
+    cache.put(cache.key(1, "Price"), html, None)
+
+    assert cache.size == len(html.encode()) + len("price")
+    assert cache.size > len(html) + len("price")
+
+
+def test_eviction_keeps_size_within_budget():
+    cache = app.ResponseCache(max_bytes=100)
+    for i in range(10):
+        cache.put(cache.key(1, f"q{i}"), "₹" * 10, None)
+
+    assert cache.size <= 100
+    assert cache.size == sum(len("₹".encode()) * 10 + len(query.encode()) for _, query in cache.entries)
+    assert cache.get(cache.key(1, "q9")) == ("₹" * 10, None)
+    assert cache.get(cache.key(1, "q0")) is None
+
+
+def test_retain_drops_other_versions():
+    cache = app.ResponseCache()
+    cache.put(cache.key(1, "a"), "one", None)
+    cache.put(cache.key(2, "a"), "two", None)
+    cache.put(cache.key(3, "a"), "three", None)
+
+    cache.retain({1, 3})
+
+    assert [key[0] for key in cache.entries] == [1, 3]
+    assert cache.size == len("one") + len("three") + 2
+    cache.invalidate(3)
+    assert cache.size == len("one") + 1
+
+
+def test_missing_chart_file_is_a_miss(tmp_path):
+    cache = app.ResponseCache()
+    chart = tmp_path / "chart.png"
+    chart.write_bytes(b"png")
+    key = cache.key(1, "price of x")
+    cache.put(key, "<p>x</p>", str(chart))
+
+    assert cache.get(key) == ("<p>x</p>", str(chart))
+    chart.unlink()
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_upload_prunes_responses_of_unregistered_datasets(tmp_path):
+    live = app.datasets.default.version
+    app.response_cache.put(app.ResponseCache.key(live, "paracetamol"), "<p>live</p>", None)
+    app.response_cache.put(app.ResponseCache.key(-1, "paracetamol"), "<p>gone</p>", None)
+    path = tmp_path / "medicines.csv"
+    app.datasets.default.df.head(20).to_csv(path, index=False)
+
+    app.upload_dataset(type("Upload", (), {"name": str(path)})(), progress=None)
+
+    versions = {key[0] for key in app.response_cache.entries}
+    assert -1 not in versions
+    assert live in versions
+
+
+
+def test_upload_error_text_is_escaped(tmp_path):
+    path = tmp_path / "<img src=x onerror=alert(1)>.csv"
+
+    html, key = app.upload_dataset(type("Upload", (), {"name": str(path)})(), progress=None)
+
+    assert "Error loading dataset" in html
+    assert "<img" not in html
+    assert "&lt;img src=x onerror=alert(1)&gt;" in html
+    assert key is None
@@ -3,6 +3,30 @@ import time
 from datetime import datetime, timedelta
 import json
 import os
+import sys
+import asyncio
+import argparse
+import csv
+import re
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from contextlib import contextmanager
+
+from wellness_core import (
+    MAX_SESSIONS, SESSION_FIELDS, most_common_answer, WellnessProfile as BaseWellnessProfile,
+    SCORE_TABLE, answers_key, calculate_wellbeing_score, interpret_score,
+)
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows
+    termios = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 # ============================================================================
 # ADVANCED MENTAL HEALTH CHATBOT WITH PREMIUM FEATURES
@@ -10,28 +34,22 @@ import os
 
 TYPE_SPEED = 0.02
 LINE_DELAY = 0.8
+# Set MINDFULME_ANIMATION=0 (or pass --no-animation) to print text instantly
+ANIMATION_ENABLED = os.environ.get("MINDFULME_ANIMATION", "1") != "0"
+SKIP_ANIMATION_KEY = "s"
 
-class WellnessProfile:
-    """Store and manage user's wellness history and patterns"""
-    def __init__(self, name):
-        self.name = name
-        self.sessions = []
-        self.total_checkins = 0
+
+class WellnessProfile(BaseWellnessProfile):
+    """Store and manage user's wellness history and patterns
+
+    History and answer counters come from wellness_core.WellnessProfile.
+    """
+    def __init__(self, name, max_sessions=MAX_SESSIONS):
+        super().__init__(name, max_sessions)
         self.streak = 0
         self.favorite_suggestions = {}
         self.mood_patterns = {}
 
-    def add_session(self, data):
-        self.sessions.append({
-            "timestamp": datetime.now().isoformat(),
-            **data
-        })
-        self.total_checkins += 1
-
-    def get_mood_history(self):
-        """Return last 7 check-ins for mood tracking"""
-        return self.sessions[-7:] if self.sessions else []
-
     def identify_patterns(self):
         """Analyze patterns from user's history"""
         if len(self.sessions) < 3:
@@ -45,12 +63,10 @@ class WellnessProfile:
         }
 
         # Most common mood
-        moods = [s.get("mental_state") for s in self.sessions[-10:]]
-        patterns["most_common_mood"] = max(set(moods), key=moods.count) if moods else None
+        patterns["most_common_mood"] = most_common_answer(self.recent_answer_counts("mental_state"))
 
         # Stress patterns
-        stresses = [s.get("job_stress") for s in self.sessions[-10:]]
-        patterns["most_stressful_day"] = max(set(stresses), key=stresses.count) if stresses else None
+        patterns["most_stressful_day"] = most_common_answer(self.recent_answer_counts("job_stress"))
 
         return patterns
 
@@ -58,7 +74,7 @@ class WellnessProfile:
         return {
             "name": self.name,
             "total_checkins": self.total_checkins,
-            "sessions": self.sessions[-30:]  # Keep last 30 sessions
+            "sessions": [s.to_dict() for s in self.sessions]  # Ring buffer holds the last MAX_SESSIONS
         }
 
 
@@ -247,17 +263,12 @@ class MoodAnalytics:
         ]
 
     @staticmethod
-    def generate_weekly_summary(sessions):
-        """Generate insights from multiple sessions"""
-        if len(sessions) < 3:
+    def generate_weekly_summary(mood_counts):
+        """Generate insights from a week of {mood: count} check-in counters"""
+        if sum(mood_counts.values()) < 3:
             return "Keep checking in! Patterns emerge after a few sessions. 📊"
 
-        moods = [s.get("mental_state") for s in sessions]
-        mood_counts = {}
-        for mood in moods:
-            mood_counts[mood] = mood_counts.get(mood, 0) + 1
-
-        most_frequent = max(mood_counts, key=mood_counts.get)
+        most_frequent = most_common_answer(mood_counts)
 
         summary = f"📊 **Weekly Pattern:**\n"
         summary += f"Most frequent mood: **{most_frequent}** ({mood_counts[most_frequent]} times)\n"
@@ -270,12 +281,97 @@ class MoodAnalytics:
         return summary
 
 
+class ConsoleRenderer:
+    """Typewriter-style console output driven by an asyncio event loop.
+
+    Text streams at the configured speed. Any keypress fast-forwards the
+    current message and its pause; SKIP_ANIMATION_KEY turns animation off for
+    the rest of the session. Without a terminal (piped or scripted runs)
+    everything is printed at once.
+    """
+
+    def __init__(self, animate=None, stream=None):
+        self.stream = stream or sys.stdout
+        if animate is None:
+            animate = ANIMATION_ENABLED and sys.stdin.isatty() and self.stream.isatty()
+        self.animate = animate
+        self._loop = None
+
+    def write(self, text, delay=LINE_DELAY, type_speed=TYPE_SPEED):
+        if not self.animate:
+            self.stream.write(text + "\n")
+            self.stream.flush()
+            return
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self.type_out(text, delay, type_speed))
+
+    async def type_out(self, text, delay=LINE_DELAY, type_speed=TYPE_SPEED):
+        """Stream text one character at a time until done or a key is pressed"""
+        skip = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        with self._watch_keys(skip):
+            start = loop.time()
+            for i, char in enumerate(text):
+                if skip.is_set():
+                    self.stream.write(text[i:])
+                    break
+                self.stream.write(char)
+                self.stream.flush()
+                # Sleep until this character's slot so per-call overhead doesn't drift
+                await self._pause(start + (i + 1) * type_speed - loop.time(), skip)
+            self.stream.write("\n")
+            self.stream.flush()
+            await self._pause(delay, skip)
+
+    @staticmethod
+    async def _pause(seconds, skip):
+        if seconds <= 0 or skip.is_set():
+            return
+        try:
+            await asyncio.wait_for(skip.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _on_key(self, key, skip):
+        if key.lower() == SKIP_ANIMATION_KEY:
+            self.animate = False
+        skip.set()
+
+    @contextmanager
+    def _watch_keys(self, skip):
+        """Listen for keypresses (without echo) while a message is streaming"""
+        loop = asyncio.get_running_loop()
+        if termios is not None and sys.stdin.isatty():
+            fd = sys.stdin.fileno()
+            saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+            loop.add_reader(fd, lambda: self._on_key(os.read(fd, 32).decode(errors="ignore")[:1], skip))
+            try:
+                yield
+            finally:
+                loop.remove_reader(fd)
+                termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        elif msvcrt is not None:
+            async def poll():
+                while not skip.is_set():
+                    if msvcrt.kbhit():
+                        self._on_key(msvcrt.getwch(), skip)
+                    await asyncio.sleep(0.02)
+            task = loop.create_task(poll())
+            try:
+                yield
+            finally:
+                task.cancel()
+        else:
+            yield
+
+
+renderer = ConsoleRenderer()
+
+
 def print_with_delay(text, delay=LINE_DELAY, type_speed=TYPE_SPEED):
-    for char in text:
-        print(char, end="", flush=True)
-        time.sleep(type_speed)
-    print()
-    time.sleep(delay)
+    renderer.write(text, delay, type_speed)
 
 
 def ask_choice(question, options):
@@ -288,59 +384,9 @@ def ask_choice(question, options):
         print_with_delay("❌ I didn't catch that. Please choose one of the options. 💛")
 
 
-def calculate_wellbeing_score(job_stress, relationship, activity, finances, social, mental):
-    score = 50
-
-    if job_stress == "Low":
-        score += 10
-    elif job_stress == "High":
-        score -= 10
-
-    if relationship in ["In a relationship", "Married"]:
-        score += 5
-
-    if activity == "High":
-        score += 10
-    elif activity == "Moderate":
-        score += 5
-    elif activity == "None":
-        score -= 10
-
-    if finances == "Stable":
-        score += 8
-    elif finances == "In debt":
-        score -= 10
-    elif finances == "Struggling":
-        score -= 5
-
-    if social == "High":
-        score += 8
-    elif social == "Low":
-        score -= 5
-
-    if mental in ["Happy", "Excited", "Relaxed"]:
-        score += 10
-    elif mental in ["Sad", "Anxious", "Overthinking", "Stressed"]:
-        score -= 10
-
-    return max(0, min(100, score))
-
-
-def interpret_score(score):
-    if score >= 80:
-        emoji, status = "🌈", "Thriving"
-        msg = "Your emotional wellness is strong! Keep nurturing what works."
-    elif score >= 60:
-        emoji, status = "💛", "Balanced"
-        msg = "You're doing okay. Small consistent steps matter."
-    elif score >= 40:
-        emoji, status = "🤍", "Struggling"
-        msg = "You deserve extra care right now. You're not alone."
-    else:
-        emoji, status = "💙", "Crisis"
-        msg = "Please reach out. Crisis support is available 24/7."
-
-    return emoji, status, msg
+def score_sessions(sessions):
+    """Wellbeing scores for an iterable of session dicts (history or import rows)"""
+    return [SCORE_TABLE[answers_key(s)] for s in sessions]
 
 
 def display_main_menu():
@@ -484,6 +530,8 @@ def view_wellness_history(profile):
 
     print_with_delay("\n📊 YOUR WELLNESS HISTORY 📊")
     print_with_delay(f"Total check-ins: {profile.total_checkins}")
+    scores = score_sessions(profile.sessions)
+    print_with_delay(f"Average score (last {len(scores)}): {sum(scores) / len(scores):.0f}/100")
 
     history = profile.get_mood_history()
     print("\nLast check-ins:")
@@ -496,8 +544,9 @@ def view_wellness_history(profile):
     if patterns and patterns["most_common_mood"]:
         print_with_delay(f"\n🧠 Your Pattern: You're often feeling **{patterns['most_common_mood']}**")
 
-    if len(history) >= 3:
-        summary = MoodAnalytics.generate_weekly_summary(history)
+    weekly_moods = profile.weekly_answer_counts("mental_state")
+    if sum(weekly_moods.values()) >= 3:
+        summary = MoodAnalytics.generate_weekly_summary(weekly_moods)
         print_with_delay(f"\n{summary}")
 
 
@@ -526,9 +575,171 @@ def show_resources():
     print_with_delay("\n🤍 Please reach out. You're not alone. 🤍")
 
 
+# ============================================================================
+# BATCH MODE
+# ============================================================================
+
+BATCH_CHUNK_ROWS = 10_000
+BATCH_INPUT_FIELDS = ["name", "timestamp"] + SESSION_FIELDS
+BATCH_OUTPUT_FIELDS = ["row", "name", "timestamp", "score", "status", "insights", "affirmation"]
+# Interpretation of every possible score
+SCORE_STATUS = [interpret_score(score)[1] for score in range(101)]
+
+
+BATCH_FORMATS = ("auto", "csv", "ndjson")
+
+
+def sniff_format(lines):
+    """Guess the input format from its first non-blank line; returns (format, lines rewound)"""
+    peeked = []
+    for line in lines:
+        peeked.append(line)
+        if line.strip():
+            break
+    fmt = "ndjson" if peeked and peeked[-1].lstrip().startswith("{") else "csv"
+    return fmt, chain(peeked, lines)
+
+
+def read_ndjson(lines):
+    """Yield records from NDJSON lines; malformed lines (bad JSON, not an object, list or
+    object values) are reported on stderr and skipped"""
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            print(f"Skipping line {lineno}: invalid JSON ({e})", file=sys.stderr)
+            continue
+        if not isinstance(record, dict):
+            print(f"Skipping line {lineno}: expected a JSON object", file=sys.stderr)
+            continue
+        values = tuple(record.get(f, "") for f in BATCH_INPUT_FIELDS)
+        nested = [f for f, v in zip(BATCH_INPUT_FIELDS, values) if isinstance(v, (list, dict))]
+        if nested:
+            print(f"Skipping line {lineno}: expected plain values for {', '.join(nested)}", file=sys.stderr)
+            continue
+        yield values
+
+
+def read_csv(lines):
+    """Yield records from CSV lines with a header row"""
+    reader = csv.reader(lines)
+    header = next(reader, [])
+    width = len(header)
+    # Missing columns (and short rows) read from padding cells past the header width
+    columns = {name: i for i, name in enumerate(header)}
+    pick = itemgetter(*[columns.get(f, width) for f in BATCH_INPUT_FIELDS])
+    padding = [""] * (width + 1)
+    for row in reader:
+        if len(row) <= width:
+            row = row + padding[len(row):]
+        yield pick(row)
+
+
+def read_checkins(path, fmt="auto"):
+    """Yield (name, timestamp, *answers) tuples from a CSV (with header) or NDJSON file; '-' reads stdin
+    
+    With fmt="auto" the format comes from the file extension, or from the
+    first non-blank line when there is none to go by (stdin).
+    """
+    # utf-8-sig drops a byte order mark (Excel CSV exports) before the first header
+    fh = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")
+    try:
+        lines = iter(fh)
+        if fmt == "auto":
+            if path.endswith((".ndjson", ".jsonl")):
+                fmt = "ndjson"
+            elif path.endswith(".csv"):
+                fmt = "csv"
+            else:
+                fmt, lines = sniff_format(lines)
+        yield from (read_ndjson(lines) if fmt == "ndjson" else read_csv(lines))
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def process_checkins(records, seed=None):
+    """Score, analyze and pick an affirmation for each record, yielding BATCH_OUTPUT_FIELDS tuples"""
+    rng = random.Random(seed)
+    combos = {}
+    affirmations = AffirmationLibrary.affirmations
+    for row, record in enumerate(records, 1):
+        answers = record[2:]
+        combo = combos.get(answers)
+        if combo is None:
+            # Results only depend on the answers, so each combination is worked out once
+            session = dict(zip(SESSION_FIELDS, answers))
+            score = SCORE_TABLE[answers_key(session)]
+            combo = combos[answers] = (
+                score,
+                SCORE_STATUS[score],
+                " | ".join(MoodAnalytics.analyze_session(session)),
+                affirmations.get(session["mental_state"]) or affirmations["Stressed"],
+            )
+        score, status, insights, pool = combo
+        yield row, record[0], record[1], score, status, insights, pool[int(rng.random() * len(pool))]
+
+
+_CSV_SPECIAL = re.compile(r'[,"\r\n]')
+
+
+def csv_field(value):
+    """Encode one value the way csv.writer does with QUOTE_MINIMAL"""
+    value = str(value)
+    if _CSV_SPECIAL.search(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_results(results, path):
+    """Stream results to CSV or NDJSON (by extension; '-' writes NDJSON to stdout) in chunks"""
+    fh = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+    if path.endswith(".csv"):
+        encode = csv_field
+        line = ",".join(["%s"] * len(BATCH_OUTPUT_FIELDS)) + "\r\n"
+        fh.write(",".join(BATCH_OUTPUT_FIELDS) + "\r\n")
+    else:
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        line = "{" + ", ".join(f'"{f}": %s' for f in BATCH_OUTPUT_FIELDS) + "}\n"
+    # status, insights and affirmation repeat across rows, so they are encoded once each
+    encode_cached = lru_cache(maxsize=4096)(encode)
+    count = 0
+    chunk = []
+    try:
+        for row, name, timestamp, score, status, insights, affirmation in results:
+            chunk.append(line % (row, encode(name), encode(timestamp), score, encode_cached(status),
+                                 encode_cached(insights), encode_cached(affirmation)))
+            if len(chunk) >= BATCH_CHUNK_ROWS:
+                fh.write("".join(chunk))
+                count += len(chunk)
+                chunk = []
+        fh.write("".join(chunk))
+        count += len(chunk)
+    finally:
+        if fh is sys.stdout:
+            fh.flush()
+        else:
+            fh.close()
+    return count
+
+
+def run_batch(input_path, output_path="-", seed=None, input_format="auto"):
+    """Headless check-in pipeline: input file -> scored results, no prompts or animation"""
+    start = time.perf_counter()
+    count = write_results(process_checkins(read_checkins(input_path, input_format), seed), output_path)
+    elapsed = time.perf_counter() - start
+    print(f"Processed {count:,} check-ins in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:,.0f}/s)", file=sys.stderr)
+    return count
+
+
 def main():
     """Main chatbot loop"""
     print_with_delay("🌸 Welcome to MindfulMe - Your Personal Wellness Companion 🌸")
+    if renderer.animate:
+        print(f"(Press any key to fast-forward, '{SKIP_ANIMATION_KEY}' to turn animation off)")
     
     name = input("\n👋 What's your name? ").strip().title() or "Friend"
     profile = WellnessProfile(name)
@@ -563,4 +774,17 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="MindfulMe console wellness companion")
+    parser.add_argument("--no-animation", action="store_true", help="print text instantly (scripted runs)")
+    parser.add_argument("--batch", metavar="INPUT", help="score check-ins from a CSV or NDJSON file ('-' for stdin)")
+    parser.add_argument("--format", choices=BATCH_FORMATS, default="auto",
+                        help="batch input format (default: by extension, else sniffed from the first line)")
+    parser.add_argument("--output", default="-", help="batch results file, .csv or .ndjson (default: NDJSON to stdout)")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible affirmation picks")
+    args = parser.parse_args()
+    if args.batch:
+        run_batch(args.batch, args.output, args.seed, args.format)
+    else:
+        if args.no_animation:
+            renderer.animate = False
+        main()
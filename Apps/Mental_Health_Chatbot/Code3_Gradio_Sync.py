@@ -4,39 +4,319 @@ import plotly.express as px
 from datetime import datetime, timedelta
 import random
 import json
+import os
+import time
+from array import array
+import sqlite3
+import threading
+import atexit
+import asyncio
+import argparse
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 
+from wellness_core import (
+    MAX_SESSIONS, SESSION_OPTIONS, SESSION_FIELDS, ANSWER_CODES, WEEK_DAYS,
+    _RADICES, _DIVISORS, _FIELD_INDEX, _COUNT_OFFSETS, _N_COUNTS, WellnessProfile,
+    SCORE_TABLE as _SCORES, answers_key, calculate_wellbeing_score, life_area_values, interpret_score,
+    most_common_answer,
+)
+
 # ============================================================================
 # DATA CLASSES AND LIBRARIES
 # ============================================================================
 
-class WellnessProfile:
-    """Store and manage user's wellness history"""
-    def __init__(self, name="User"):
-        self.name = name
-        self.sessions = []
-        self.total_checkins = 0
-    
-    def add_session(self, data):
-        self.sessions.append({
-            "timestamp": datetime.now().isoformat(),
-            **data
-        })
-        self.total_checkins += 1
-    
-    def get_mood_history(self):
-        return self.sessions[-7:] if self.sessions else []
-    
-    def identify_patterns(self):
-        if len(self.sessions) < 3:
-            return None
-        moods = [s.get("mental_state") for s in self.sessions[-10:]]
-        return {
-            "most_common_mood": max(set(moods), key=moods.count) if moods else None
-        }
+def unpack_codes_array(packed):
+    """Vectorized unpack_codes: packed int array -> {field: code array}"""
+    packed = np.asarray(packed, dtype=np.int64)
+    return {f: (packed // _DIVISORS[i]) % _RADICES[i] for i, f in enumerate(SESSION_FIELDS)}
+
+def pack_answers_frame(df):
+    """Vectorized encode + pack over a DataFrame of answer columns (missing columns = unanswered)"""
+    packed = np.zeros(len(df), dtype=np.int64)
+    for field, radix in zip(SESSION_FIELDS, _RADICES):
+        if field in df:
+            # Unrecognised answers count as unanswered, like answers_key
+            column = df[field].where(df[field].isin(SESSION_OPTIONS[field]))
+            codes = pd.Categorical(column, categories=SESSION_OPTIONS[field]).codes + 1
+        else:
+            codes = 0
+        packed = packed * radix + codes
+    return packed
+
+# ============================================================================
+# PROFILE STORE
+# ============================================================================
+
+PROFILE_DB_PATH = os.environ.get("MINDFULME_DB", "mindfulme_profiles.db")
+PROFILE_CACHE_SIZE = int(os.environ.get("MINDFULME_PROFILE_CACHE", "10000"))
+PROFILE_LOCK_STRIPES = 256
+COMMIT_RETRIES = 3
+COMMIT_RETRY_DELAY = 0.05
+
+def profile_key(name):
+    """Normalize a free-text name into a stable profile key"""
+    return " ".join(name.split()).casefold()
 
-# Global profile storage
-user_profiles = {}
+class ProfileStore:
+    """SQLite (WAL) backed profile store with an LRU write-through cache and per-user locks.
+    
+    Check-ins are appended to the cached profile under the user's lock and queued
+    for a writer thread that commits everything pending in one transaction
+    (group commit). Each batch has a Future that resolves once it is durable, so
+    sync callers can block on it and async callers can await it. A batch that
+    still fails after retries fails its Future, and its profiles are dropped from
+    the cache so they reload what was actually stored. The database is created
+    on the first check-in.
+    
+    Users share a fixed set of striped locks, so locks never need evicting.
+    """
+    def __init__(self, db_path=PROFILE_DB_PATH, cache_size=PROFILE_CACHE_SIZE):
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self.conn = None
+        self._read_conn = None
+        self._read_lock = threading.Lock()
+        self._open_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._unflushed = {}  # key -> queued check-ins not committed yet (never evicted)
+        self._locks = [threading.Lock() for _ in range(PROFILE_LOCK_STRIPES)]
+        self._guard = threading.Lock()
+        self._pending = []
+        self._pending_cond = threading.Condition()
+        self._batch_done = Future()
+        self._closed = False
+        self._writer = None
+    
+    def _open(self):
+        """Connect, create the schema and start the writer (once)"""
+        if self._writer is not None:
+            return
+        with self._open_lock:
+            if self._writer is not None:
+                return
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS profiles (
+                    user_key TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    total_checkins INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_key TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    job_stress TEXT, relationship TEXT, physical_activity TEXT,
+                    financial_status TEXT, social_interaction TEXT, mental_state TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_key, id);
+            """)
+            self.conn = conn
+            self._read_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            writer = threading.Thread(target=self._write_loop, name="profile-writer", daemon=True)
+            writer.start()
+            self._writer = writer
+            atexit.register(self.close)
+    
+    def lock_for(self, name):
+        return self._locks[hash(profile_key(name)) % len(self._locks)]
+    
+    def _cached(self, key):
+        with self._guard:
+            profile = self._cache.get(key)
+            if profile is not None:
+                self._cache.move_to_end(key)
+            return profile
+    
+    def _remember(self, key, profile):
+        """Cache profile, evicting the least recently used profiles with nothing left to persist"""
+        with self._guard:
+            self._cache[key] = profile
+            self._cache.move_to_end(key)
+            excess = len(self._cache) - self.cache_size
+            if excess > 0:
+                victims = []
+                for old in self._cache:
+                    if len(victims) == excess:
+                        break
+                    if old not in self._unflushed:
+                        victims.append(old)
+                for old in victims:
+                    del self._cache[old]
+    
+    def _load(self, key):
+        if self._writer is None:
+            if not os.path.exists(self.db_path):
+                return None
+            self._open()
+        cols = ", ".join(["timestamp"] + SESSION_FIELDS)
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT name, total_checkins FROM profiles WHERE user_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            recent = self._read_conn.execute(
+                f"SELECT {cols} FROM sessions WHERE user_key = ? ORDER BY id DESC LIMIT ?",
+                (key, MAX_SESSIONS)
+            ).fetchall()
+            counts = {
+                field: self._read_conn.execute(
+                    f"SELECT {field}, COUNT(*) FROM sessions WHERE user_key = ? GROUP BY {field}", (key,)
+                ).fetchall()
+                for field in SESSION_FIELDS
+            }
+            # Timestamps are local ISO strings, so the date prefix is the day bucket
+            week_start = (datetime.now() - timedelta(days=WEEK_DAYS - 1)).date().isoformat()
+            fields = ", ".join(SESSION_FIELDS)
+            week = self._read_conn.execute(
+                f"SELECT substr(timestamp, 1, 10) AS day, {fields}, COUNT(*) FROM sessions "
+                f"WHERE user_key = ? AND timestamp >= ? GROUP BY day, {fields}",
+                (key, week_start)
+            ).fetchall()
+        profile = WellnessProfile(row[0])
+        # Replaying the newest sessions fills the ring buffer and the recent-window
+        # counters; lifetime and weekly counters are rebuilt from aggregates below
+        for values in reversed(recent):
+            data = dict(zip(["timestamp"] + SESSION_FIELDS, values))
+            ts = datetime.fromisoformat(data["timestamp"]).timestamp()
+            profile.add_session(data, ts=ts)
+        profile.lifetime_counts = array("I", [0] * _N_COUNTS)
+        for field, rows in counts.items():
+            for value, n in rows:
+                offset = _COUNT_OFFSETS[_FIELD_INDEX[field]]
+                profile.lifetime_counts[offset + ANSWER_CODES[field].get(value, 0)] += n
+        profile.day_counts = array("I", [0] * (_N_COUNTS * WEEK_DAYS))
+        profile.day_ids = array("l", [-1] * WEEK_DAYS)
+        for day, *values, n in week:
+            ordinal = datetime.fromisoformat(day).toordinal()
+            base = (ordinal % WEEK_DAYS) * _N_COUNTS
+            profile.day_ids[ordinal % WEEK_DAYS] = ordinal
+            for field, value in zip(SESSION_FIELDS, values):
+                profile.day_counts[base + _COUNT_OFFSETS[_FIELD_INDEX[field]] + ANSWER_CODES[field].get(value, 0)] += n
+        profile.total_checkins = row[1]
+        return profile
+    
+    def get(self, name):
+        """Cached profile for name, loading it from the database on a miss"""
+        key = profile_key(name)
+        profile = self._cached(key)
+        if profile is None:
+            with self.lock_for(name):
+                profile = self._cached(key)
+                if profile is None:
+                    profile = self._load(key)
+                    if profile is not None:
+                        self._remember(key, profile)
+        return profile
+    
+    def enqueue_session(self, name, data):
+        """Append a check-in to name's profile; returns (profile, Future done when persisted)"""
+        key = profile_key(name)
+        self._open()
+        with self.lock_for(name):
+            profile = self._cached(key) or self._load(key)
+            if profile is None:
+                profile = WellnessProfile(name.strip())
+            with self._guard:
+                self._unflushed[key] = self._unflushed.get(key, 0) + 1
+            self._remember(key, profile)
+            profile.add_session(data)
+            session = profile.sessions[-1]
+            with self._pending_cond:
+                done = self._batch_done
+                self._pending.append((key, profile.name, session))
+                self._pending_cond.notify()
+        return profile, done
+    
+    def add_session(self, name, data, wait=True):
+        """Append a check-in to name's profile and persist it in the next batch"""
+        profile, done = self.enqueue_session(name, data)
+        if wait:
+            done.result()
+        return profile
+    
+    def _write_loop(self):
+        while True:
+            with self._pending_cond:
+                while not self._pending and not self._closed:
+                    self._pending_cond.wait()
+                if not self._pending and self._closed:
+                    return
+                batch, self._pending = self._pending, []
+                done, self._batch_done = self._batch_done, Future()
+            # Any error fails this batch only; the writer keeps serving later batches
+            try:
+                self._commit_with_retry(batch)
+            except Exception as e:
+                print(f"⚠️ Failed to persist {len(batch)} check-ins: {e}")
+                self._settle(batch, failed=True)
+                done.set_exception(e)
+            else:
+                self._settle(batch, failed=False)
+                done.set_result(len(batch))
+    
+    def _commit_with_retry(self, batch):
+        """Commit a batch, retrying transient errors (e.g. a locked database) with backoff"""
+        for attempt in range(COMMIT_RETRIES):
+            try:
+                return self._commit(batch)
+            except sqlite3.OperationalError:
+                if attempt == COMMIT_RETRIES - 1:
+                    raise
+                time.sleep(COMMIT_RETRY_DELAY * 2 ** attempt)
+    
+    def _settle(self, batch, failed):
+        """Mark a batch's check-ins as no longer pending; failed profiles reload from disk"""
+        with self._guard:
+            for key, _, _ in batch:
+                left = self._unflushed.pop(key, 1) - 1
+                if left:
+                    self._unflushed[key] = left
+                if failed:
+                    self._cache.pop(key, None)
+    
+    def _commit(self, batch):
+        cols = ", ".join(["user_key", "timestamp"] + SESSION_FIELDS)
+        marks = ", ".join(["?"] * (len(SESSION_FIELDS) + 2))
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(
+                "INSERT INTO profiles (user_key, name, total_checkins) VALUES (?, ?, 1) "
+                "ON CONFLICT(user_key) DO UPDATE SET total_checkins = total_checkins + 1",
+                [(key, name) for key, name, _ in batch]
+            )
+            self.conn.executemany(
+                f"INSERT INTO sessions ({cols}) VALUES ({marks})",
+                [(key, s["timestamp"], *[s.get(f) for f in SESSION_FIELDS]) for key, _, s in batch]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            raise
+    
+    def close(self):
+        """Flush pending check-ins and stop the writer"""
+        with self._pending_cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending_cond.notify()
+        with self._open_lock:
+            if self._writer is None:
+                return
+        self._writer.join()
+        self.conn.close()
+        self._read_conn.close()
+
+profile_store = ProfileStore()
 
 class AffirmationLibrary:
     """Curated affirmations for different emotional states"""
@@ -181,72 +461,240 @@ class GuidedExercises:
 # CALCULATION FUNCTIONS
 # ============================================================================
 
-def calculate_wellbeing_score(job_stress, relationship, activity, finances, social, mental):
-    score = 50
-    
-    if job_stress == "Low": score += 10
-    elif job_stress == "High": score -= 10
-    
-    if relationship in ["In a relationship", "Married"]: score += 5
-    
-    if activity == "High": score += 10
-    elif activity == "Moderate": score += 5
-    elif activity == "None": score -= 10
-    
-    if finances == "Stable": score += 8
-    elif finances == "In debt": score -= 10
-    elif finances == "Struggling": score -= 5
-    
-    if social == "High": score += 8
-    elif social == "Low": score -= 5
-    
-    if mental in ["Happy", "Excited", "Relaxed"]: score += 10
-    elif mental in ["Sad", "Anxious", "Overthinking", "Stressed"]: score -= 10
-    
-    return max(0, min(100, score))
+def _answered(codes, field, *answers):
+    return np.isin(codes[field], [ANSWER_CODES[field][a] for a in answers])
 
-def interpret_score(score):
-    if score >= 80:
-        return "🌈", "Thriving", "Your emotional wellness is strong! Keep nurturing what works."
-    elif score >= 60:
-        return "💛", "Balanced", "You're doing okay. Small consistent steps matter."
-    elif score >= 40:
-        return "🤍", "Struggling", "You deserve extra care right now. You're not alone."
-    else:
-        return "💙", "Crisis", "Please reach out. Crisis support is available 24/7."
+INSIGHT_RULES = [
+    ("📌 High stress + no physical activity is tough. Even a 5-min walk could help! 🚶",
+     lambda c: _answered(c, "job_stress", "High") & _answered(c, "physical_activity", "None")),
+    ("📌 Connection is medicine—even a text to a friend can help. 🤝",
+     lambda c: _answered(c, "social_interaction", "Low") & _answered(c, "mental_state", "Sad", "Anxious")),
+    ("📌 Movement = mood boost! Notice how activity lifts your spirit. 💪",
+     lambda c: _answered(c, "physical_activity", "Moderate", "High") & _answered(c, "mental_state", "Excited", "Happy")),
+    ("📌 Financial stress is valid. Consider one small action today. 💡",
+     lambda c: _answered(c, "financial_status", "In debt") & _answered(c, "mental_state", "Stressed")),
+]
+DEFAULT_INSIGHT = "📌 You're doing well navigating your wellness. Keep going! 🌟"
+
+SCORE_TABLE = np.asarray(_SCORES, dtype=np.int8)
+
+def _build_insight_table():
+    """Insight bitmask for every packed answer combination"""
+    codes = unpack_codes_array(np.arange(len(SCORE_TABLE)))
+    insight_bits = np.zeros(len(SCORE_TABLE), dtype=np.uint8)
+    for bit, (_, rule) in enumerate(INSIGHT_RULES):
+        insight_bits |= rule(codes).astype(np.uint8) << bit
+    return insight_bits
+
+INSIGHT_TABLE = _build_insight_table()
+# Insight messages for each bitmask in INSIGHT_TABLE
+INSIGHT_SETS = [
+    [msg for bit, (msg, _) in enumerate(INSIGHT_RULES) if mask >> bit & 1] or [DEFAULT_INSIGHT]
+    for mask in range(1 << len(INSIGHT_RULES))
+]
+_INSIGHTS = [INSIGHT_SETS[bits] for bits in INSIGHT_TABLE.tolist()]
+
+def score_history(history):
+    """Wellbeing scores of every session in a SessionHistory, oldest first"""
+    codes = np.frombuffer(history.codes, dtype=np.uint16)
+    return SCORE_TABLE[np.roll(codes, -history.start)]
 
 def analyze_session(data):
     """Generate personalized insights"""
-    insights = []
-    
-    stress = data.get("job_stress", "")
-    activity = data.get("physical_activity", "")
-    social = data.get("social_interaction", "")
-    mood = data.get("mental_state", "")
-    
-    if stress == "High" and activity == "None":
-        insights.append("📌 High stress + no physical activity is tough. Even a 5-min walk could help! 🚶")
-    
-    if social == "Low" and mood in ["Sad", "Anxious"]:
-        insights.append("📌 Connection is medicine—even a text to a friend can help. 🤝")
-    
-    if activity in ["Moderate", "High"] and mood in ["Excited", "Happy"]:
-        insights.append("📌 Movement = mood boost! Notice how activity lifts your spirit. 💪")
-    
-    if data.get("financial_status") == "In debt" and mood == "Stressed":
-        insights.append("📌 Financial stress is valid. Consider one small action today. 💡")
+    return list(_INSIGHTS[answers_key(data)])
+
+# ============================================================================
+# COHORT ANALYTICS
+# ============================================================================
+
+MOOD_SCORES = {
+    "Happy": 90, "Excited": 85, "Relaxed": 80,
+    "Stressed": 40, "Anxious": 35, "Sad": 30, "Overthinking": 45
+}
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+def weighted_corr(x, y, w):
+    w = w / w.sum()
+    mx, my = (w * x).sum(), (w * y).sum()
+    cov = (w * (x - mx) * (y - my)).sum()
+    var = np.sqrt((w * (x - mx) ** 2).sum() * (w * (y - my) ** 2).sum())
+    return float(cov / var) if var > 0 else 0.0
+
+class CohortAnalytics:
+    """Columnar analytics over every stored check-in.
+    
+    Sessions are read incrementally from the profile database in chunks and
+    folded into a daily rollup cube: one row per (day, packed answers) with a
+    count. The answer space is tiny, so millions of check-ins collapse into a
+    few thousand rows and every query is a vectorized group-by on the cube.
+    """
+    def __init__(self, db_path=PROFILE_DB_PATH, chunk_rows=250_000):
+        self.db_path = db_path
+        self.chunk_rows = chunk_rows
+        self.last_id = 0
+        self.rollup = pd.DataFrame({"day": pd.Series(dtype="int32"),
+                                    "packed": pd.Series(dtype="int32"),
+                                    "count": pd.Series(dtype="int64")})
+        self._lock = threading.Lock()
+    
+    def refresh(self):
+        """Fold check-ins committed since the last refresh into the rollup cube"""
+        with self._lock:
+            if not os.path.exists(self.db_path):
+                return self.last_id  # nobody has checked in yet
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cols = ", ".join(["id", "timestamp"] + SESSION_FIELDS)
+                chunks = pd.read_sql_query(
+                    f"SELECT {cols} FROM sessions WHERE id > ? ORDER BY id",
+                    conn, params=(self.last_id,), chunksize=self.chunk_rows
+                )
+                parts = [self.rollup]
+                for chunk in chunks:
+                    if chunk.empty:
+                        continue
+                    parts.append(self._rollup_chunk(chunk))
+                    self.last_id = int(chunk["id"].iloc[-1])
+            finally:
+                conn.close()
+            if len(parts) > 1:
+                self.rollup = (pd.concat(parts, ignore_index=True)
+                               .groupby(["day", "packed"], as_index=False)["count"].sum())
+            return self.last_id
     
-    return insights if insights else ["📌 You're doing well navigating your wellness. Keep going! 🌟"]
+    @staticmethod
+    def _rollup_chunk(chunk):
+        packed = pack_answers_frame(chunk)
+        days = pd.to_datetime(chunk["timestamp"], format="ISO8601").to_numpy().astype("datetime64[D]").astype(np.int64)
+        cube = pd.DataFrame({"day": days, "packed": packed})
+        return cube.groupby(["day", "packed"]).size().rename("count").reset_index()
+    
+    def _cube(self, since_days=None, now=None):
+        """Rollup rows (and their answer codes) from the last since_days days up to today"""
+        cube = self.rollup
+        if since_days is not None:
+            today = np.datetime64(datetime.fromtimestamp(time.time() if now is None else now).date(), "D")
+            cube = cube[cube["day"] > today.astype(np.int64) - since_days]
+        codes = unpack_codes_array(cube["packed"].to_numpy())
+        return cube, codes
+    
+    def total_checkins(self):
+        return int(self.rollup["count"].sum())
+    
+    def score_distribution(self, since_days=None, bin_width=10, now=None):
+        """Check-in counts per wellbeing-score bucket, plus mean and percentiles"""
+        cube, _ = self._cube(since_days, now)
+        scores = SCORE_TABLE[cube["packed"].to_numpy()].astype(np.int64)
+        counts = cube["count"].to_numpy()
+        buckets = pd.Series(counts).groupby((scores // bin_width) * bin_width).sum()
+        buckets = buckets.reindex(range(0, 101, bin_width), fill_value=0)
+        stats = {}
+        if counts.sum():
+            order = np.argsort(scores)
+            cum = np.cumsum(counts[order]) / counts.sum()
+            stats = {"mean": float((scores * counts).sum() / counts.sum())}
+            for p in (25, 50, 75, 90):
+                stats[f"p{p}"] = float(scores[order][np.searchsorted(cum, p / 100)])
+        return buckets, stats
+    
+    def stress_by_weekday(self, since_days=None, now=None):
+        """Share of each job-stress level per day of week (rows sum to 1)"""
+        cube, codes = self._cube(since_days, now)
+        weekday = (cube["day"].to_numpy() + 3) % 7
+        stress = np.asarray(["N/A"] + SESSION_OPTIONS["job_stress"])[codes["job_stress"]]
+        table = pd.crosstab(weekday, stress, values=cube["count"].to_numpy(), aggfunc="sum").fillna(0)
+        table = table.reindex(index=range(7), columns=SESSION_OPTIONS["job_stress"], fill_value=0)
+        table.index = WEEKDAYS
+        return table.div(table.sum(axis=1).replace(0, 1), axis=0)
+    
+    def mood_by_factor(self, factor, since_days=None, now=None):
+        """Mood share per answer of factor, and the weighted correlation with mood score"""
+        cube, codes = self._cube(since_days, now)
+        counts = cube["count"].to_numpy().astype(float)
+        answered = (codes[factor] > 0) & (codes["mental_state"] > 0)
+        factor_labels = np.asarray([""] + SESSION_OPTIONS[factor])[codes[factor]]
+        moods = np.asarray([""] + SESSION_OPTIONS["mental_state"])[codes["mental_state"]]
+        table = pd.crosstab(factor_labels[answered], moods[answered],
+                            values=counts[answered], aggfunc="sum").fillna(0)
+        table = table.reindex(index=SESSION_OPTIONS[factor], columns=SESSION_OPTIONS["mental_state"], fill_value=0)
+        table = table.div(table.sum(axis=1).replace(0, 1), axis=0)
+        mood_score = np.asarray([0] + [MOOD_SCORES[m] for m in SESSION_OPTIONS["mental_state"]])[codes["mental_state"]]
+        corr = weighted_corr(codes[factor][answered].astype(float), mood_score[answered].astype(float),
+                             counts[answered]) if answered.any() else 0.0
+        return table, corr
+
+cohort_analytics = CohortAnalytics()
 
 # ============================================================================
 # VISUALIZATION FUNCTIONS
 # ============================================================================
 
-def create_wellness_gauge(score):
-    """Create a gauge chart for wellness score"""
+MOOD_COLORS = {
+    "Happy": "#10b981", "Excited": "#f59e0b", "Relaxed": "#3b82f6",
+    "Stressed": "#ef4444", "Anxious": "#f97316", "Sad": "#6366f1", "Overthinking": "#8b5cf6"
+}
+
+def _merge(base, patch):
+    out = dict(base)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            value = _merge(out[key], value)
+        out[key] = value
+    return out
+
+class FigureTemplate:
+    """Prebuilt Plotly figure whose validated spec is cached.
+    
+    The builder runs on first use; afterwards each render only patches the
+    trace data and wraps the cached spec in a go.Figure without re-running
+    Plotly's property validation. The embedded theme keeps just the trace
+    types the figure actually uses.
+    """
+    def __init__(self, builder):
+        self.builder = builder
+        self._traces = None
+        self._layout = None
+        self._lock = threading.Lock()
+    
+    def _prepare(self):
+        with self._lock:
+            if self._traces is None:
+                spec = json.loads(self.builder().to_json())
+                layout = spec["layout"]
+                template = layout.get("template", {})
+                used = {trace.get("type", "scatter") for trace in spec["data"]}
+                layout["template"] = {
+                    "data": {k: v for k, v in template.get("data", {}).items() if k in used},
+                    "layout": template.get("layout", {})
+                }
+                self._layout = layout
+                self._traces = spec["data"]
+    
+    def render(self, *trace_patches):
+        """Figure with trace i updated by trace_patches[i] (nested dicts are merged)"""
+        if self._traces is None:
+            self._prepare()
+        traces = [_merge(trace, patch) if patch else trace
+                  for trace, patch in zip(self._traces, trace_patches + (None,) * len(self._traces))]
+        # The spec came out of a validated figure, so checking it again is wasted work
+        return go.Figure({"data": traces, "layout": self._layout}, _validate=False)
+
+def _empty_state_figure(text, font_size):
+    fig = go.Figure()
+    fig.add_annotation(
+        text=text,
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, showarrow=False,
+        font=dict(size=font_size, color="#94a3b8")
+    )
+    fig.update_layout(height=300, paper_bgcolor='white')
+    return fig
+
+def _gauge_figure():
     fig = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
-        value = score,
+        value = 0,
         domain = {'x': [0, 1], 'y': [0, 1]},
         title = {'text': "Wellness Score", 'font': {'size': 24, 'color': '#6366f1'}},
         delta = {'reference': 70, 'increasing': {'color': "#10b981"}},
@@ -277,31 +725,14 @@ def create_wellness_gauge(score):
     )
     return fig
 
-def create_radar_chart(data):
-    """Create radar chart for life areas"""
+def _radar_figure():
     categories = ['Work Stress\n(Inverted)', 'Physical\nActivity', 'Financial\nHealth', 
                   'Social\nInteraction', 'Mental\nState']
     
-    # Convert to scores
-    stress_map = {"Low": 80, "Medium": 50, "High": 20}
-    activity_map = {"None": 20, "Low": 40, "Moderate": 70, "High": 90}
-    finance_map = {"In debt": 20, "Struggling": 50, "Stable": 90}
-    social_map = {"Low": 30, "Moderate": 65, "High": 90}
-    mental_map = {"Happy": 90, "Excited": 90, "Relaxed": 85, 
-                  "Sad": 30, "Anxious": 35, "Overthinking": 40, "Stressed": 30}
-    
-    values = [
-        stress_map.get(data.get("job_stress", "Medium"), 50),
-        activity_map.get(data.get("physical_activity", "Low"), 40),
-        finance_map.get(data.get("financial_status", "Stable"), 50),
-        social_map.get(data.get("social_interaction", "Moderate"), 50),
-        mental_map.get(data.get("mental_state", "Happy"), 50)
-    ]
-    
     fig = go.Figure()
     
     fig.add_trace(go.Scatterpolar(
-        r=values,
+        r=[0] * len(categories),
         theta=categories,
         fill='toself',
         fillcolor='rgba(99, 102, 241, 0.3)',
@@ -337,46 +768,15 @@ def create_radar_chart(data):
     
     return fig
 
-def create_mood_timeline(profile):
-    """Create mood history timeline"""
-    if not profile.sessions:
-        fig = go.Figure()
-        fig.add_annotation(
-            text="No check-ins yet! Complete your first assessment.",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color="#94a3b8")
-        )
-        fig.update_layout(height=300, paper_bgcolor='white')
-        return fig
-    
-    sessions = profile.sessions[-10:]
-    dates = [datetime.fromisoformat(s['timestamp']).strftime('%m/%d') for s in sessions]
-    moods = [s.get('mental_state', 'Unknown') for s in sessions]
-    
-    # Mood to score mapping
-    mood_scores = {
-        "Happy": 90, "Excited": 85, "Relaxed": 80,
-        "Stressed": 40, "Anxious": 35, "Sad": 30, "Overthinking": 45
-    }
-    scores = [mood_scores.get(m, 50) for m in moods]
-    
-    # Mood to color mapping
-    mood_colors = {
-        "Happy": "#10b981", "Excited": "#f59e0b", "Relaxed": "#3b82f6",
-        "Stressed": "#ef4444", "Anxious": "#f97316", "Sad": "#6366f1", "Overthinking": "#8b5cf6"
-    }
-    colors = [mood_colors.get(m, "#94a3b8") for m in moods]
-    
+def _timeline_figure():
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=dates,
-        y=scores,
+        x=[],
+        y=[],
         mode='lines+markers',
         line=dict(color='#6366f1', width=3),
-        marker=dict(size=12, color=colors, line=dict(width=2, color='white')),
-        text=moods,
+        marker=dict(size=12, line=dict(width=2, color='white')),
         hovertemplate='<b>%{text}</b><br>Date: %{x}<br>Score: %{y}<extra></extra>'
     ))
     
@@ -397,36 +797,18 @@ def create_mood_timeline(profile):
     
     return fig
 
-def create_category_bars(data):
-    """Create horizontal bar chart for categories"""
+def _category_bars_figure():
     categories = ['Work Stress', 'Physical Activity', 'Financial Health', 'Social Life', 'Mental State']
-    
-    stress_map = {"Low": 80, "Medium": 50, "High": 20}
-    activity_map = {"None": 20, "Low": 40, "Moderate": 70, "High": 90}
-    finance_map = {"In debt": 20, "Struggling": 50, "Stable": 90}
-    social_map = {"Low": 30, "Moderate": 65, "High": 90}
-    mental_map = {"Happy": 90, "Excited": 90, "Relaxed": 85, 
-                  "Sad": 30, "Anxious": 35, "Overthinking": 40, "Stressed": 30}
-    
-    values = [
-        stress_map.get(data.get("job_stress", "Medium"), 50),
-        activity_map.get(data.get("physical_activity", "Low"), 40),
-        finance_map.get(data.get("financial_status", "Stable"), 50),
-        social_map.get(data.get("social_interaction", "Moderate"), 50),
-        mental_map.get(data.get("mental_state", "Happy"), 50)
-    ]
-    
     colors = ['#ef4444', '#10b981', '#f59e0b', '#3b82f6', '#8b5cf6']
     
     fig = go.Figure(go.Bar(
-        x=values,
+        x=[0] * len(categories),
         y=categories,
         orientation='h',
         marker=dict(
             color=colors,
             line=dict(color='white', width=2)
         ),
-        text=[f"{v}%" for v in values],
         textposition='outside',
         hovertemplate='<b>%{y}</b><br>Score: %{x}%<extra></extra>'
     ))
@@ -446,38 +828,12 @@ def create_category_bars(data):
     
     return fig
 
-def create_mood_distribution(profile):
-    """Create pie chart of mood distribution"""
-    if not profile.sessions:
-        fig = go.Figure()
-        fig.add_annotation(
-            text="Complete more check-ins to see patterns!",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=14, color="#94a3b8")
-        )
-        fig.update_layout(height=300, paper_bgcolor='white')
-        return fig
-    
-    moods = [s.get('mental_state', 'Unknown') for s in profile.sessions[-10:]]
-    mood_counts = {}
-    for mood in moods:
-        mood_counts[mood] = mood_counts.get(mood, 0) + 1
-    
-    colors_map = {
-        "Happy": "#10b981", "Excited": "#f59e0b", "Relaxed": "#3b82f6",
-        "Stressed": "#ef4444", "Anxious": "#f97316", "Sad": "#6366f1", "Overthinking": "#8b5cf6"
-    }
-    
-    labels = list(mood_counts.keys())
-    values = list(mood_counts.values())
-    colors = [colors_map.get(m, "#94a3b8") for m in labels]
-    
+def _mood_distribution_figure():
     fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
+        labels=[],
+        values=[],
         hole=.4,
-        marker=dict(colors=colors, line=dict(color='white', width=2)),
+        marker=dict(line=dict(color='white', width=2)),
         textinfo='label+percent',
         textfont=dict(size=12)
     )])
@@ -495,20 +851,193 @@ def create_mood_distribution(profile):
     
     return fig
 
+GAUGE_TEMPLATE = FigureTemplate(_gauge_figure)
+RADAR_TEMPLATE = FigureTemplate(_radar_figure)
+TIMELINE_TEMPLATE = FigureTemplate(_timeline_figure)
+CATEGORY_BARS_TEMPLATE = FigureTemplate(_category_bars_figure)
+MOOD_DISTRIBUTION_TEMPLATE = FigureTemplate(_mood_distribution_figure)
+NO_CHECKINS_TEMPLATE = FigureTemplate(
+    lambda: _empty_state_figure("No check-ins yet! Complete your first assessment.", 16))
+NO_PATTERNS_TEMPLATE = FigureTemplate(
+    lambda: _empty_state_figure("Complete more check-ins to see patterns!", 14))
+
+def create_wellness_gauge(score):
+    """Create a gauge chart for wellness score"""
+    return GAUGE_TEMPLATE.render({'value': score})
+
+def create_radar_chart(data):
+    """Create radar chart for life areas"""
+    return RADAR_TEMPLATE.render({'r': life_area_values(data)})
+
+def create_mood_timeline(profile):
+    """Create mood history timeline"""
+    if not profile.sessions:
+        return NO_CHECKINS_TEMPLATE.render()
+    
+    sessions = profile.sessions[-10:]
+    dates = [datetime.fromisoformat(s['timestamp']).strftime('%m/%d') for s in sessions]
+    moods = [s.get('mental_state', 'Unknown') for s in sessions]
+    
+    return TIMELINE_TEMPLATE.render({
+        'x': dates,
+        'y': [MOOD_SCORES.get(m, 50) for m in moods],
+        'text': moods,
+        'marker': {'color': [MOOD_COLORS.get(m, "#94a3b8") for m in moods]}
+    })
+
+def create_category_bars(data):
+    """Create horizontal bar chart for categories"""
+    values = life_area_values(data)
+    return CATEGORY_BARS_TEMPLATE.render({'x': values, 'text': [f"{v}%" for v in values]})
+
+def create_mood_distribution(profile):
+    """Create pie chart of mood distribution"""
+    if not profile.sessions:
+        return NO_PATTERNS_TEMPLATE.render()
+    
+    mood_counts = {m: n for m, n in profile.recent_answer_counts('mental_state').items() if n}
+    labels = list(mood_counts.keys())
+    
+    return MOOD_DISTRIBUTION_TEMPLATE.render({
+        'labels': labels,
+        'values': list(mood_counts.values()),
+        'marker': {'colors': [MOOD_COLORS.get(m, "#94a3b8") for m in labels]}
+    })
+
+def create_cohort_score_chart(buckets):
+    """Bar chart of check-ins per wellbeing-score bucket"""
+    fig = go.Figure(go.Bar(
+        x=[f"{b}-{b + 9}" if b < 100 else "100" for b in buckets.index],
+        y=buckets.values,
+        marker=dict(color='#6366f1', line=dict(color='white', width=1)),
+        hovertemplate='Score %{x}<br>Check-ins: %{y:,}<extra></extra>'
+    ))
+    fig.update_layout(
+        title={'text': "Cohort Score Distribution", 'font': {'size': 20, 'color': '#6366f1'}},
+        xaxis_title="Wellbeing Score",
+        yaxis_title="Check-ins",
+        paper_bgcolor='white',
+        plot_bgcolor='#fafafa',
+        height=400
+    )
+    return fig
+
+def create_weekday_stress_heatmap(table):
+    """Heatmap of job-stress share by day of week"""
+    fig = go.Figure(go.Heatmap(
+        z=(table.values * 100).round(1),
+        x=list(table.columns),
+        y=list(table.index),
+        colorscale='RdYlGn_r',
+        hovertemplate='%{y} • %{x} stress: %{z}%<extra></extra>'
+    ))
+    fig.update_layout(
+        title={'text': "Work Stress by Day of Week", 'font': {'size': 20, 'color': '#6366f1'}},
+        paper_bgcolor='white',
+        height=400
+    )
+    return fig
+
+def create_factor_mood_chart(table, title):
+    """Stacked bars of mood share for each answer of a factor"""
+    fig = go.Figure()
+    for mood in table.columns:
+        fig.add_trace(go.Bar(
+            x=list(table.index),
+            y=(table[mood] * 100).round(1),
+            name=mood,
+            marker_color=MOOD_COLORS.get(mood, "#94a3b8")
+        ))
+    fig.update_layout(
+        barmode='stack',
+        title={'text': title, 'font': {'size': 20, 'color': '#6366f1'}},
+        yaxis=dict(title="Share of check-ins (%)", range=[0, 100]),
+        paper_bgcolor='white',
+        plot_bgcolor='#fafafa',
+        height=400
+    )
+    return fig
+
 # ============================================================================
 # GRADIO INTERFACE FUNCTIONS
 # ============================================================================
 
-def daily_checkin(name, job_stress, relationship, activity, finances, social, mental):
+# Events the Gradio queue runs at once, and the worker threads for blocking work
+HANDLER_CONCURRENCY = int(os.environ.get("MINDFULME_CONCURRENCY", "16"))
+QUEUE_MAX_SIZE = int(os.environ.get("MINDFULME_QUEUE_SIZE", "256"))
+COHORT_CONCURRENCY = 1
+handler_pool = ThreadPoolExecutor(max_workers=HANDLER_CONCURRENCY, thread_name_prefix="mindfulme-handler")
+
+async def run_blocking(fn, *args):
+    """Run blocking work (database access, figure building) on the handler pool"""
+    return await asyncio.get_running_loop().run_in_executor(handler_pool, partial(fn, *args))
+
+# Charts are built only when their accordion is open, and memoized per
+# (user, session count) so reopening a section doesn't rebuild anything
+FIGURE_CACHE_SIZE = 2048
+CHECKIN_CHARTS = ["gauge", "radar", "bars", "timeline"]
+HISTORY_CHARTS = ["timeline", "distribution"]
+CHART_BUILDERS = {
+    "gauge": lambda profile, last: create_wellness_gauge(SCORE_TABLE[last.packed].item()),
+    "radar": lambda profile, last: create_radar_chart(last.to_dict()),
+    "bars": lambda profile, last: create_category_bars(last.to_dict()),
+    "timeline": lambda profile, last: create_mood_timeline(profile),
+    "distribution": lambda profile, last: create_mood_distribution(profile),
+}
+
+class FigureCache:
+    """Thread-safe LRU of rendered figures keyed by (user, session count, chart)"""
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_build(self, key, build):
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return fig
+        fig = build()
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = fig
+            if len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return fig
+
+figure_cache = FigureCache()
+
+def profile_charts(name, kinds):
+    """Figures of the given kinds for name's latest check-in (None when there is nothing to show)"""
+    profile = profile_store.get(name) if name else None
+    if profile is None or not profile.sessions:
+        return [None] * len(kinds)
+    with profile_store.lock_for(name):
+        count, last = profile.total_checkins, profile.sessions[-1]
+        key = profile_key(name)
+        return [figure_cache.get_or_build((key, count, kind), partial(CHART_BUILDERS[kind], profile, last))
+                for kind in kinds]
+
+async def checkin_charts(name, charts_open=True):
+    """Check-in tab charts, rendered only while their accordion is open"""
+    if not charts_open:
+        return [gr.update()] * len(CHECKIN_CHARTS)
+    return await run_blocking(profile_charts, name, CHECKIN_CHARTS)
+
+async def history_charts(name, charts_open=True):
+    """History tab charts, rendered only while their accordion is open"""
+    if not charts_open:
+        return [gr.update()] * len(HISTORY_CHARTS)
+    return await run_blocking(profile_charts, name, HISTORY_CHARTS)
+
+async def daily_checkin(name, job_stress, relationship, activity, finances, social, mental):
     """Process daily check-in and return results"""
     if not name:
-        return "⚠️ Please enter your name!", None, None, None, None, "", ""
-    
-    # Get or create profile
-    if name not in user_profiles:
-        user_profiles[name] = WellnessProfile(name)
-    
-    profile = user_profiles[name]
+        return "⚠️ Please enter your name!", "", "", ""
     
     # Create session data
     session_data = {
@@ -520,8 +1049,12 @@ def daily_checkin(name, job_stress, relationship, activity, finances, social, me
         "mental_state": mental
     }
     
-    # Add to profile
-    profile.add_session(session_data)
+    # Add to profile, then wait for the group commit without tying up a worker thread
+    profile, persisted = await run_blocking(profile_store.enqueue_session, name, session_data)
+    try:
+        await asyncio.wrap_future(persisted)
+    except Exception:
+        return "⚠️ We couldn't save your check-in. Please try again in a moment.", name, "", ""
     
     # Calculate score
     score = calculate_wellbeing_score(job_stress, relationship, activity, finances, social, mental)
@@ -552,15 +1085,10 @@ def daily_checkin(name, job_stress, relationship, activity, finances, social, me
 *Total check-ins: {profile.total_checkins}*
 """
     
-    # Create visualizations
-    gauge = create_wellness_gauge(score)
-    radar = create_radar_chart(session_data)
-    bars = create_category_bars(session_data)
-    timeline = create_mood_timeline(profile)
-    
-    return result, gauge, radar, bars, timeline, "", ""
+    # Charts are rendered separately (checkin_charts) when the charts accordion is open
+    return result, name, "", ""
 
-def get_mindful_break(stress_level, time_available):
+async def get_mindful_break(stress_level, time_available):
     """Get mindful break recommendation"""
     suggestion = MindfulBreakRecommender.recommend(stress_level, time_available.lower())
     
@@ -579,7 +1107,7 @@ def get_mindful_break(stress_level, time_available):
 Remember: Taking breaks isn't lazy—it's essential self-care that makes you more productive and healthier.
 """
 
-def get_guided_exercise(exercise_type, sub_type):
+async def get_guided_exercise(exercise_type, sub_type):
     """Get guided exercise instructions"""
     if exercise_type == "Grounding Techniques":
         exercises = GuidedExercises.grounding
@@ -630,21 +1158,23 @@ def get_guided_exercise(exercise_type, sub_type):
 Remember: There's no right or wrong way to journal. This is your safe space.
 """
 
-def view_history(name):
+async def view_history(name):
     """View user's wellness history"""
-    if not name or name not in user_profiles:
-        return "Please complete a check-in first!", None, None
-    
-    profile = user_profiles[name]
+    profile = await run_blocking(profile_store.get, name) if name else None
+    if profile is None:
+        return "Please complete a check-in first!", ""
     
     if not profile.sessions:
-        return "No check-ins yet! Start your wellness journey with a daily check-in. 🌱", None, None
+        return "No check-ins yet! Start your wellness journey with a daily check-in. 🌱", ""
     
     # Create summary
     patterns = profile.identify_patterns()
     most_common = patterns["most_common_mood"] if patterns else "N/A"
+    # Lifetime counters also cover check-ins that have rolled out of the kept history
+    all_time_common = most_common_answer(profile.lifetime_answer_counts("mental_state")) or "N/A"
     
     recent = profile.get_mood_history()
+    scores = score_history(profile.sessions)
     recent_text = "\n".join([
         f"- **{datetime.fromisoformat(s['timestamp']).strftime('%Y-%m-%d')}**: {s.get('mental_state', 'N/A')}"
         for s in recent[-5:]
@@ -656,6 +1186,8 @@ def view_history(name):
 ## Statistics
 - **Total Check-ins:** {profile.total_checkins}
 - **Most Common Mood:** {most_common}
+- **All-time Most Common Mood:** {all_time_common}
+- **Average Score (last {len(scores)}):** {scores.mean():.0f}/100
 
 ## Recent Check-ins
 {recent_text}
@@ -665,10 +1197,43 @@ def view_history(name):
 Keep checking in regularly to track your patterns and progress! 🌱
 """
     
-    timeline = create_mood_timeline(profile)
-    distribution = create_mood_distribution(profile)
+    return summary, name
+
+async def view_cohort_analytics(window):
+    """Cohort-wide analytics over every stored check-in"""
+    return await run_blocking(cohort_report, window)
+
+def cohort_report(window):
+    cohort_analytics.refresh()
+    since_days = {"Last 7 days": 7, "Last 30 days": 30}.get(window)
+    buckets, stats = cohort_analytics.score_distribution(since_days)
+    
+    if not stats:
+        return "No check-ins stored yet. Cohort insights appear once people start checking in! 🌱", None, None, None, None
+    
+    weekday_stress = cohort_analytics.stress_by_weekday(since_days)
+    activity_moods, activity_corr = cohort_analytics.mood_by_factor("physical_activity", since_days)
+    social_moods, social_corr = cohort_analytics.mood_by_factor("social_interaction", since_days)
     
-    return summary, timeline, distribution
+    summary = f"""
+# 🌍 Cohort Insights ({window})
+
+## Score Distribution
+- **Check-ins analyzed:** {int(buckets.sum()):,}
+- **Average Score:** {stats['mean']:.1f}
+- **Median (P25–P75):** {stats['p50']:.0f} ({stats['p25']:.0f}–{stats['p75']:.0f})
+
+## Patterns
+- **Most stressful day:** {weekday_stress['High'].idxmax()} ({weekday_stress['High'].max():.0%} high-stress check-ins)
+- **Activity ↔ mood correlation:** {activity_corr:+.2f}
+- **Social interaction ↔ mood correlation:** {social_corr:+.2f}
+"""
+    
+    return (summary,
+            create_cohort_score_chart(buckets),
+            create_weekday_stress_heatmap(weekday_stress),
+            create_factor_mood_chart(activity_moods, "Mood by Physical Activity"),
+            create_factor_mood_chart(social_moods, "Mood by Social Interaction"))
 
 def get_resources():
     """Get mental health resources"""
@@ -776,19 +1341,36 @@ def create_app():
                     with gr.Column(scale=2):
                         result_text = gr.Markdown()
                         
-                        with gr.Row():
-                            gauge_plot = gr.Plot(label="Wellness Score")
-                            radar_plot = gr.Plot(label="Life Balance")
-                        
-                        with gr.Row():
-                            bars_plot = gr.Plot(label="Category Breakdown")
-                            timeline_plot = gr.Plot(label="Mood Timeline")
+                        with gr.Accordion("📈 Your Charts", open=False) as checkin_accordion:
+                            with gr.Row():
+                                gauge_plot = gr.Plot(label="Wellness Score")
+                                radar_plot = gr.Plot(label="Life Balance")
+                            
+                            with gr.Row():
+                                bars_plot = gr.Plot(label="Category Breakdown")
+                                timeline_plot = gr.Plot(label="Mood Timeline")
+                
+                checkin_user = gr.State("")
+                checkin_charts_open = gr.State(False)
+                checkin_plots = [gauge_plot, radar_plot, bars_plot, timeline_plot]
                 
                 submit_btn.click(
                     fn=daily_checkin,
                     inputs=[name_input, job_stress, relationship, activity, finances, social, mental],
-                    outputs=[result_text, gauge_plot, radar_plot, bars_plot, timeline_plot, name_input, gr.Textbox(visible=False)]
+                    outputs=[result_text, checkin_user, name_input, gr.Textbox(visible=False)]
+                ).then(
+                    fn=checkin_charts,
+                    inputs=[checkin_user, checkin_charts_open],
+                    outputs=checkin_plots
+                )
+                checkin_accordion.expand(
+                    fn=lambda: True, outputs=[checkin_charts_open]
+                ).then(
+                    fn=checkin_charts,
+                    inputs=[checkin_user],
+                    outputs=checkin_plots
                 )
+                checkin_accordion.collapse(fn=lambda: False, outputs=[checkin_charts_open])
             
             # ============================================================================
             # TAB 2: GUIDED EXERCISES
@@ -842,9 +1424,9 @@ def create_app():
                     with gr.Column():
                         exercise_output = gr.Markdown()
                 
-                def get_exercise_wrapper(ex_type, ground_choice, journal_choice):
+                async def get_exercise_wrapper(ex_type, ground_choice, journal_choice):
                     sub_choice = ground_choice if ex_type == "Grounding Techniques" else journal_choice
-                    return get_guided_exercise(ex_type, sub_choice)
+                    return await get_guided_exercise(ex_type, sub_choice)
                 
                 exercise_btn.click(
                     fn=get_exercise_wrapper,
@@ -902,7 +1484,7 @@ def create_app():
                     with gr.Column():
                         affirmation_output = gr.Markdown()
                 
-                def get_affirmation_wrapper(mood):
+                async def get_affirmation_wrapper(mood):
                     affirmation = AffirmationLibrary.get_affirmation(mood)
                     return f"""
 # 💭 Your Affirmation
@@ -938,18 +1520,68 @@ Take a deep breath and let these words sink in. 🌟
                     with gr.Column():
                         history_output = gr.Markdown()
                 
-                with gr.Row():
-                    history_timeline = gr.Plot(label="Mood Timeline")
-                    history_distribution = gr.Plot(label="Mood Distribution")
+                with gr.Accordion("📈 History Charts", open=False) as history_accordion:
+                    with gr.Row():
+                        history_timeline = gr.Plot(label="Mood Timeline")
+                        history_distribution = gr.Plot(label="Mood Distribution")
+                
+                history_user = gr.State("")
+                history_charts_open = gr.State(False)
+                history_plots = [history_timeline, history_distribution]
                 
                 history_btn.click(
                     fn=view_history,
                     inputs=[history_name],
-                    outputs=[history_output, history_timeline, history_distribution]
+                    outputs=[history_output, history_user]
+                ).then(
+                    fn=history_charts,
+                    inputs=[history_user, history_charts_open],
+                    outputs=history_plots
+                )
+                history_accordion.expand(
+                    fn=lambda: True, outputs=[history_charts_open]
+                ).then(
+                    fn=history_charts,
+                    inputs=[history_user],
+                    outputs=history_plots
                 )
+                history_accordion.collapse(fn=lambda: False, outputs=[history_charts_open])
             
             # ============================================================================
-            # TAB 6: EMERGENCY RESOURCES
+            # TAB 6: COHORT ANALYTICS
+            # ============================================================================
+            with gr.Tab("🌍 Cohort Insights"):
+                gr.Markdown("## Patterns across all check-ins")
+                
+                with gr.Row():
+                    with gr.Column():
+                        cohort_window = gr.Radio(
+                            ["Last 7 days", "Last 30 days", "All time"],
+                            label="Time Window",
+                            value="Last 30 days"
+                        )
+                        cohort_btn = gr.Button("Analyze Cohort", variant="primary")
+                    
+                    with gr.Column():
+                        cohort_output = gr.Markdown()
+                
+                with gr.Row():
+                    cohort_scores = gr.Plot(label="Score Distribution")
+                    cohort_weekday = gr.Plot(label="Stress by Weekday")
+                
+                with gr.Row():
+                    cohort_activity = gr.Plot(label="Mood by Activity")
+                    cohort_social = gr.Plot(label="Mood by Social Interaction")
+                
+                cohort_btn.click(
+                    fn=view_cohort_analytics,
+                    inputs=[cohort_window],
+                    outputs=[cohort_output, cohort_scores, cohort_weekday, cohort_activity, cohort_social],
+                    concurrency_limit=COHORT_CONCURRENCY
+                )
+            
+            # ============================================================================
+            # TAB 7: EMERGENCY RESOURCES
             # ============================================================================
             with gr.Tab("🆘 Resources"):
                 gr.Markdown(get_resources())
@@ -976,10 +1608,65 @@ Take a deep breath and let these words sink in. 🌟
     
     return app
 
+# ============================================================================
+# LOAD TEST
+# ============================================================================
+
+def _percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+async def _load_test(users, checkins_per_user, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    
+    async def virtual_user(i):
+        for _ in range(checkins_per_user):
+            answers = [random.choice(SESSION_OPTIONS[f]) for f in SESSION_FIELDS]
+            start = time.perf_counter()  # includes time waiting for a concurrency slot
+            async with gate:
+                _, name, _, _ = await daily_checkin(f"Load Test User {i}", *answers)
+                # Render the charts as an open accordion would, and serialize them like Gradio
+                for fig in await checkin_charts(name):
+                    fig.to_json()
+                latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(users)))
+    return latencies, time.perf_counter() - start
+
+def run_load_test(users=200, checkins_per_user=25, concurrency=HANDLER_CONCURRENCY, target_p95_ms=250):
+    """Drive concurrent check-ins through daily_checkin against a scratch database"""
+    global profile_store
+    with tempfile.TemporaryDirectory() as tmp:
+        live_store, profile_store = profile_store, ProfileStore(os.path.join(tmp, "loadtest.db"))
+        try:
+            latencies, elapsed = asyncio.run(_load_test(users, checkins_per_user, concurrency))
+        finally:
+            profile_store.close()
+            profile_store = live_store
+    latencies.sort()
+    p50, p95, p99 = (_percentile(latencies, p) * 1000 for p in (50, 95, 99))
+    rate = len(latencies) / elapsed
+    print(f"{len(latencies):,} check-ins from {users} users in {elapsed:.2f}s "
+          f"(concurrency {concurrency}): {rate:,.0f} check-ins/sec")
+    print(f"latency p50 {p50:.1f} ms | p95 {p95:.1f} ms | p99 {p99:.1f} ms "
+          f"-> {'PASS' if p95 <= target_p95_ms else 'FAIL'} (target p95 {target_p95_ms} ms)")
+    return rate, p95
+
 # ============================================================================
 # LAUNCH APP
 # ============================================================================
 
 if __name__ == "__main__":
-    app = create_app()
-    app.launch(share=True)  # share=True generates a public Gradio link
+    parser = argparse.ArgumentParser(description="MindfulMe wellness companion")
+    parser.add_argument("--load-test", action="store_true", help="measure check-in throughput instead of launching")
+    parser.add_argument("--users", type=int, default=200, help="load test: concurrent virtual users")
+    parser.add_argument("--checkins", type=int, default=25, help="load test: check-ins per user")
+    parser.add_argument("--target-p95-ms", type=float, default=250, help="load test: p95 latency target")
+    args = parser.parse_args()
+    if args.load_test:
+        run_load_test(args.users, args.checkins, target_p95_ms=args.target_p95_ms)
+    else:
+        app = create_app()
+        app.queue(default_concurrency_limit=HANDLER_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
+        app.launch(share=True)  # share=True generates a public Gradio link
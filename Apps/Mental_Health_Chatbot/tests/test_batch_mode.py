@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+batch = pytest.importorskip("Code3")
+
+ANSWERS = {
+    "job_stress": "High", "relationship": "Married", "physical_activity": "Moderate",
+    "financial_status": "Stable", "social_interaction": "High", "mental_state": "Stressed",
+}
+RECORD = {"name": "Asha", "timestamp": "2025-01-02 09:00", **ANSWERS}
+
+
+def write_ndjson(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+
+def write_csv(path, rows, encoding="utf-8"):
+    header = list(RECORD)
+    lines = [",".join(header)] + [",".join(row[f] for f in header) for row in rows]
+    path.write_text("\r\n".join(lines) + "\r\n", encoding=encoding)
+    return str(path)
+
+
+def test_sniff_format_looks_past_blank_lines_and_rewinds():
+    lines = iter(["\n", "  \n", json.dumps(RECORD) + "\n", "next\n"])
+
+    fmt, rewound = batch.sniff_format(lines)
+
+    assert fmt == "ndjson"
+    assert list(rewound) == ["\n", "  \n", json.dumps(RECORD) + "\n", "next\n"]
+    assert batch.sniff_format(iter(["name,timestamp\n"]))[0] == "csv"
+    assert batch.sniff_format(iter([]))[0] == "csv"
+
+
+def test_files_without_extension_are_sniffed(tmp_path):
+    ndjson = write_ndjson(tmp_path / "checkins", [json.dumps(RECORD)])
+    csv_path = write_csv(tmp_path / "checkins_csv", [RECORD])
+
+    expected = tuple(RECORD[f] for f in batch.BATCH_INPUT_FIELDS)
+    assert list(batch.read_checkins(ndjson)) == [expected]
+    assert list(batch.read_checkins(csv_path)) == [expected]
+
+
+def test_csv_with_byte_order_mark_keeps_the_first_column(tmp_path):
+    path = write_csv(tmp_path / "checkins.csv", [RECORD], encoding="utf-8-sig")
+
+    records = list(batch.read_checkins(path))
+
+    assert records[0][0] == "Asha"
+
+
+def test_malformed_ndjson_lines_are_skipped_with_line_numbers(tmp_path, capsys):
+    path = write_ndjson(tmp_path / "checkins.ndjson", [
+        json.dumps(RECORD),
+        "{not json",
+        json.dumps([RECORD]),
+        json.dumps({**RECORD, "mental_state": ["Sad", "Happy"]}),
+        json.dumps({**RECORD, "job_stress": {"level": "High"}}),
+        "",
+        json.dumps({**RECORD, "name": "Ravi"}),
+    ])
+
+    results = list(batch.process_checkins(batch.read_checkins(path), seed=1))
+
+    assert [name for _, name, *_ in results] == ["Asha", "Ravi"]
+    err = capsys.readouterr().err
+    for lineno in (2, 3, 4, 5):
+        assert f"Skipping line {lineno}:" in err
+    assert "mental_state" in err and "job_stress" in err
+
+
+def test_scores_are_stable_for_a_seed(tmp_path):
+    path = write_ndjson(tmp_path / "checkins.ndjson", [json.dumps(RECORD)] * 3)
+
+    first = list(batch.process_checkins(batch.read_checkins(path), seed=7))
+    second = list(batch.process_checkins(batch.read_checkins(path), seed=7))
+
+    assert first == second
+    assert {row[3] for row in first} == {batch.calculate_wellbeing_score(*ANSWERS.values())}
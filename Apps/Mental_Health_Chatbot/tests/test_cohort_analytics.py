@@ -0,0 +1,95 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("plotly")
+app = pytest.importorskip("Code3_Gradio_Sync")
+
+NOW = datetime(2025, 3, 31, 12, 0)
+CALM = {
+    "job_stress": "Low", "relationship": "Married", "physical_activity": "High",
+    "financial_status": "Stable", "social_interaction": "High", "mental_state": "Relaxed",
+}
+TENSE = {
+    "job_stress": "High", "relationship": "Single", "physical_activity": "None",
+    "financial_status": "In debt", "social_interaction": "Low", "mental_state": "Stressed",
+}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_key TEXT, "
+                 f"timestamp TEXT, {', '.join(f + ' TEXT' for f in app.SESSION_FIELDS)})")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def insert(db_path, checkins):
+    """checkins: (days before NOW, answers) pairs"""
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        f"INSERT INTO sessions (user_key, timestamp, {', '.join(app.SESSION_FIELDS)}) "
+        f"VALUES (?, ?, {', '.join('?' * len(app.SESSION_FIELDS))})",
+        [("asha", (NOW - timedelta(days=days)).isoformat(), *[answers[f] for f in app.SESSION_FIELDS])
+         for days, answers in checkins])
+    conn.commit()
+    conn.close()
+
+
+def test_refresh_folds_new_checkins_into_the_rollup(db_path):
+    cohort = app.CohortAnalytics(db_path, chunk_rows=2)
+    insert(db_path, [(0, CALM), (0, CALM), (0, CALM), (0, TENSE), (3, CALM)])
+
+    assert cohort.refresh() == 5
+    assert cohort.total_checkins() == 5
+    assert sorted(cohort.rollup["count"].tolist()) == [1, 1, 3]
+
+    insert(db_path, [(0, CALM), (0, TENSE)])
+    assert cohort.refresh() == 7
+    assert cohort.total_checkins() == 7
+    assert sorted(cohort.rollup["count"].tolist()) == [1, 2, 4]
+
+
+def test_score_distribution_matches_the_score_table(db_path):
+    cohort = app.CohortAnalytics(db_path)
+    insert(db_path, [(0, CALM), (0, CALM), (1, TENSE)])
+    cohort.refresh()
+
+    buckets, stats = cohort.score_distribution(now=NOW.timestamp())
+
+    calm, tense = (app.calculate_wellbeing_score(*a.values()) for a in (CALM, TENSE))
+    assert buckets[calm // 10 * 10] == 2
+    assert buckets[tense // 10 * 10] == 1
+    assert stats["mean"] == pytest.approx((2 * calm + tense) / 3)
+
+
+def test_window_is_anchored_on_today(db_path):
+    cohort = app.CohortAnalytics(db_path)
+    insert(db_path, [(0, CALM), (5, TENSE), (20, CALM), (60, TENSE)])
+    cohort.refresh()
+    now = NOW.timestamp()
+
+    assert cohort.score_distribution(7, now=now)[0].sum() == 2
+    assert cohort.score_distribution(30, now=now)[0].sum() == 3
+    assert cohort.score_distribution(None, now=now)[0].sum() == 4
+    weekday = cohort.stress_by_weekday(7, now=now)
+    assert weekday["High"].sum() == 1
+
+
+def test_window_excludes_a_cohort_that_stopped_checking_in(db_path):
+    cohort = app.CohortAnalytics(db_path)
+    insert(db_path, [(60, CALM), (61, TENSE)])
+    cohort.refresh()
+
+    buckets, stats = cohort.score_distribution(7, now=NOW.timestamp())
+
+    assert buckets.sum() == 0
+    assert stats == {}
+    table, corr = cohort.mood_by_factor("physical_activity", 7, now=NOW.timestamp())
+    assert table.values.sum() == 0
+    assert corr == 0.0
@@ -0,0 +1,116 @@
+"""Lookup tables against the original branch-by-branch formulas, over every input"""
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("plotly")
+app = pytest.importorskip("Code3_Gradio_Sync")
+
+MISSING = object()
+# Every option, plus a missing key and an unrecognised answer per field: 33,750 combinations
+FIELD_VALUES = [app.SESSION_OPTIONS[f] + [MISSING, "Unknown"] for f in app.SESSION_FIELDS]
+
+
+def baseline_score(job_stress, relationship, activity, finances, social, mental):
+    score = 50
+
+    if job_stress == "Low": score += 10
+    elif job_stress == "High": score -= 10
+
+    if relationship in ["In a relationship", "Married"]: score += 5
+
+    if activity == "High": score += 10
+    elif activity == "Moderate": score += 5
+    elif activity == "None": score -= 10
+
+    if finances == "Stable": score += 8
+    elif finances == "In debt": score -= 10
+    elif finances == "Struggling": score -= 5
+
+    if social == "High": score += 8
+    elif social == "Low": score -= 5
+
+    if mental in ["Happy", "Excited", "Relaxed"]: score += 10
+    elif mental in ["Sad", "Anxious", "Overthinking", "Stressed"]: score -= 10
+
+    return max(0, min(100, score))
+
+
+def baseline_insights(data):
+    insights = []
+
+    stress = data.get("job_stress", "")
+    activity = data.get("physical_activity", "")
+    social = data.get("social_interaction", "")
+    mood = data.get("mental_state", "")
+
+    if stress == "High" and activity == "None":
+        insights.append("📌 High stress + no physical activity is tough. Even a 5-min walk could help! 🚶")
+
+    if social == "Low" and mood in ["Sad", "Anxious"]:
+        insights.append("📌 Connection is medicine—even a text to a friend can help. 🤝")
+
+    if activity in ["Moderate", "High"] and mood in ["Excited", "Happy"]:
+        insights.append("📌 Movement = mood boost! Notice how activity lifts your spirit. 💪")
+
+    if data.get("financial_status") == "In debt" and mood == "Stressed":
+        insights.append("📌 Financial stress is valid. Consider one small action today. 💡")
+
+    return insights if insights else ["📌 You're doing well navigating your wellness. Keep going! 🌟"]
+
+
+def baseline_life_areas(data):
+    stress_map = {"Low": 80, "Medium": 50, "High": 20}
+    activity_map = {"None": 20, "Low": 40, "Moderate": 70, "High": 90}
+    finance_map = {"In debt": 20, "Struggling": 50, "Stable": 90}
+    social_map = {"Low": 30, "Moderate": 65, "High": 90}
+    mental_map = {"Happy": 90, "Excited": 90, "Relaxed": 85,
+                  "Sad": 30, "Anxious": 35, "Overthinking": 40, "Stressed": 30}
+
+    return [
+        stress_map.get(data.get("job_stress", "Medium"), 50),
+        activity_map.get(data.get("physical_activity", "Low"), 40),
+        finance_map.get(data.get("financial_status", "Stable"), 50),
+        social_map.get(data.get("social_interaction", "Moderate"), 50),
+        mental_map.get(data.get("mental_state", "Happy"), 50)
+    ]
+
+
+def session(values):
+    return {f: v for f, v in zip(app.SESSION_FIELDS, values) if v is not MISSING}
+
+
+def test_every_combination_matches_the_baseline():
+    combos = list(itertools.product(*FIELD_VALUES))
+    assert len(combos) == 33_750
+
+    for values in combos:
+        data = session(values)
+        answers = [data.get(f) for f in app.SESSION_FIELDS]
+        expected = baseline_score(*answers)
+        assert app.calculate_wellbeing_score(*answers) == expected, data
+        assert app.SCORE_TABLE[app.answers_key(data)] == expected, data
+        assert app.analyze_session(data) == baseline_insights(data), data
+        assert app.life_area_values(data) == baseline_life_areas(data), data
+
+
+def test_vectorized_scoring_of_random_rows_matches_the_baseline():
+    rng = random.Random(36)
+    rows = [session([rng.choice(values) for values in FIELD_VALUES]) for _ in range(2000)]
+    df = pd.DataFrame(rows, columns=app.SESSION_FIELDS)
+
+    scores = app.SCORE_TABLE[app.pack_answers_frame(df)]
+
+    assert scores.tolist() == [baseline_score(*[row.get(f) for f in app.SESSION_FIELDS]) for row in rows]
+
+
+def test_missing_columns_score_as_unanswered():
+    df = pd.DataFrame({"mental_state": ["Happy", "Sad"]})
+
+    assert app.SCORE_TABLE[app.pack_answers_frame(df)].tolist() == [
+        baseline_score(None, None, None, None, None, "Happy"),
+        baseline_score(None, None, None, None, None, "Sad"),
+    ]
@@ -0,0 +1,113 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("plotly")
+app = pytest.importorskip("Code3_Gradio_Sync")
+
+CHECKIN = {
+    "job_stress": "High", "relationship": "Married", "physical_activity": "Moderate",
+    "financial_status": "Stable", "social_interaction": "High", "mental_state": "Stressed",
+}
+
+
+def test_checkin_fixture_uses_real_options():
+    for field, value in CHECKIN.items():
+        assert value in app.SESSION_OPTIONS[field]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "profiles.db")
+
+
+@pytest.fixture
+def store(db_path):
+    store = app.ProfileStore(db_path)
+    yield store
+    store.close()
+
+
+def test_database_created_on_first_checkin(store, db_path, tmp_path):
+    assert store.get("Asha") is None
+    assert not (tmp_path / "profiles.db").exists()
+    store.add_session("Asha", CHECKIN)
+    assert (tmp_path / "profiles.db").exists()
+
+
+def test_profile_persists_across_restart(store, db_path):
+    checkins = [
+        dict(CHECKIN, mental_state="Happy"),
+        {field: options[-1] for field, options in app.SESSION_OPTIONS.items()},
+        {field: options[0] for field, options in app.SESSION_OPTIONS.items()},
+    ]
+    checkins[1]["mental_state"] = "Sad"
+    checkins[2]["mental_state"] = "Happy"
+    for checkin in checkins:
+        store.add_session("  Asha  Rao ", checkin)
+    before = store.get("asha rao")
+    store.close()
+
+    reopened = app.ProfileStore(db_path)
+    try:
+        after = reopened.get("ASHA RAO")
+        assert after is not before
+        assert after.name == "Asha  Rao"
+        assert after.total_checkins == 3
+        assert [s["mental_state"] for s in after.get_mood_history()] == ["Happy", "Sad", "Happy"]
+        assert [s.packed for s in after.get_mood_history()] == [s.packed for s in before.get_mood_history()]
+        # Every answer round-trips through the packed codes stored in SQLite
+        decoded = [{field: s[field] for field in app.SESSION_FIELDS} for s in after.get_mood_history()]
+        assert decoded == checkins
+        assert list(after.lifetime_counts) == list(before.lifetime_counts)
+        assert list(after.day_counts) == list(before.day_counts)
+    finally:
+        reopened.close()
+
+
+def test_failed_commit_is_surfaced_and_writer_survives(store, monkeypatch):
+    store.add_session("Asha", CHECKIN)
+    real_commit = store._commit
+
+    def broken_commit(batch):
+        raise sqlite3.IntegrityError("disk full")
+
+    monkeypatch.setattr(store, "_commit", broken_commit)
+    with pytest.raises(sqlite3.IntegrityError):
+        store.add_session("Asha", CHECKIN)
+    # The failed check-in is not left in the cache, so the profile reloads from disk
+    assert store.get("Asha").total_checkins == 1
+
+    monkeypatch.setattr(store, "_commit", real_commit)
+    store.add_session("Asha", CHECKIN)
+    assert store.get("Asha").total_checkins == 2
+
+
+def test_transient_errors_are_retried(store, monkeypatch):
+    real_commit = store._commit
+    calls = []
+
+    def flaky_commit(batch):
+        calls.append(len(batch))
+        if len(calls) < app.COMMIT_RETRIES:
+            raise sqlite3.OperationalError("database is locked")
+        return real_commit(batch)
+
+    monkeypatch.setattr(app, "COMMIT_RETRY_DELAY", 0)
+    monkeypatch.setattr(store, "_commit", flaky_commit)
+    store.add_session("Asha", CHECKIN)
+    assert len(calls) == app.COMMIT_RETRIES
+    assert store.get("Asha").total_checkins == 1
+
+
+def test_cache_evicts_least_recently_used(db_path):
+    store = app.ProfileStore(db_path, cache_size=2)
+    try:
+        for name in ["Asha", "Ben", "Chen"]:
+            store.add_session(name, CHECKIN)
+        assert list(store._cache) == ["ben", "chen"]
+        assert store.get("Asha").total_checkins == 1
+        assert list(store._cache) == ["chen", "asha"]
+    finally:
+        store.close()
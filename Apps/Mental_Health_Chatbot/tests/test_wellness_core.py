@@ -0,0 +1,121 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from wellness_core import (
+    RECENT_WINDOW, SESSION_FIELDS, SESSION_OPTIONS, WEEK_DAYS, SessionHistory, WellnessProfile,
+    encode_answers, pack_codes, unpack_codes,
+)
+
+START = datetime(2025, 3, 1, 8, 0)
+
+
+def random_session(rng):
+    # Leave some fields unanswered so code 0 is exercised too
+    return {f: rng.choice(opts) for f, opts in SESSION_OPTIONS.items() if rng.random() > 0.1}
+
+
+def test_pack_round_trips_every_code_combination():
+    n = pack_codes([len(SESSION_OPTIONS[f]) for f in SESSION_FIELDS]) + 1
+    assert [pack_codes(unpack_codes(p)) for p in range(n)] == list(range(n))
+
+
+def test_history_keeps_the_last_capacity_sessions_in_order():
+    history = SessionHistory(capacity=5)
+    for i in range(12):
+        history.append(float(i), i)
+
+    assert len(history) == 5
+    assert [s.ts for s in history] == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert history[0].packed == 7
+    assert history[-1].packed == 11
+    assert [s.packed for s in history[-3:]] == [9, 10, 11]
+    assert history.codes_at(-5) == 7
+    assert history.codes_at(-1) == 11
+    with pytest.raises(IndexError):
+        history[5]
+    with pytest.raises(IndexError):
+        history[-6]
+
+
+def test_history_before_it_is_full():
+    history = SessionHistory(capacity=5)
+    history.append(1.0, 1)
+    history.append(2.0, 2)
+
+    assert [s.packed for s in history] == [1, 2]
+    assert history.codes_at(-2) == 1
+    assert history.start == 0
+
+
+def test_records_decode_answers_and_report_unanswered_fields():
+    data = {"job_stress": "High", "mental_state": "Relaxed"}
+    history = SessionHistory(capacity=2)
+    ts = START.timestamp()
+    history.append(ts, pack_codes(encode_answers(data)))
+
+    record = history[0]
+    assert record["job_stress"] == "High"
+    assert record.get("relationship") is None
+    assert record.to_dict() == {"timestamp": START.isoformat(), **{f: data.get(f) for f in SESSION_FIELDS}}
+    with pytest.raises(KeyError):
+        record["relationship"]
+
+
+def test_profile_capacity_is_at_least_the_recent_window():
+    profile = WellnessProfile(max_sessions=3)
+    for _ in range(RECENT_WINDOW + 5):
+        profile.add_session({"mental_state": "Happy"}, START.timestamp())
+
+    assert profile.sessions.capacity == RECENT_WINDOW
+    assert len(profile.sessions) == RECENT_WINDOW
+    assert profile.total_checkins == RECENT_WINDOW + 5
+
+
+def test_counters_match_a_recount_of_the_sessions():
+    rng = random.Random(32)
+    profile = WellnessProfile(max_sessions=12)
+    added = []
+    ts = START
+    for _ in range(300):
+        ts += timedelta(hours=rng.choice([1, 5, 11, 30]))
+        data = random_session(rng)
+        profile.add_session(data, ts.timestamp())
+        added.append((ts, data))
+
+        now = ts.timestamp()
+        today = ts.date().toordinal()
+        assert profile.total_checkins == len(added)
+        assert [s.to_dict() for s in profile.sessions] == [
+            {"timestamp": t.isoformat(), **{f: d.get(f) for f in SESSION_FIELDS}} for t, d in added[-12:]]
+        for field in SESSION_FIELDS:
+            lifetime = Counter(d.get(field) for _, d in added)
+            recent = Counter(d.get(field) for _, d in added[-RECENT_WINDOW:])
+            weekly = Counter(d.get(field) for t, d in added
+                             if today - WEEK_DAYS < t.date().toordinal() <= today)
+            for counts, expected in [(profile.lifetime_answer_counts(field), lifetime),
+                                     (profile.recent_answer_counts(field), recent),
+                                     (profile.weekly_answer_counts(field, now), weekly)]:
+                assert counts == {opt: expected[opt] for opt in SESSION_OPTIONS[field]}
+
+
+def test_weekly_counts_age_out_without_new_checkins():
+    profile = WellnessProfile()
+    profile.add_session({"mental_state": "Sad"}, START.timestamp())
+
+    later = START + timedelta(days=WEEK_DAYS - 1)
+    assert profile.weekly_answer_counts("mental_state", later.timestamp())["Sad"] == 1
+    gone = START + timedelta(days=WEEK_DAYS)
+    assert profile.weekly_answer_counts("mental_state", gone.timestamp())["Sad"] == 0
+
+
+def test_patterns_need_three_checkins():
+    profile = WellnessProfile()
+    for mood in ["Sad", "Happy"]:
+        profile.add_session({"mental_state": mood}, START.timestamp())
+    assert profile.identify_patterns() is None
+
+    profile.add_session({"mental_state": "Happy"}, START.timestamp())
+    assert profile.identify_patterns() == {"most_common_mood": "Happy"}
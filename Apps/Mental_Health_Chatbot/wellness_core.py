@@ -0,0 +1,271 @@
+"""Check-in encoding, history, profile counters and scoring tables shared by the console (Code3.py)
+and Gradio (Code3_Gradio_Sync.py) apps. Standard library only."""
+import time
+from datetime import datetime
+from array import array
+
+MAX_SESSIONS = 30
+
+SESSION_OPTIONS = {
+    "job_stress": ["Low", "Medium", "High"],
+    "relationship": ["Single", "In a relationship", "Married"],
+    "physical_activity": ["None", "Low", "Moderate", "High"],
+    "financial_status": ["Stable", "Struggling", "In debt"],
+    "social_interaction": ["Low", "Moderate", "High"],
+    "mental_state": ["Happy", "Sad", "Anxious", "Overthinking", "Excited", "Stressed", "Relaxed"],
+}
+SESSION_FIELDS = list(SESSION_OPTIONS)
+
+# Answers are enum-coded (0 = not answered) and packed into one mixed-radix int
+ANSWER_CODES = {f: {opt: i + 1 for i, opt in enumerate(opts)} for f, opts in SESSION_OPTIONS.items()}
+_RADICES = [len(SESSION_OPTIONS[f]) + 1 for f in SESSION_FIELDS]
+_DIVISORS = [1] * len(SESSION_FIELDS)
+for _i in range(len(SESSION_FIELDS) - 2, -1, -1):
+    _DIVISORS[_i] = _DIVISORS[_i + 1] * _RADICES[_i + 1]
+_FIELD_INDEX = {f: i for i, f in enumerate(SESSION_FIELDS)}
+# Offsets of each field's counters inside a flat per-profile counts array
+_COUNT_OFFSETS = [sum(_RADICES[:i]) for i in range(len(SESSION_FIELDS))]
+_N_COUNTS = sum(_RADICES)
+
+RECENT_WINDOW = 10
+WEEK_DAYS = 7
+
+
+def encode_answers(data):
+    """Enum codes for each session field, in SESSION_FIELDS order"""
+    return [ANSWER_CODES[f].get(data.get(f), 0) for f in SESSION_FIELDS]
+
+
+def pack_codes(codes):
+    packed = 0
+    for code, radix in zip(codes, _RADICES):
+        packed = packed * radix + code
+    return packed
+
+
+def unpack_codes(packed):
+    codes = []
+    for radix in reversed(_RADICES):
+        packed, code = divmod(packed, radix)
+        codes.append(code)
+    return codes[::-1]
+
+
+def most_common_answer(counts):
+    """Answer with the highest count, or None when nothing was counted"""
+    best = max(counts, key=counts.get) if counts else None
+    return best if best is not None and counts[best] > 0 else None
+
+
+class SessionRecord:
+    """Read-only view of one check-in that behaves like the old session dict"""
+    __slots__ = ("ts", "packed")
+
+    def __init__(self, ts, packed):
+        self.ts = ts
+        self.packed = packed
+
+    def code(self, field):
+        i = _FIELD_INDEX[field]
+        return (self.packed // _DIVISORS[i]) % _RADICES[i]
+
+    def get(self, key, default=None):
+        if key == "timestamp":
+            return datetime.fromtimestamp(self.ts).isoformat()
+        if key not in _FIELD_INDEX:
+            return default
+        code = self.code(key)
+        return SESSION_OPTIONS[key][code - 1] if code else default
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self):
+        return {"timestamp": self.get("timestamp"), **{f: self.get(f) for f in SESSION_FIELDS}}
+
+
+class SessionHistory:
+    """Fixed-capacity ring buffer of check-ins (epoch seconds + packed answer codes)"""
+    __slots__ = ("capacity", "timestamps", "codes", "start")
+
+    def __init__(self, capacity=MAX_SESSIONS):
+        self.capacity = capacity
+        self.timestamps = array("d")
+        self.codes = array("H")
+        self.start = 0
+
+    def append(self, ts, packed):
+        if len(self.codes) < self.capacity:
+            self.timestamps.append(ts)
+            self.codes.append(packed)
+        else:
+            self.timestamps[self.start] = ts
+            self.codes[self.start] = packed
+            self.start = (self.start + 1) % self.capacity
+
+    def __len__(self):
+        return len(self.codes)
+
+    def codes_at(self, index):
+        """Packed answer codes of the session at index (negative indexes allowed)"""
+        n = len(self.codes)
+        return self.codes[(self.start + index % n) % n]
+
+    def __getitem__(self, index):
+        n = len(self.codes)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(n))]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("session index out of range")
+        pos = (self.start + index) % n
+        return SessionRecord(self.timestamps[pos], self.codes[pos])
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+class WellnessProfile:
+    """Store and manage user's wellness history.
+
+    Only the last max_sessions check-ins are kept (compactly); lifetime answer
+    counts cover every session ever recorded.
+    """
+    def __init__(self, name="User", max_sessions=MAX_SESSIONS):
+        self.name = name
+        self.sessions = SessionHistory(max(max_sessions, RECENT_WINDOW))
+        self.total_checkins = 0
+        # Rolling answer counters: lifetime, last RECENT_WINDOW check-ins, and
+        # one bucket per day for the last WEEK_DAYS days
+        self.lifetime_counts = array("I", [0] * _N_COUNTS)
+        self.recent_counts = array("I", [0] * _N_COUNTS)
+        self.day_counts = array("I", [0] * (_N_COUNTS * WEEK_DAYS))
+        self.day_ids = array("l", [-1] * WEEK_DAYS)
+
+    def add_session(self, data, ts=None):
+        ts = time.time() if ts is None else ts
+        codes = encode_answers(data)
+        if len(self.sessions) >= RECENT_WINDOW:
+            leaving = unpack_codes(self.sessions.codes_at(-RECENT_WINDOW))
+            for offset, code in zip(_COUNT_OFFSETS, leaving):
+                self.recent_counts[offset + code] -= 1
+    
+        day = datetime.fromtimestamp(ts).toordinal()
+        slot = day % WEEK_DAYS
+        if day > self.day_ids[slot]:
+            self.day_ids[slot] = day
+            for i in range(slot * _N_COUNTS, (slot + 1) * _N_COUNTS):
+                self.day_counts[i] = 0
+        in_week = day == self.day_ids[slot]
+    
+        for offset, code in zip(_COUNT_OFFSETS, codes):
+            self.lifetime_counts[offset + code] += 1
+            self.recent_counts[offset + code] += 1
+            if in_week:
+                self.day_counts[slot * _N_COUNTS + offset + code] += 1
+        self.sessions.append(ts, pack_codes(codes))
+        self.total_checkins += 1
+
+    def _answer_counts(self, field, counts, base=0):
+        offset = base + _COUNT_OFFSETS[_FIELD_INDEX[field]]
+        return {opt: counts[offset + i + 1] for i, opt in enumerate(SESSION_OPTIONS[field])}
+
+    def lifetime_answer_counts(self, field):
+        """Lifetime {answer: count} for one session field"""
+        return self._answer_counts(field, self.lifetime_counts)
+
+    def recent_answer_counts(self, field):
+        """{answer: count} over the last RECENT_WINDOW check-ins"""
+        return self._answer_counts(field, self.recent_counts)
+
+    def weekly_answer_counts(self, field, now=None):
+        """{answer: count} over check-ins from the last WEEK_DAYS days"""
+        today = datetime.fromtimestamp(time.time() if now is None else now).toordinal()
+        totals = dict.fromkeys(SESSION_OPTIONS[field], 0)
+        for slot, day in enumerate(self.day_ids):
+            if today - WEEK_DAYS < day <= today:
+                for opt, n in self._answer_counts(field, self.day_counts, slot * _N_COUNTS).items():
+                    totals[opt] += n
+        return totals
+
+    def get_mood_history(self):
+        return self.sessions[-7:] if self.sessions else []
+
+    def identify_patterns(self):
+        if len(self.sessions) < 3:
+            return None
+        return {
+            "most_common_mood": most_common_answer(self.recent_answer_counts("mental_state"))
+        }
+
+
+# Per-answer score contributions, indexed by answer code (0 = not answered)
+SCORE_CONTRIBUTIONS = {
+    "job_stress": [0, 10, 0, -10],
+    "relationship": [0, 0, 5, 5],
+    "physical_activity": [0, -10, 0, 5, 10],
+    "financial_status": [0, 8, -5, -10],
+    "social_interaction": [0, -5, 0, 8],
+    "mental_state": [0, 10, -10, -10, -10, 10, -10, 10],
+}
+
+# Life-area scores shown on the radar and category charts: (field, default, score map, fallback)
+LIFE_AREA_SCORES = [
+    ("job_stress", "Medium", {"Low": 80, "Medium": 50, "High": 20}, 50),
+    ("physical_activity", "Low", {"None": 20, "Low": 40, "Moderate": 70, "High": 90}, 40),
+    ("financial_status", "Stable", {"In debt": 20, "Struggling": 50, "Stable": 90}, 50),
+    ("social_interaction", "Moderate", {"Low": 30, "Moderate": 65, "High": 90}, 50),
+    ("mental_state", "Happy", {"Happy": 90, "Excited": 90, "Relaxed": 85,
+                               "Sad": 30, "Anxious": 35, "Overthinking": 40, "Stressed": 30}, 50),
+]
+LIFE_AREA_DEFAULTS = {field: default for field, default, _, _ in LIFE_AREA_SCORES}
+
+
+def _build_lookup_tables():
+    """Wellbeing score and life-area scores of every packed answer combination"""
+    areas = [(_FIELD_INDEX[field], [fallback] + [area_scores.get(o, fallback) for o in SESSION_OPTIONS[field]])
+             for field, _, area_scores, fallback in LIFE_AREA_SCORES]
+    contributions = [SCORE_CONTRIBUTIONS[f] for f in SESSION_FIELDS]
+    scores, life_areas = [], []
+    for packed in range(pack_codes([r - 1 for r in _RADICES]) + 1):
+        codes = unpack_codes(packed)
+        scores.append(max(0, min(100, 50 + sum(c[code] for c, code in zip(contributions, codes)))))
+        life_areas.append(tuple(values[codes[i]] for i, values in areas))
+    return scores, life_areas
+
+
+# Indexed by packed answer code (see answers_key)
+SCORE_TABLE, LIFE_AREA_TABLE = _build_lookup_tables()
+# Each answer's contribution to the packed code
+_PLACE_VALUES = [{opt: code * _DIVISORS[i] for opt, code in ANSWER_CODES[f].items()}
+                 for i, f in enumerate(SESSION_FIELDS)]
+
+
+def answers_key(data):
+    """Packed answer code of a session dict, the index into the lookup tables"""
+    return sum(places.get(data.get(f), 0) for f, places in zip(SESSION_FIELDS, _PLACE_VALUES))
+
+
+def calculate_wellbeing_score(job_stress, relationship, activity, finances, social, mental):
+    answers = (job_stress, relationship, activity, finances, social, mental)
+    return SCORE_TABLE[sum(places.get(a, 0) for a, places in zip(answers, _PLACE_VALUES))]
+
+
+def life_area_values(data):
+    """Life-area scores of a session dict, unanswered areas taking LIFE_AREA_DEFAULTS"""
+    return list(LIFE_AREA_TABLE[answers_key({**LIFE_AREA_DEFAULTS, **data})])
+
+
+def interpret_score(score):
+    if score >= 80:
+        return "🌈", "Thriving", "Your emotional wellness is strong! Keep nurturing what works."
+    elif score >= 60:
+        return "💛", "Balanced", "You're doing okay. Small consistent steps matter."
+    elif score >= 40:
+        return "🤍", "Struggling", "You deserve extra care right now. You're not alone."
+    else:
+        return "💙", "Crisis", "Please reach out. Crisis support is available 24/7."